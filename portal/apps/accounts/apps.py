@@ -5,3 +5,13 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.accounts"
     verbose_name = "Comptes clients"
+
+    _order_catalog = None
+
+    def get_order_catalog(self):
+        """Return the process-wide snapshot of orderable products."""
+        if self._order_catalog is None:
+            from .services import OrderableProductCatalog
+
+            self._order_catalog = OrderableProductCatalog()
+        return self._order_catalog
@@ -6,12 +6,16 @@ from django.contrib.auth.backends import BaseBackend
 
 from apps.core.services import TrytonAuthError, TrytonClient, TrytonRPCError
 
+from .services import PortalAccountService, PortalAccountServiceError
+
 logger = logging.getLogger(__name__)
 
 
 class TrytonBackend(BaseBackend):
     """Authenticate Django users against Tryton credentials."""
 
+    account_service_class = PortalAccountService
+
     def authenticate(
         self,
         request,
@@ -69,6 +73,10 @@ class TrytonBackend(BaseBackend):
             user.set_unusable_password()
             user.save(update_fields=["email", "first_name", "last_name", "password", "is_active"])
 
+            party_id = self._resolve_party(username)
+            if party_id is not None:
+                session_context["party_id"] = party_id
+
             # Attach session info to the in-memory instance so the view can persist it.
             user._tryton_session = session_context  # type: ignore[attr-defined]
             return user
@@ -83,6 +91,15 @@ class TrytonBackend(BaseBackend):
         except UserModel.DoesNotExist:
             return None
 
+    def _resolve_party(self, username: str) -> Optional[int]:
+        """Resolve the party once at login so portal pages can skip the lookup."""
+        try:
+            _, party_id = self.account_service_class().resolve_identity(login=username)
+        except (PortalAccountServiceError, ValueError) as exc:
+            logger.info("Unable to resolve Tryton party for %s at login: %s", username, exc)
+            return None
+        return party_id
+
     @staticmethod
     def _split_name(full_name: str) -> tuple[str, str]:
         parts = full_name.strip().split(" ", 1)
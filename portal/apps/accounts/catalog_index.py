@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Optional, Sequence
+
+if TYPE_CHECKING:
+    from .services import PortalOrderProduct
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+NO_UNIT = "none"
+NO_UNIT_LABEL = "Sans unité"
+# Prefixes up to this length get a precomputed posting set: they match the most tokens.
+SHORT_PREFIX_LENGTH = 2
+# Terms with fewer postings stay rank lists: a bitmask per rare term would cost more memory than it saves.
+DENSE_TERM_MIN_POSTINGS = 64
+
+
+def fold(value: Optional[str]) -> str:
+    """Lowercase and strip accents: « Épinette » and « epinette » index the same way."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(value: Optional[str]) -> list[str]:
+    return TOKEN_PATTERN.findall(fold(value))
+
+
+def _to_mask(ranks: Iterable[int], size: int) -> int:
+    if isinstance(ranks, list) and len(ranks) < DENSE_TERM_MIN_POSTINGS:
+        mask = 0
+        for rank in ranks:
+            mask |= 1 << rank
+        return mask
+    bitmap = bytearray((size + 7) // 8)
+    for rank in ranks:
+        bitmap[rank >> 3] |= 1 << (rank & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+def _nth_bit(mask: int, n: int) -> int:
+    """Position of the ``n``-th (0-based) set bit of ``mask``."""
+    low, high = 0, mask.bit_length()
+    while low < high:
+        middle = (low + high) // 2
+        if (mask & ((2 << middle) - 1)).bit_count() > n:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def _iter_bits(mask: int, offset: int = 0) -> Iterator[int]:
+    while mask:
+        lowest = mask & -mask
+        yield offset + lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class CatalogMatches(Sequence[int]):
+    """Ranks matched by a query, in result order: exact code matches first, then catalog order.
+
+    Posting sets are bitmasks (bit ``n`` = product of rank ``n``), so counting is a popcount
+    and a page is read without materializing the full result list.
+    """
+
+    def __init__(self, boosted: int, others: int) -> None:
+        self._parts = (boosted, others)
+
+    def __len__(self) -> int:
+        return sum(part.bit_count() for part in self._parts)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return list(self)[item]
+            return self._range(start, stop)
+        index = item + len(self) if item < 0 else item
+        ranks = self._range(index, index + 1) if index >= 0 else []
+        if not ranks:
+            raise IndexError(item)
+        return ranks[0]
+
+    def __iter__(self) -> Iterator[int]:
+        for part in self._parts:
+            yield from _iter_bits(part)
+
+    def _range(self, start: int, stop: int) -> list[int]:
+        wanted = stop - start
+        ranks: list[int] = []
+        if wanted <= 0:
+            return ranks
+        for part in self._parts:
+            count = part.bit_count()
+            if start >= count:
+                start -= count
+                continue
+            position = _nth_bit(part, start) if start else 0
+            for rank in _iter_bits(part >> position, position):
+                ranks.append(rank)
+                if len(ranks) >= wanted:
+                    return ranks
+            start = 0
+        return ranks
+
+
+@dataclass
+class CatalogSearchResult:
+    ranks: CatalogMatches
+    unit_filters: list[dict[str, object]]
+
+
+class CatalogSearchIndex:
+    """Inverted index over one catalog snapshot, for the order form's product picker.
+
+    Products keep their catalog order as their rank. Each query term matches every indexed
+    token that starts with it (accent-insensitive), terms are combined with AND, and
+    products whose code equals the whole query come first. Per-unit posting sets give the
+    facet counts.
+    """
+
+    def __init__(self, products: Sequence["PortalOrderProduct"], *, version: str = "") -> None:
+        self.version = version
+        self.products: list["PortalOrderProduct"] = list(products)
+        size = len(self.products)
+        postings: dict[str, list[int]] = {}
+        codes: dict[str, list[int]] = {}
+        units: dict[str, list[int]] = {}
+        self._unit_labels: dict[str, str] = {}
+        for rank, product in enumerate(self.products):
+            terms = set(tokenize(product.name)) | set(tokenize(product.code)) | set(tokenize(product.unit_name))
+            for term in terms:
+                postings.setdefault(term, []).append(rank)
+            code = fold(product.code).strip()
+            if code:
+                codes.setdefault(code, []).append(rank)
+            unit_key = NO_UNIT if product.unit_id is None else str(product.unit_id)
+            units.setdefault(unit_key, []).append(rank)
+            label = product.unit_name.strip() if product.unit_name else NO_UNIT_LABEL
+            if label and not self._unit_labels.get(unit_key):
+                self._unit_labels[unit_key] = label
+
+        self._size = size
+        self._terms = sorted(postings)
+        self._term_postings: list[int | list[int]] = [
+            _to_mask(postings[term], size) if len(postings[term]) >= DENSE_TERM_MIN_POSTINGS else postings[term]
+            for term in self._terms
+        ]
+        short_prefixes: dict[str, set[int]] = {}
+        for term, ranks in postings.items():
+            for length in range(1, min(SHORT_PREFIX_LENGTH, len(term)) + 1):
+                short_prefixes.setdefault(term[:length], set()).update(ranks)
+        self._short_prefix_masks = {prefix: _to_mask(ranks, size) for prefix, ranks in short_prefixes.items()}
+        self._code_masks = {code: _to_mask(ranks, size) for code, ranks in codes.items()}
+        self._unit_masks = {key: _to_mask(ranks, size) for key, ranks in units.items()}
+        self._all = (1 << size) - 1
+        self._all_unit_filters = self._unit_filters(self._all)
+        self._fragments: dict[int, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def fragments(self, ranks: Iterable[int], render: Callable[["PortalOrderProduct"], bytes]) -> list[bytes]:
+        """Serialized payloads for ``ranks``; each product is rendered once for this catalog version."""
+        cache = self._fragments
+        fragments = []
+        for rank in ranks:
+            fragment = cache.get(rank)
+            if fragment is None:
+                fragment = cache[rank] = render(self.products[rank])
+            fragments.append(fragment)
+        return fragments
+
+    def search(self, query: str, *, unit: str = "") -> CatalogSearchResult:
+        """Products matching ``query`` (and ``unit``), plus unit facets counted before the unit filter."""
+        folded = fold(query).strip()
+        terms = TOKEN_PATTERN.findall(folded)
+        if terms:
+            matches = self._match_terms(terms)
+            unit_filters = self._unit_filters(matches)
+        else:
+            matches = self._all
+            unit_filters = self._all_unit_filters
+        unit_mask = self._unit_mask(unit)
+        if unit_mask is not None:
+            matches &= unit_mask
+        boosted = matches & self._code_masks.get(folded, 0) if terms else 0
+        return CatalogSearchResult(ranks=CatalogMatches(boosted, matches & ~boosted), unit_filters=unit_filters)
+
+    def _match_terms(self, terms: Iterable[str]) -> int:
+        matches = self._all
+        for term in sorted(set(terms), key=len, reverse=True):
+            matches &= self._prefix_mask(term)
+            if not matches:
+                break
+        return matches
+
+    def _prefix_mask(self, prefix: str) -> int:
+        if len(prefix) <= SHORT_PREFIX_LENGTH:
+            return self._short_prefix_masks.get(prefix, 0)
+        mask = 0
+        sparse: list[int] = []
+        for position in range(bisect_left(self._terms, prefix), len(self._terms)):
+            if not self._terms[position].startswith(prefix):
+                break
+            ranks = self._term_postings[position]
+            if isinstance(ranks, int):
+                mask |= ranks
+            else:
+                sparse.extend(ranks)
+        return mask | _to_mask(sparse, self._size) if sparse else mask
+
+    def _unit_mask(self, unit: str) -> Optional[int]:
+        if not unit:
+            return None
+        if unit == NO_UNIT:
+            return self._unit_masks.get(NO_UNIT, 0)
+        try:
+            unit_key = str(int(unit))
+        except (TypeError, ValueError):
+            return None
+        return self._unit_masks.get(unit_key, 0)
+
+    def _unit_filters(self, matches: int) -> list[dict[str, object]]:
+        options = []
+        for key, mask in self._unit_masks.items():
+            count = (matches & mask).bit_count()
+            if count:
+                options.append({"value": key, "label": self._unit_labels.get(key) or NO_UNIT_LABEL, "count": count})
+        options.sort(key=lambda item: str(item["label"]).lower())
+        return options
@@ -398,6 +398,8 @@ class OrderDraftForm(forms.Form):
             }
         ),
     )
+    # Version du catalogue affichée au client, vérifiée à la soumission.
+    catalog_version = forms.CharField(required=False, max_length=64, widget=forms.HiddenInput)
 
     def __init__(self, *args, address_choices: list[tuple[int, str]] | None = None, **kwargs):
         super().__init__(*args, **kwargs)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.accounts.services import PortalOrderService, PortalOrderServiceError
+
+
+class Command(BaseCommand):
+    help = "Reconstruit le catalogue partagé des produits commandables du portail client."
+
+    def handle(self, *args, **options):
+        try:
+            snapshot = PortalOrderService().catalog_snapshot(force_refresh=True)
+        except PortalOrderServiceError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(f"{len(snapshot.products)} produits, version {snapshot.version}")
+        self.stdout.write(self.style.SUCCESS("Catalogue de commande reconstruit."))
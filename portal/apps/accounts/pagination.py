@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from django.core.cache import cache
+
+if TYPE_CHECKING:
+    from apps.core.services import TrytonClient
+
+    from .services import PortalAccountService
+
+LIST_TOTAL_CACHE_KEY_PREFIX = "accounts.list.total.v1"
+
+
+def page_window(total: int, page: Any, size: int) -> tuple[int, int, int]:
+    """Return ``(current_page, pages, offset)`` clamped to the available pages."""
+    pages = max(1, (total + size - 1) // size)
+    current_page = min(max(int(page or 1), 1), pages)
+    return current_page, pages, (current_page - 1) * size
+
+
+def _record_id(value: Any) -> Optional[int]:
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def encode_cursor(record: dict[str, Any], field: str) -> Optional[str]:
+    """Opaque cursor holding the ``(field, id)`` sort key of a record, as Tryton returned it."""
+    record_id = _record_id(record.get("id"))
+    if record_id is None:
+        return None
+    raw = json.dumps([record.get(field), record_id], separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[tuple[Any, int]]:
+    if not cursor:
+        return None
+    try:
+        value, record_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        record_id = int(record_id)
+    except (TypeError, ValueError):
+        return None
+    if value is not None and not isinstance(value, (str, int, float, dict)):
+        return None
+    return value, record_id
+
+
+def keyset_domain(field: str, cursor: tuple[Any, int], *, forward: bool) -> list[Any]:
+    """Rows after (or before) ``cursor`` in ``field DESC NULLS FIRST, id DESC`` order."""
+    value, record_id = cursor
+    if value is None:
+        if forward:
+            return ["OR", (field, "!=", None), [(field, "=", None), ("id", "<", record_id)]]
+        return [(field, "=", None), ("id", ">", record_id)]
+    if forward:
+        return ["OR", (field, "<", value), [(field, "=", value), ("id", "<", record_id)]]
+    return ["OR", (field, "=", None), (field, ">", value), [(field, "=", value), ("id", ">", record_id)]]
+
+
+def keyset_search(
+    client: "TrytonClient",
+    model: str,
+    domain: list[Any],
+    fields: list[str],
+    *,
+    field: str,
+    cursor: Optional[tuple[Any, int]],
+    forward: bool,
+    size: int,
+    context: dict[str, Any],
+) -> tuple[list[dict[str, Any]], bool, bool]:
+    """Read one page next to ``cursor`` with ``limit=size + 1``.
+
+    Returns ``(records, has_next, has_previous)`` with records in display order.
+    """
+    if cursor is not None:
+        domain = [*domain, keyset_domain(field, cursor, forward=forward)]
+    if forward:
+        order = [(field, "DESC NULLS FIRST"), ("id", "DESC")]
+    else:
+        order = [(field, "ASC NULLS LAST"), ("id", "ASC")]
+    records = list(client.search_read(model, domain, fields, limit=size + 1, order=order, context=context) or [])
+    more = len(records) > size
+    records = records[:size]
+    if forward:
+        return records, more, cursor is not None
+    records.reverse()
+    return records, True, more
+
+
+def keyset_total(
+    account_service: "PortalAccountService",
+    model: str,
+    party_id: int,
+    domain: list[Any],
+    *,
+    load: Callable[[], Any],
+    timeout: int,
+    page: int,
+    size: int,
+    shown: int,
+    has_next: bool,
+) -> int:
+    """Total for keyset pages: cached per party generation and only recounted on a cache miss."""
+    digest = hashlib.sha1(json.dumps(domain, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    generation = account_service.party_cache_generation(party_id=party_id)
+    key = f"{LIST_TOTAL_CACHE_KEY_PREFIX}:{model}:{party_id}:{generation}:{digest}"
+    seen = (page - 1) * size + shown
+    if page == 1 and not has_next:
+        total = seen
+    else:
+        total = cache.get(key) if timeout else None
+        if total is not None:
+            return max(int(total), seen + (1 if has_next else 0))
+        total = int(load() or 0)
+    if timeout:
+        cache.set(key, total, timeout)
+    return max(total, seen + (1 if has_next else 0))
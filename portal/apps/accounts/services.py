@@ -1,20 +1,40 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+import time
+from collections import Counter
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
 from html import unescape
 import re
-from typing import Any, Iterable, Optional, Sequence
+from typing import Any, Callable, Iterable, Optional, Sequence
 
+from django.apps import apps
 from django.conf import settings
+from django.core.cache import cache
 
-from apps.core.services import TrytonAuthError, TrytonClient, TrytonRPCError, get_tryton_client
+from apps.core.services import (
+    TrytonAuthError,
+    TrytonClient,
+    TrytonMetadataRegistry,
+    TrytonRPCError,
+    get_metadata_registry,
+    get_tryton_client,
+)
+
+from .catalog_index import CatalogSearchIndex
+from .pagination import decode_cursor, encode_cursor, keyset_search, keyset_total, page_window
 
 logger = logging.getLogger(__name__)
 
 
+def _count_states(records: Any) -> dict[str, int]:
+    return dict(Counter(record.get("state") for record in records or [] if record.get("state")))
+
+
 class PortalAccountServiceError(Exception):
     """Raised when client account provisioning fails."""
 
@@ -82,6 +102,15 @@ class PortalOrderProduct:
         return " ".join(part for part in parts if part)
 
 
+@dataclass(frozen=True)
+class PortalCatalogSnapshot:
+    """Orderable products as of ``built_at``; ``version`` changes only when their content does."""
+
+    version: str
+    built_at: float
+    products: dict[int, PortalOrderProduct]
+
+
 @dataclass
 class PortalOrderLineInput:
     product_id: int
@@ -118,6 +147,8 @@ class PortalOrderPagination:
     total: int
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
 
 
 @dataclass
@@ -172,6 +203,8 @@ class PortalInvoicePagination:
     total: int
     has_next: bool
     has_previous: bool
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
 
 
 @dataclass
@@ -182,18 +215,28 @@ class PortalInvoiceListResult:
 class PortalAccountService:
     """Service layer orchestrating Tryton calls for portal client accounts."""
 
+    PROFILE_CACHE_KEY_PREFIX = "accounts.profile.v1"
+    PARTY_GENERATION_KEY_PREFIX = "accounts.party.generation"
+
     def __init__(
         self,
         client: Optional[TrytonClient] = None,
         *,
         portal_group_name: Optional[str] = None,
+        profile_cache_timeout: Optional[int] = None,
+        metadata: Optional[TrytonMetadataRegistry] = None,
     ) -> None:
         self.client = client or get_tryton_client()
+        self.metadata = metadata or get_metadata_registry()
         self.portal_group_name = portal_group_name or getattr(settings, "TRYTON_PORTAL_GROUP", "Portail Clients")
+        if profile_cache_timeout is None:
+            profile_cache_timeout = getattr(settings, "PORTAL_PROFILE_CACHE_TTL", 300)
+        self.profile_cache_timeout = max(0, int(profile_cache_timeout))
         self._portal_group_id: Optional[int] = None
         self._base_context: dict[str, Any] = {}
         self._user_has_party_field: Optional[bool] = None
         self._address_postal_field: Optional[str] = None
+        self._identities: dict[str, tuple[Optional[int], int]] = {}
 
     def login_exists(self, login: str) -> bool:
         """Return True when a Tryton user already exists for the provided login."""
@@ -250,20 +293,55 @@ class PortalAccountService:
             self._rollback_party(party_id)
             raise
 
+        self.invalidate_client_profile(login=login)
         return PortalAccountCreationResult(login=login, user_id=user_id, party_id=party_id)
 
-    def fetch_client_profile(self, *, login: str) -> PortalClientProfile:
-        """Retrieve the Tryton-facing profile for a portal user."""
-        user_record = self._get_user_record(login)
+    def fetch_client_profile(self, *, login: str, use_cache: bool = True) -> PortalClientProfile:
+        """Retrieve the Tryton-facing profile for a portal user.
+
+        Snapshots are cached per login for ``profile_cache_timeout`` seconds; writes made
+        through this service refresh or drop the cached entry.
+        """
+        if use_cache and self.profile_cache_timeout:
+            profile = cache.get(self._profile_cache_key(login))
+            if isinstance(profile, PortalClientProfile):
+                self.remember_party(login=login, party_id=profile.party_id, user_id=profile.user_id)
+                return profile
+        profile = self._load_client_profile(login)
+        self._store_client_profile(profile)
+        return profile
+
+    def invalidate_client_profile(self, *, login: str) -> None:
+        """Drop the cached profile snapshot for this login."""
+        cache.delete(self._profile_cache_key(login))
+
+    def _profile_cache_key(self, login: str) -> str:
+        return f"{self.PROFILE_CACHE_KEY_PREFIX}:{login.strip().lower()}"
+
+    def _store_client_profile(self, profile: PortalClientProfile) -> None:
+        self.remember_party(login=profile.login, party_id=profile.party_id, user_id=profile.user_id)
+        if self.profile_cache_timeout:
+            cache.set(self._profile_cache_key(profile.login), profile, self.profile_cache_timeout)
+
+    def _load_client_profile(self, login: str) -> PortalClientProfile:
+        user_record = self._get_profile_user_record(login)
         party_id = self._resolve_party_id(login=login, user_record=user_record)
         if party_id is None:
             raise PortalAccountServiceError(
                 "Ce compte n'est pas encore lié à une fiche client dans Tryton. Contactez le support."
             )
 
-        party_record = self._get_party_record(party_id)
-        phone_value = self._get_phone_number(party_id)
-        address_record = self._get_primary_address(party_id)
+        nested_party = user_record.get("party.")
+        if isinstance(nested_party, dict) and self._extract_id(nested_party.get("id")) == party_id:
+            party_record = nested_party
+            phone_value = self._first_phone_number(nested_party.get("contact_mechanisms.") or [])
+            addresses = nested_party.get("addresses.") or []
+            address_record = addresses[0] if addresses else {}
+        else:
+            # Slow path: older servers (or a party found by email) need one read per hop.
+            party_record = self._get_party_record(party_id)
+            phone_value = self._get_phone_number(party_id)
+            address_record = self._get_primary_address(party_id)
         postal_value = self._extract_postal_value(address_record)
         first_name, last_name = self._split_name(user_record.get("name") or "")
         email = (user_record.get("email") or login).strip()
@@ -284,6 +362,103 @@ class PortalAccountService:
             ),
         )
 
+    def _get_profile_user_record(self, login: str) -> dict[str, Any]:
+        """Read the user together with its party, contacts and addresses through related-field paths."""
+        if not self._user_supports_party_field():
+            return self._get_user_record(login)
+        normalized = login.strip().lower()
+        postal_field = self._get_address_postal_field()
+        fields = [
+            "id",
+            "name",
+            "email",
+            "party",
+            "party.name",
+            "party.contact_mechanisms.type",
+            "party.contact_mechanisms.value",
+            "party.addresses.street",
+            "party.addresses.city",
+        ]
+        if postal_field:
+            fields.append(f"party.addresses.{postal_field}")
+        try:
+            records = self.client.search_read(
+                "model.res.user",
+                [("login", "=", normalized)],
+                fields,
+                limit=1,
+                context=self._rpc_context(),
+            )
+        except TrytonRPCError as exc:
+            logger.info(
+                "Lecture imbriquée du profil impossible pour %s, repli sur les lectures unitaires: %s",
+                normalized,
+                exc,
+            )
+            return self._get_user_record(login)
+        if not records:
+            raise PortalAccountServiceError("Utilisateur introuvable dans Tryton.")
+        return records[0]
+
+    @staticmethod
+    def _first_phone_number(contact_mechanisms: Iterable[dict[str, Any]]) -> Optional[str]:
+        for mechanism in contact_mechanisms:
+            if isinstance(mechanism, dict) and mechanism.get("type") in ("phone", "mobile"):
+                return (mechanism.get("value") or "").strip() or None
+        return None
+
+    def resolve_identity(self, *, login: str) -> tuple[int, int]:
+        """Retourne ``(user_id, party_id)`` Tryton pour le login, sans charger le profil complet."""
+        normalized = login.strip().lower()
+        user_record = self._get_user_record(normalized)
+        party_id = self._resolve_party_id(login=normalized, user_record=user_record)
+        if party_id is None:
+            raise PortalAccountServiceError(
+                "Ce compte n'est pas encore lié à une fiche client dans Tryton. Contactez le support."
+            )
+        user_id = int(user_record["id"])
+        self._identities[normalized] = (user_id, party_id)
+        return user_id, party_id
+
+    def resolve_party(self, *, login: str) -> int:
+        """Retourne l'identifiant party lié au login (mémorisé pour la durée du service)."""
+        known = self._identities.get(login.strip().lower())
+        if known is not None:
+            return known[1]
+        _, party_id = self.resolve_identity(login=login)
+        return party_id
+
+    def remember_party(self, *, login: str, party_id: int, user_id: Optional[int] = None) -> None:
+        """Réutilise un party déjà résolu (ex. stocké dans la session à la connexion)."""
+        self._identities[login.strip().lower()] = (user_id, int(party_id))
+
+    def party_cache_generation(self, *, party_id: int) -> int:
+        """Génération courante des caches du party; les clés qui l'incluent expirent à chaque incrément."""
+        key = self._party_generation_key(party_id)
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, 1, None)
+            generation = cache.get(key, 1)
+        return int(generation)
+
+    def bump_party_cache_generation(self, *, party_id: int) -> int:
+        """Invalide d'un coup tous les caches du party (tableau de bord, etc.)."""
+        key = self._party_generation_key(party_id)
+        cache.add(key, 1, None)
+        try:
+            return int(cache.incr(key))
+        except ValueError:
+            # The counter was evicted between add() and incr().
+            cache.set(key, 2, None)
+            return 2
+
+    def invalidate_party_caches(self, *, login: str) -> None:
+        """Point d'invalidation générique: les prochaines lectures du client repartent de Tryton."""
+        self.bump_party_cache_generation(party_id=self.resolve_party(login=login))
+
+    def _party_generation_key(self, party_id: int) -> str:
+        return f"{self.PARTY_GENERATION_KEY_PREFIX}:{int(party_id)}"
+
     def update_client_profile(
         self,
         *,
@@ -343,7 +518,10 @@ class PortalAccountService:
             postal_code=(postal_code or "").strip(),
         )
 
-        return self.fetch_client_profile(login=login)
+        # Write-through: the fresh snapshot replaces the cached one.
+        self.invalidate_client_profile(login=login)
+        self.bump_party_cache_generation(party_id=party_id)
+        return self.fetch_client_profile(login=login, use_cache=False)
 
     def change_password(self, *, login: str, current_password: str, new_password: str) -> None:
         """Change the Tryton password for the provided user after validating the current one."""
@@ -364,6 +542,7 @@ class PortalAccountService:
                 "Impossible de mettre à jour le mot de passe dans Tryton.",
             )
             raise PortalAccountServiceError(message) from exc
+        self.invalidate_client_profile(login=login)
 
     def validate_credentials(self, *, login: str, password: str) -> bool:
         """Validate a login/password combo directly against Tryton."""
@@ -387,17 +566,14 @@ class PortalAccountService:
         if self._portal_group_id is not None:
             return self._portal_group_id
         try:
-            group_ids = self.client.call(
-                "model.res.group",
-                "search",
-                [[("name", "=", self.portal_group_name)], 0, 1, None, self._rpc_context()],
-            )
+            group_id = self.metadata.portal_group_id(self.portal_group_name, self.client, self._rpc_context())
         except TrytonRPCError as exc:
             logger.exception("Unable to fetch Tryton portal group '%s'.", self.portal_group_name)
             raise PortalAccountServiceError(
                 "La configuration Tryton du portail est invalide (groupe introuvable)."
             ) from exc
 
+        group_ids = [group_id] if group_id is not None else []
         if not group_ids:
             logger.info("Portal group '%s' not found. Attempting auto-creation.", self.portal_group_name)
             try:
@@ -418,6 +594,7 @@ class PortalAccountService:
                 )
 
             group_ids = created_ids
+            self.metadata.remember_portal_group_id(self.portal_group_name, group_ids[0])
 
         self._portal_group_id = int(group_ids[0])
         return self._portal_group_id
@@ -524,11 +701,7 @@ class PortalAccountService:
         if self._user_has_party_field is not None:
             return self._user_has_party_field
         try:
-            fields = self.client.call(
-                "model.res.user",
-                "fields_get",
-                [["party"], self._rpc_context()],
-            )
+            fields = self.metadata.model_fields("model.res.user", self.client, self._rpc_context())
         except TrytonRPCError as exc:
             logger.warning("Unable to introspect res.user fields: %s. Assuming party field is unavailable.", exc)
             self._user_has_party_field = False
@@ -551,30 +724,19 @@ class PortalAccountService:
         if party_supported:
             requested_fields.append("party")
         try:
-            user_ids = self.client.call(
+            records = self.client.search_read(
                 "model.res.user",
-                "search",
-                [[("login", "=", normalized)], 0, 1, None, context],
-            )
-        except TrytonRPCError as exc:
-            logger.exception("Impossible de rechercher l'utilisateur Tryton %s.", normalized)
-            raise PortalAccountServiceError("Impossible de récupérer votre profil. Réessayez plus tard.") from exc
-
-        if not user_ids:
-            raise PortalAccountServiceError("Utilisateur introuvable dans Tryton.")
-
-        try:
-            records = self.client.call(
-                "model.res.user",
-                "read",
-                [[int(user_ids[0])], requested_fields, context],
+                [("login", "=", normalized)],
+                requested_fields,
+                limit=1,
+                context=context,
             )
         except TrytonRPCError as exc:
             logger.exception("Impossible de lire le profil Tryton de %s.", normalized)
-            raise PortalAccountServiceError("Lecture du profil utilisateur impossible.") from exc
+            raise PortalAccountServiceError("Impossible de récupérer votre profil. Réessayez plus tard.") from exc
 
         if not records:
-            raise PortalAccountServiceError("Les données de l'utilisateur Tryton sont manquantes.")
+            raise PortalAccountServiceError("Utilisateur introuvable dans Tryton.")
         return records[0]
 
     def _resolve_party_id(self, *, login: str, user_record: dict[str, Any]) -> Optional[int]:
@@ -602,31 +764,18 @@ class PortalAccountService:
         normalized = login.strip().lower()
         context = self._rpc_context()
         try:
-            contact_ids = self.client.call(
+            records = self.client.search_read(
                 "model.party.contact_mechanism",
-                "search",
-                [[("type", "=", "email"), ("value", "=", normalized)], 0, 1, None, context],
+                [("type", "=", "email"), ("value", "=", normalized)],
+                ["party"],
+                limit=1,
+                context=context,
             )
         except TrytonRPCError as exc:
             logger.warning("Impossible de rechercher la fiche client à partir du courriel %s: %s", normalized, exc)
             raise PortalAccountServiceError(
                 "Impossible de retrouver votre fiche client dans Tryton. Réessayez plus tard."
             ) from exc
-
-        contact_id = self._extract_id(contact_ids[0]) if contact_ids else None
-        if contact_id is None:
-            return None
-        try:
-            records = self.client.call(
-                "model.party.contact_mechanism",
-                "read",
-                [[contact_id], ["party"], context],
-            )
-        except TrytonRPCError as exc:
-            logger.warning("Impossible de lire le contact courriel %s: %s", contact_id, exc)
-            raise PortalAccountServiceError(
-                "Impossible de confirmer la fiche client associée à ce compte."
-            ) from exc
         if not records:
             return None
         return self._extract_id(records[0].get("party"))
@@ -634,26 +783,16 @@ class PortalAccountService:
     def _get_phone_number(self, party_id: int) -> Optional[str]:
         context = self._rpc_context()
         try:
-            contact_ids = self.client.call(
+            records = self.client.search_read(
                 "model.party.contact_mechanism",
-                "search",
-                [[("party", "=", party_id), ("type", "in", ["phone", "mobile"])], 0, 1, None, context],
+                [("party", "=", party_id), ("type", "in", ["phone", "mobile"])],
+                ["value"],
+                limit=1,
+                context=context,
             )
         except TrytonRPCError as exc:
             logger.warning("Impossible de récupérer les coordonnées téléphoniques pour party=%s: %s", party_id, exc)
             return None
-        contact_id = self._extract_id(contact_ids[0]) if contact_ids else None
-        if contact_id is None:
-            return None
-        try:
-            records = self.client.call(
-                "model.party.contact_mechanism",
-                "read",
-                [[contact_id], ["value"], context],
-            )
-        except TrytonRPCError as exc:
-            logger.warning("Impossible de lire le contact téléphonique %s: %s", contact_id, exc)
-            return None
         if not records:
             return None
         value = (records[0].get("value") or "").strip()
@@ -720,30 +859,20 @@ class PortalAccountService:
 
     def _get_primary_address(self, party_id: int) -> dict[str, Any]:
         context = self._rpc_context()
-        try:
-            address_ids = self.client.call(
-                "model.party.address",
-                "search",
-                [[("party", "=", party_id)], 0, 1, None, context],
-            )
-        except TrytonRPCError as exc:
-            logger.warning("Impossible de rechercher les adresses pour party=%s: %s", party_id, exc)
-            return {}
-        address_id = self._extract_id(address_ids[0]) if address_ids else None
-        if address_id is None:
-            return {}
         postal_field = self._get_address_postal_field()
         fields = ["id", "street", "city"]
         if postal_field:
             fields.append(postal_field)
         try:
-            records = self.client.call(
+            records = self.client.search_read(
                 "model.party.address",
-                "read",
-                [[address_id], fields, context],
+                [("party", "=", party_id)],
+                fields,
+                limit=1,
+                context=context,
             )
         except TrytonRPCError as exc:
-            logger.warning("Impossible de lire l'adresse %s: %s", address_id, exc)
+            logger.warning("Impossible de lire l'adresse principale pour party=%s: %s", party_id, exc)
             return {}
         return records[0] if records else {}
 
@@ -797,6 +926,15 @@ class PortalAccountService:
         if self._address_postal_field is not None:
             return self._address_postal_field
         context = self._rpc_context()
+        try:
+            self._address_postal_field = self.metadata.address_postal_field(self.client, context)
+        except TrytonRPCError as exc:
+            logger.warning("Unable to introspect party.address fields: %s. Probing postal fields instead.", exc)
+        else:
+            return self._address_postal_field
+        return self._probe_address_postal_field(context)
+
+    def _probe_address_postal_field(self, context: dict[str, Any]) -> Optional[str]:
         candidates = ("postal_code", "zip", "postcode")
         try:
             sample_ids = self.client.call(
@@ -860,6 +998,137 @@ class PortalAccountService:
             return None
 
 
+class OrderableProductCatalog:
+    """Process-wide snapshot of the orderable products, shared through the Django cache.
+
+    Past the soft TTL the snapshot is still served while one background rebuild runs;
+    the shared entry expires after the hard TTL. Each process keeps the decoded snapshot
+    in memory and re-checks the shared stamp at most every ``VERSION_CHECK_INTERVAL`` seconds.
+    """
+
+    CACHE_KEY = "accounts.catalog.orderable.v1"
+    STAMP_KEY = "accounts.catalog.orderable.stamp"
+    VERSION_KEY_PREFIX = "accounts.catalog.orderable.version"
+    REFRESH_LOCK_KEY = "accounts.catalog.orderable.refresh"
+    REFRESH_LOCK_SECONDS = 5 * 60
+    VERSION_CHECK_INTERVAL = 5.0
+
+    def __init__(self, *, soft_ttl: Optional[int] = None, hard_ttl: Optional[int] = None) -> None:
+        if soft_ttl is None:
+            soft_ttl = getattr(settings, "PORTAL_ORDER_CATALOG_TTL", 15 * 60)
+        if hard_ttl is None:
+            hard_ttl = getattr(settings, "PORTAL_ORDER_CATALOG_STALE_TTL", 24 * 60 * 60)
+        self.soft_ttl = max(0, int(soft_ttl))
+        self.hard_ttl = max(self.soft_ttl, int(hard_ttl))
+        self._lock = threading.Lock()
+        self._snapshot: Optional[PortalCatalogSnapshot] = None
+        self._checked_at = 0.0
+        self._index: Optional[CatalogSearchIndex] = None
+
+    def get(self, loader: Callable[[], dict[int, PortalOrderProduct]]) -> PortalCatalogSnapshot:
+        """Return the current snapshot; only a missing one makes the caller wait for ``loader``."""
+        snapshot = self._current()
+        if snapshot is None:
+            return self.refresh(loader)
+        if time.time() >= snapshot.built_at + self.soft_ttl and cache.add(
+            self.REFRESH_LOCK_KEY, True, self.REFRESH_LOCK_SECONDS
+        ):
+            self._start_background(lambda: self._background_refresh(loader))
+        return snapshot
+
+    def refresh(self, loader: Callable[[], dict[int, PortalOrderProduct]]) -> PortalCatalogSnapshot:
+        """Rebuild the snapshot from Tryton and publish it to every process."""
+        products = loader()
+        snapshot = PortalCatalogSnapshot(version=self._version_of(products), built_at=time.time(), products=products)
+        cache.set(self.CACHE_KEY, snapshot, self.hard_ttl)
+        cache.set(self.STAMP_KEY, self._stamp(snapshot), self.hard_ttl)
+        cache.set(self._version_key(snapshot.version), snapshot, self.hard_ttl)
+        with self._lock:
+            self._snapshot = snapshot
+            self._checked_at = time.monotonic()
+        return snapshot
+
+    def get_version(self, version: str) -> Optional[PortalCatalogSnapshot]:
+        """Snapshot published under ``version``, while it is still within the hard TTL."""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+        snapshot = cache.get(self._version_key(version))
+        return snapshot if isinstance(snapshot, PortalCatalogSnapshot) else None
+
+    def search_index(self, snapshot: PortalCatalogSnapshot) -> CatalogSearchIndex:
+        """In-process search index of ``snapshot``, built once per catalog version."""
+        index = self._index
+        if index is None or index.version != snapshot.version:
+            index = CatalogSearchIndex(list(snapshot.products.values()), version=snapshot.version)
+            self._index = index
+        return index
+
+    def clear(self) -> None:
+        cache.delete_many([self.CACHE_KEY, self.STAMP_KEY, self.REFRESH_LOCK_KEY])
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = 0.0
+            self._index = None
+
+    def _current(self) -> Optional[PortalCatalogSnapshot]:
+        now = time.monotonic()
+        with self._lock:
+            snapshot, checked_at = self._snapshot, self._checked_at
+        if snapshot is not None and now - checked_at < self.VERSION_CHECK_INTERVAL:
+            return snapshot
+        stamp = cache.get(self.STAMP_KEY)
+        if stamp is None:
+            return None
+        if snapshot is None or self._stamp(snapshot) != stamp:
+            snapshot = cache.get(self.CACHE_KEY)
+            if not isinstance(snapshot, PortalCatalogSnapshot):
+                return None
+        with self._lock:
+            self._snapshot = snapshot
+            self._checked_at = now
+        return snapshot
+
+    def _background_refresh(self, loader: Callable[[], dict[int, PortalOrderProduct]]) -> None:
+        try:
+            self.refresh(loader)
+        except PortalOrderServiceError as exc:
+            logger.warning(
+                "Rafraîchissement du catalogue de commande impossible, version précédente conservée: %s", exc
+            )
+        except Exception:
+            logger.exception("Erreur inattendue lors du rafraîchissement du catalogue de commande.")
+        finally:
+            cache.delete(self.REFRESH_LOCK_KEY)
+
+    @staticmethod
+    def _start_background(target: Callable[[], None]) -> None:
+        threading.Thread(target=target, name="order-catalog-refresh", daemon=True).start()
+
+    @classmethod
+    def _version_key(cls, version: str) -> str:
+        return f"{cls.VERSION_KEY_PREFIX}:{version}"
+
+    @staticmethod
+    def _stamp(snapshot: PortalCatalogSnapshot) -> str:
+        return f"{snapshot.version}:{snapshot.built_at:.6f}"
+
+    @staticmethod
+    def _version_of(products: dict[int, PortalOrderProduct]) -> str:
+        digest = hashlib.sha1()
+        for product in sorted(products.values(), key=lambda item: item.id):
+            digest.update(
+                repr((product.id, product.name, product.code, product.unit_id, product.unit_name, product.unit_price))
+                .encode()
+            )
+        return digest.hexdigest()[:16]
+
+
+def get_order_catalog() -> OrderableProductCatalog:
+    """Return the process-wide orderable product catalog."""
+    return apps.get_app_config("accounts").get_order_catalog()
+
+
 class PortalOrderService:
     """Service dédié au formulaire de commandes du portail client."""
 
@@ -874,64 +1143,95 @@ class PortalOrderService:
     }
     DEFAULT_PAGE_SIZE = 20
     DEFAULT_PERIOD_DAYS = 90
+    ORDER_LIST_FIELDS = [
+        "id",
+        "number",
+        "reference",
+        "state",
+        "shipping_date",
+        "total_amount",
+        "currency",
+        "create_date",
+    ]
+    ORDER_DETAIL_FIELDS = [
+        "id",
+        "number",
+        "reference",
+        "state",
+        "shipping_date",
+        "total_amount",
+        "untaxed_amount",
+        "currency",
+        "create_date",
+        "party",
+        "lines",
+    ]
 
     def __init__(
         self,
         *,
         client: Optional[TrytonClient] = None,
         account_service: Optional[PortalAccountService] = None,
+        metadata: Optional[TrytonMetadataRegistry] = None,
+        count_cache_timeout: Optional[int] = None,
+        catalog: Optional[OrderableProductCatalog] = None,
     ) -> None:
         self.client = client or get_tryton_client()
-        self.account_service = account_service or PortalAccountService(client=self.client)
+        self.metadata = metadata or get_metadata_registry()
+        self.catalog = catalog or get_order_catalog()
+        self.account_service = account_service or PortalAccountService(client=self.client, metadata=self.metadata)
+        if count_cache_timeout is None:
+            count_cache_timeout = getattr(settings, "PORTAL_LIST_TOTAL_CACHE_TTL", 300)
+        self.count_cache_timeout = max(0, int(count_cache_timeout))
         self._base_context: dict[str, Any] = {}
-        self._product_cache: dict[int, PortalOrderProduct] | None = None
         self._company_id: Optional[int] = None
         self._company_currency_id: Optional[int] = None
+        # Données déjà chargées pour la requête (validation du formulaire), réutilisées à la soumission.
+        self._shipment_addresses: dict[str, tuple[int, list[PortalOrderAddress]]] = {}
 
     def list_orderable_products(self, *, force_refresh: bool = False) -> list[PortalOrderProduct]:
-        """Retourne la liste des produits commandables."""
-        self._ensure_company_context()
-        if self._product_cache is not None and not force_refresh:
-            return list(self._product_cache.values())
+        """Retourne la liste des produits commandables (instantané partagé du catalogue)."""
+        return list(self.catalog_snapshot(force_refresh=force_refresh).products.values())
+
+    def catalog_snapshot(self, *, force_refresh: bool = False) -> PortalCatalogSnapshot:
+        """Instantané versionné des produits commandables, sans appel Tryton tant qu'il est en cache."""
+        if force_refresh:
+            return self.catalog.refresh(self._load_orderable_products)
+        return self.catalog.get(self._load_orderable_products)
+
+    def catalog_search_index(self) -> CatalogSearchIndex:
+        """Index de recherche du catalogue courant (reconstruit seulement quand sa version change)."""
+        return self.catalog.search_index(self.catalog_snapshot())
 
+    def _load_orderable_products(self) -> dict[int, PortalOrderProduct]:
+        self._ensure_company_context()
         context = self._rpc_context()
         domain = [
             ("salable", "=", True),
             ("active", "=", True),
         ]
         try:
-            product_ids = self.client.call(
+            records = self.client.search_read(
                 "model.product.product",
-                "search",
-                [domain, 0, None, [("name", "ASC")], context],
+                domain,
+                ["id", "name", "code", "default_uom", "list_price", "template"],
+                order=[("name", "ASC")],
+                context=context,
+                coalesce=True,
             )
         except TrytonRPCError as exc:
             logger.exception("Impossible de charger les produits vendables pour le portail.")
             raise PortalOrderServiceError("Impossible de charger la liste des produits. Réessayez plus tard.") from exc
 
-        if not product_ids:
-            self._product_cache = {}
-            return []
-
-        try:
-            records = self.client.call(
-                "model.product.product",
-                "read",
-                [product_ids, ["id", "name", "code", "default_uom", "list_price", "template"], context],
-            )
-        except TrytonRPCError as exc:
-            logger.exception("Impossible de lire les produits %s.", product_ids)
-            raise PortalOrderServiceError("Lecture des produits impossible. Réessayez plus tard.") from exc
-
-        catalog = self._build_product_catalog(records or [])
-        self._product_cache = catalog
-        return list(catalog.values())
+        return self._build_product_catalog(records)
 
     def list_shipment_addresses(self, *, login: str) -> tuple[int, list[PortalOrderAddress]]:
         """Retourne le party Tryton associé au compte et ses adresses de livraison actives."""
-        profile = self.account_service.fetch_client_profile(login=login)
-        addresses = self._fetch_party_addresses(profile.party_id)
-        return profile.party_id, addresses
+        loaded = self._shipment_addresses.get(login)
+        if loaded is None:
+            party_id = self.account_service.resolve_party(login=login)
+            loaded = self._shipment_addresses[login] = (party_id, self._fetch_party_addresses(party_id))
+        return loaded
 
     def create_draft_order(
         self,
@@ -942,19 +1242,28 @@ class PortalOrderService:
         shipping_address_id: int,
         lines: Sequence[PortalOrderLineInput],
         instructions: Optional[str] = None,
+        catalog_version: Optional[str] = None,
     ) -> PortalOrderSubmissionResult:
+        """Crée la commande brouillon en un seul appel Tryton (``sale.sale.create``).
+
+        Le party et les adresses viennent de ``list_shipment_addresses`` (déjà appelé pour valider le
+        formulaire), les produits de l'instantané du catalogue; un produit absent de l'instantané est
+        refusé. ``catalog_version`` est la version du catalogue affichée au client : si elle n'est plus
+        courante, les produits commandés doivent être identiques dans les deux versions. Sans version,
+        la commande est refusée comme si le catalogue avait changé.
+        """
         if not lines:
             raise PortalOrderServiceError("Ajoutez au moins une ligne de commande.")
 
-        profile = self.account_service.fetch_client_profile(login=login)
-        party_id = profile.party_id
-        addresses = self._fetch_party_addresses(party_id)
+        party_id, addresses = self.list_shipment_addresses(login=login)
         address_ids = {address.id for address in addresses}
         if shipping_address_id not in address_ids:
             raise PortalOrderServiceError("Adresse de livraison invalide. Rechargez la page pour actualiser la liste.")
 
         product_ids = {line.product_id for line in lines}
-        products = self._read_products(product_ids)
+        snapshot = self.catalog_snapshot()
+        self._check_offered_products(product_ids, catalog_version, snapshot)
+        products = self._read_products(product_ids, snapshot)
         missing = product_ids - set(products.keys())
         if missing:
             raise PortalOrderServiceError("Un produit sélectionné n'est plus disponible. Rechargez la page.")
@@ -1009,10 +1318,11 @@ class PortalOrderService:
         if order_id is None:
             raise PortalOrderServiceError("Tryton n'a pas retourné d'identifiant pour la commande.")
 
-        number = self._read_order_number(order_id, context)
+        self.account_service.bump_party_cache_generation(party_id=party_id)
+        # Tryton n'attribue le numéro qu'à la soumission du devis : un brouillon n'en a pas encore.
         return PortalOrderSubmissionResult(
             order_id=order_id,
-            number=number,
+            number=None,
             portal_reference=client_reference.strip() if client_reference else None,
         )
 
@@ -1025,26 +1335,61 @@ class PortalOrderService:
         search: Optional[str] = None,
         page: int = 1,
         page_size: Optional[int] = None,
+        keyset: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
     ) -> PortalOrderListResult:
-        """Retourne une liste paginée des commandes pour le party du client."""
+        """Retourne une liste paginée des commandes pour le party du client.
+
+        En mode ``keyset`` (ou dès qu'un curseur ``after``/``before`` est fourni), la page est lue
+        directement après le curseur en ordre ``(create_date, id)``, sans offset ni ``search_count``;
+        ``page`` ne sert alors qu'à l'affichage.
+        """
         self._ensure_company_context()
-        profile = self.account_service.fetch_client_profile(login=login)
+        party_id = self.account_service.resolve_party(login=login)
         context = self._rpc_context()
-
-        normalized_statuses = self._normalize_statuses(statuses)
-        normalized_period = self._normalize_period(period_days)
-        normalized_search = (search or "").strip()
         size = self._sanitize_page_size(page_size)
+        domain = self._build_order_domain(party_id, statuses, period_days, search)
 
-        domain: list[object] = [("party", "=", profile.party_id)]
-        if normalized_statuses:
-            domain.append(("state", "in", normalized_statuses))
-        if normalized_period is not None and normalized_period > 0:
-            start_date = date.today() - timedelta(days=normalized_period)
-            domain.append(("create_date", ">=", start_date.isoformat()))
-        if normalized_search:
-            pattern = f"%{normalized_search}%"
-            domain.append(["OR", ("number", "ilike", pattern), ("reference", "ilike", pattern)])
+        after_cursor = decode_cursor(after)
+        before_cursor = None if after_cursor else decode_cursor(before)
+        cursor = after_cursor or before_cursor
+        if cursor is not None or (keyset and int(page or 1) <= 1):
+            try:
+                records, has_next, has_previous = keyset_search(
+                    self.client,
+                    "model.sale.sale",
+                    domain,
+                    self.ORDER_LIST_FIELDS,
+                    field="create_date",
+                    cursor=cursor,
+                    forward=before_cursor is None,
+                    size=size,
+                    context=context,
+                )
+                current_page = max(int(page or 1), 1) if has_previous else 1
+                total = keyset_total(
+                    self.account_service,
+                    "model.sale.sale",
+                    party_id,
+                    domain,
+                    load=lambda: self.client.call("model.sale.sale", "search_count", [domain, context]),
+                    timeout=self.count_cache_timeout,
+                    page=current_page,
+                    size=size,
+                    shown=len(records),
+                    has_next=has_next,
+                )
+            except TrytonRPCError as exc:
+                logger.exception("Impossible de lister les commandes pour party=%s.", party_id)
+                raise PortalOrderServiceError("Impossible de charger vos commandes pour le portail.") from exc
+            return self._build_order_list_result(
+                records,
+                total=total,
+                page=current_page,
+                size=size,
+                has_next=has_next,
+            )
 
         try:
             total = int(
@@ -1056,98 +1401,77 @@ class PortalOrderService:
                 or 0
             )
         except TrytonRPCError as exc:
-            logger.exception("Impossible de compter les commandes pour party=%s.", profile.party_id)
+            logger.exception("Impossible de compter les commandes pour party=%s.", party_id)
             raise PortalOrderServiceError("Impossible de charger vos commandes pour le portail.") from exc
 
-        pages = max(1, (total + size - 1) // size)
-        current_page = min(max(page, 1), pages)
-        offset = (current_page - 1) * size
-
         if total == 0:
-            pagination = PortalOrderPagination(
-                page=1,
-                pages=1,
-                page_size=size,
-                total=0,
-                has_next=False,
-                has_previous=False,
-            )
-            return PortalOrderListResult(orders=[], pagination=pagination)
+            return self._build_order_list_result([], total=0, page=1, size=size)
 
+        current_page, _, offset = page_window(total, page, size)
         try:
-            order_ids = self.client.call(
+            records = self.client.search_read(
                 "model.sale.sale",
-                "search",
-                [domain, offset, size, [("create_date", "DESC"), ("id", "DESC")], context],
+                domain,
+                self.ORDER_LIST_FIELDS,
+                offset=offset,
+                limit=size,
+                order=[("create_date", "DESC"), ("id", "DESC")],
+                context=context,
             )
         except TrytonRPCError as exc:
-            logger.exception("Impossible de lister les commandes pour party=%s.", profile.party_id)
+            logger.exception("Impossible de lister les commandes pour party=%s.", party_id)
             raise PortalOrderServiceError("Impossible de charger vos commandes pour le portail.") from exc
 
-        if not order_ids:
-            pagination = PortalOrderPagination(
-                page=current_page,
-                pages=pages,
-                page_size=size,
-                total=total,
-                has_next=current_page < pages,
-                has_previous=current_page > 1,
-            )
-            return PortalOrderListResult(orders=[], pagination=pagination)
+        return self._build_order_list_result(records, total=total, page=current_page, size=size)
 
-        fields = [
-            "id",
-            "number",
-            "reference",
-            "state",
-            "shipping_date",
-            "total_amount",
-            "currency",
-            "create_date",
-        ]
+    def status_histogram(self, *, login: str, period_days: Optional[int] = None) -> dict[str, int]:
+        """Compte les commandes de la période par état, en une seule lecture de la colonne ``state``."""
+        self._ensure_company_context()
+        party_id = self.account_service.resolve_party(login=login)
+        domain = self._build_order_domain(party_id, None, period_days, None)
         try:
-            records = self.client.call(
-                "model.sale.sale",
-                "read",
-                [order_ids, fields, context],
-            )
+            records = self.client.search_read("model.sale.sale", domain, ["state"], context=self._rpc_context())
         except TrytonRPCError as exc:
-            logger.exception("Impossible de lire les commandes %s.", order_ids)
-            raise PortalOrderServiceError("Lecture des commandes impossible. Réessayez plus tard.") from exc
-
-        orders = [self._parse_order_record(record) for record in records or []]
-        pagination = PortalOrderPagination(
-            page=current_page,
-            pages=pages,
-            page_size=size,
-            total=total,
-            has_next=current_page < pages,
-            has_previous=current_page > 1,
-        )
-        return PortalOrderListResult(orders=orders, pagination=pagination)
+            logger.exception("Impossible de compter les commandes par état pour party=%s.", party_id)
+            raise PortalOrderServiceError("Impossible de charger le résumé de vos commandes.") from exc
+        return _count_states(records)
 
     def get_order_detail(self, *, login: str, order_id: int) -> PortalOrderDetail:
         """Retourne le détail d'une commande, sécurisée par le party du client."""
         self._ensure_company_context()
-        profile = self.account_service.fetch_client_profile(login=login)
+        party_id = self.account_service.resolve_party(login=login)
         context = self._rpc_context()
         try:
             records = self.client.call(
                 "model.sale.sale",
                 "read",
-                [[order_id], ["id", "number", "reference", "state", "shipping_date", "total_amount", "untaxed_amount", "currency", "create_date", "party", "lines"], context],
+                [[order_id], self.ORDER_DETAIL_FIELDS, context],
             )
         except TrytonRPCError as exc:
             logger.exception("Impossible de lire la commande %s.", order_id)
             raise PortalOrderServiceError("Impossible de charger la commande demandée.") from exc
 
+        record = self._check_order_record(records, party_id=party_id)
+        line_ids = self._normalize_ids(record.get("lines"))
+        lines = self._read_order_lines(line_ids, context)
+        return self._build_order_detail(record, order_id=order_id, lines=lines)
+
+    def _check_order_record(self, records: Any, *, party_id: int) -> dict[str, Any]:
         if not records:
             raise PortalOrderServiceError("Commande introuvable.")
         record = records[0]
         order_party_id = PortalAccountService._extract_id(record.get("party"))
-        if order_party_id != profile.party_id:
+        if order_party_id != party_id:
             raise PortalOrderServiceError("Commande inaccessible pour ce compte.")
+        return record
 
+    def _build_order_detail(
+        self,
+        record: dict[str, Any],
+        *,
+        order_id: int,
+        lines: list[PortalOrderLineDetail],
+    ) -> PortalOrderDetail:
         currency_label = None
         currency_field = record.get("currency")
         if isinstance(currency_field, (list, tuple)) and len(currency_field) > 1:
@@ -1155,9 +1479,6 @@ class PortalOrderService:
         elif isinstance(currency_field, dict) and currency_field.get("rec_name"):
             currency_label = str(currency_field["rec_name"])
 
-        line_ids = self._normalize_ids(record.get("lines"))
-        lines = self._read_order_lines(line_ids, context)
-
         return PortalOrderDetail(
             id=PortalAccountService._extract_id(record.get("id")) or order_id,
             number=str(record.get("number") or "") or None,
@@ -1175,35 +1496,22 @@ class PortalOrderService:
     def _resolve_company_defaults(self) -> tuple[int, int]:
         if self._company_id is not None and self._company_currency_id is not None:
             return self._company_id, self._company_currency_id
-        context = self._rpc_context()
         try:
-            company_ids = self.client.call(
-                "model.company.company",
-                "search",
-                [[], 0, 1, [("id", "ASC")], context],
-            )
+            record = self.metadata.company_record(self.client, self._rpc_context())
         except TrytonRPCError as exc:
             logger.exception("Impossible de déterminer l'entreprise par défaut pour le portail.")
             raise PortalOrderServiceError(
                 "Impossible de déterminer l'entreprise Tryton configurée pour le portail."
             ) from exc
-        if not company_ids:
+        return self._store_company_defaults([record] if record else [])
+
+    def _store_company_defaults(self, records: list[dict[str, Any]]) -> tuple[int, int]:
+        if not records:
             raise PortalOrderServiceError("Aucune entreprise n'est configurée dans Tryton.")
-        company_id = PortalAccountService._extract_id(company_ids[0])
+        company_id = PortalAccountService._extract_id(records[0].get("id"))
         if company_id is None:
             raise PortalOrderServiceError("Tryton n'a pas retourné d'identifiant d'entreprise.")
-        try:
-            records = self.client.call(
-                "model.company.company",
-                "read",
-                [[company_id], ["currency"], context],
-            )
-        except TrytonRPCError as exc:
-            logger.exception("Impossible de lire la devise de l'entreprise %s.", company_id)
-            raise PortalOrderServiceError("Impossible de lire la configuration de l'entreprise dans Tryton.") from exc
-        currency_id = None
-        if records:
-            currency_id = PortalAccountService._extract_id(records[0].get("currency"))
+        currency_id = PortalAccountService._extract_id(records[0].get("currency"))
         if currency_id is None:
             raise PortalOrderServiceError("L'entreprise configurée pour le portail n'a pas de devise.")
         self._company_id = company_id
@@ -1232,35 +1540,24 @@ class PortalOrderService:
             ("party", "=", party_id),
             ("active", "=", True),
         ]
-        try:
-            address_ids = self.client.call(
-                "model.party.address",
-                "search",
-                [domain, 0, None, [("id", "ASC")], context],
-            )
-        except TrytonRPCError as exc:
-            logger.exception("Impossible de charger les adresses pour party=%s", party_id)
-            raise PortalOrderServiceError("Impossible de charger vos adresses de livraison.") from exc
-
-        if not address_ids:
-            return []
-
         postal_field = self._resolve_postal_field()
         address_fields = ["id", "street", "city", "rec_name"]
         if postal_field and postal_field not in address_fields:
             address_fields.append(postal_field)
         try:
-            records = self.client.call(
+            records = self.client.search_read(
                 "model.party.address",
-                "read",
-                [address_ids, address_fields, context],
+                domain,
+                address_fields,
+                order=[("id", "ASC")],
+                context=context,
             )
         except TrytonRPCError as exc:
-            logger.exception("Impossible de lire les adresses %s.", address_ids)
-            raise PortalOrderServiceError("Lecture des adresses impossible. Réessayez plus tard.") from exc
+            logger.exception("Impossible de charger les adresses pour party=%s", party_id)
+            raise PortalOrderServiceError("Impossible de charger vos adresses de livraison.") from exc
 
         addresses: list[PortalOrderAddress] = []
-        for record in records or []:
+        for record in records:
             address_id = PortalAccountService._extract_id(record.get("id"))
             if address_id is None:
                 continue
@@ -1284,34 +1581,30 @@ class PortalOrderService:
             )
         return addresses
 
-    def _read_products(self, product_ids: Iterable[int]) -> dict[int, PortalOrderProduct]:
-        self._ensure_company_context()
-        ids_list = sorted({int(pid) for pid in product_ids if pid is not None})
-        if not ids_list:
-            return {}
-        context = self._rpc_context()
-        try:
-            records = self.client.call(
-                "model.product.product",
-                "read",
-                [ids_list, ["id", "name", "code", "default_uom", "list_price"], context],
+    @staticmethod
+    def _read_products(
+        product_ids: Iterable[int], snapshot: PortalCatalogSnapshot
+    ) -> dict[int, PortalOrderProduct]:
+        """Produits demandés présents dans l'instantané; un id hors catalogue commandable est ignoré."""
+        return {pid: snapshot.products[pid] for pid in product_ids if pid in snapshot.products}
+
+    def _check_offered_products(
+        self, product_ids: Iterable[int], catalog_version: Optional[str], current: PortalCatalogSnapshot
+    ) -> None:
+        if catalog_version and current.version == catalog_version:
+            return
+        offered = self.catalog.get_version(catalog_version) if catalog_version else None
+        if offered is None:
+            # Version absente, expirée ou inconnue : les prix affichés ne peuvent pas être vérifiés.
+            changed = list(product_ids)
+        else:
+            changed = [pid for pid in product_ids if offered.products.get(pid) != current.products.get(pid)]
+        if changed:
+            logger.info("Catalogue modifié pendant la soumission (produits %s).", sorted(changed))
+            raise PortalOrderServiceError(
+                "Le catalogue vient d'être mis à jour pour un produit sélectionné. Vérifiez vos lignes puis "
+                "soumettez de nouveau."
             )
-        except TrytonRPCError as exc:
-            logger.exception("Impossible de lire les produits %s.", ids_list)
-            raise PortalOrderServiceError("Impossible de vérifier les produits sélectionnés.") from exc
-
-        return self._build_product_catalog(records or [])
-
-    def _read_order_number(self, order_id: int, context: dict[str, Any]) -> Optional[str]:
-        try:
-            records = self.client.call("model.sale.sale", "read", [[order_id], ["number"], context])
-        except TrytonRPCError:
-            logger.warning("Impossible de lire le numéro de commande pour sale.sale %s.", order_id, exc_info=True)
-            return None
-        if not records:
-            return None
-        number = records[0].get("number")
-        return str(number) if number else None
 
     def _rpc_context(self) -> dict[str, Any]:
         return dict(self._base_context)
@@ -1438,6 +1731,9 @@ class PortalOrderService:
         except TrytonRPCError as exc:
             logger.exception("Impossible de lire les lignes de commande %s.", ids_list)
             raise PortalOrderServiceError("Impossible de charger les lignes de la commande.") from exc
+        return self._parse_order_lines(records)
+
+    def _parse_order_lines(self, records: Any) -> list[PortalOrderLineDetail]:
         details: list[PortalOrderLineDetail] = []
         for record in records or []:
             unit_field = record.get("unit")
@@ -1487,6 +1783,52 @@ class PortalOrderService:
             return "Inconnu"
         return self.STATE_LABELS.get(key, key.capitalize())
 
+    def _build_order_domain(
+        self,
+        party_id: int,
+        statuses: Sequence[str] | None,
+        period_days: Optional[int],
+        search: Optional[str],
+    ) -> list[object]:
+        normalized_statuses = self._normalize_statuses(statuses)
+        normalized_period = self._normalize_period(period_days)
+        normalized_search = (search or "").strip()
+
+        domain: list[object] = [("party", "=", party_id)]
+        if normalized_statuses:
+            domain.append(("state", "in", normalized_statuses))
+        if normalized_period is not None and normalized_period > 0:
+            start_date = date.today() - timedelta(days=normalized_period)
+            domain.append(("create_date", ">=", start_date.isoformat()))
+        if normalized_search:
+            pattern = f"%{normalized_search}%"
+            domain.append(["OR", ("number", "ilike", pattern), ("reference", "ilike", pattern)])
+        return domain
+
+    def _build_order_list_result(
+        self,
+        records: list[dict[str, Any]],
+        *,
+        total: int,
+        page: int,
+        size: int,
+        has_next: Optional[bool] = None,
+    ) -> PortalOrderListResult:
+        pages = max(1, (total + size - 1) // size)
+        has_next = page < pages if has_next is None else has_next
+        orders = [self._parse_order_record(record) for record in records]
+        pagination = PortalOrderPagination(
+            page=page,
+            pages=pages,
+            page_size=size,
+            total=total,
+            has_next=has_next,
+            has_previous=page > 1,
+            next_cursor=encode_cursor(records[-1], "create_date") if records and has_next else None,
+            previous_cursor=encode_cursor(records[0], "create_date") if records and page > 1 else None,
+        )
+        return PortalOrderListResult(orders=orders, pagination=pagination)
+
     def _normalize_statuses(self, statuses: Sequence[str] | None) -> list[str]:
         if not statuses:
             return []
@@ -1543,26 +1885,44 @@ class PortalInvoiceService:
         "waiting_payment": "En attente",
     }
     DEFAULT_PAGE_SIZE = 20
+    INVOICE_LIST_FIELDS = [
+        "id",
+        "number",
+        "invoice_date",
+        "payment_term_date",
+        "state",
+        "total_amount",
+        "amount_to_pay",
+        "currency",
+    ]
+    OUTSTANDING_STATES = ("validated", "posted", "waiting_payment")
+    OUTSTANDING_FIELDS = ["id", "amount_to_pay", "currency", "currency.code"]
+    OUTSTANDING_CHUNK_SIZE = 1000
+    OUTSTANDING_CACHE_KEY_PREFIX = "accounts.invoices.outstanding.v2"
 
     def __init__(
         self,
         *,
         client: Optional[TrytonClient] = None,
         account_service: Optional[PortalAccountService] = None,
+        totals_cache_timeout: Optional[int] = None,
+        count_cache_timeout: Optional[int] = None,
     ) -> None:
         self.client = client or get_tryton_client()
         self.account_service = account_service or PortalAccountService(client=self.client)
         self._base_context: dict[str, Any] = {}
+        if totals_cache_timeout is None:
+            totals_cache_timeout = getattr(settings, "PORTAL_INVOICE_TOTALS_CACHE_TTL", 300)
+        self.totals_cache_timeout = max(0, int(totals_cache_timeout))
+        if count_cache_timeout is None:
+            count_cache_timeout = getattr(settings, "PORTAL_LIST_TOTAL_CACHE_TTL", 300)
+        self.count_cache_timeout = max(0, int(count_cache_timeout))
 
     def count_invoices(self, *, login: str, statuses: Sequence[str]) -> int:
         """Compte le nombre de factures dans les états donnés."""
-        profile = self.account_service.fetch_client_profile(login=login)
+        party_id = self.account_service.resolve_party(login=login)
         context = self._rpc_context()
-        domain: list[object] = [
-            ("party", "=", profile.party_id),
-            ("type", "=", "out"),
-            ("state", "in", statuses),
-        ]
+        domain = self._build_invoice_domain(party_id, statuses=statuses)
         try:
             return int(
                 self.client.call(
@@ -1573,7 +1933,7 @@ class PortalInvoiceService:
                 or 0
             )
         except TrytonRPCError as exc:
-            logger.warning("Impossible de compter les factures pour %s: %s", profile.party_id, exc)
+            logger.warning("Impossible de compter les factures pour %s: %s", party_id, exc)
             return 0
 
     def list_invoices(
@@ -1582,14 +1942,55 @@ class PortalInvoiceService:
         login: str,
         page: int = 1,
         page_size: Optional[int] = None,
+        keyset: bool = False,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
     ) -> PortalInvoiceListResult:
-        profile = self.account_service.fetch_client_profile(login=login)
+        """Retourne une page de factures; le mode ``keyset`` suit l'ordre ``(invoice_date, id)``."""
+        party_id = self.account_service.resolve_party(login=login)
         context = self._rpc_context()
         size = self._sanitize_page_size(page_size)
-        domain: list[object] = [
-            ("party", "=", profile.party_id),
-            ("type", "=", "out"),
-        ]
+        domain = self._build_invoice_domain(party_id)
+
+        after_cursor = decode_cursor(after)
+        before_cursor = None if after_cursor else decode_cursor(before)
+        cursor = after_cursor or before_cursor
+        if cursor is not None or (keyset and int(page or 1) <= 1):
+            try:
+                records, has_next, has_previous = keyset_search(
+                    self.client,
+                    "model.account.invoice",
+                    domain,
+                    self.INVOICE_LIST_FIELDS,
+                    field="invoice_date",
+                    cursor=cursor,
+                    forward=before_cursor is None,
+                    size=size,
+                    context=context,
+                )
+                current_page = max(int(page or 1), 1) if has_previous else 1
+                total = keyset_total(
+                    self.account_service,
+                    "model.account.invoice",
+                    party_id,
+                    domain,
+                    load=lambda: self.client.call("model.account.invoice", "search_count", [domain, context]),
+                    timeout=self.count_cache_timeout,
+                    page=current_page,
+                    size=size,
+                    shown=len(records),
+                    has_next=has_next,
+                )
+            except TrytonRPCError as exc:
+                logger.exception("Impossible de lister les factures pour party=%s.", party_id)
+                raise PortalInvoiceServiceError("Impossible de charger vos factures pour le portail.") from exc
+            return self._build_invoice_list_result(
+                records,
+                total=total,
+                page=current_page,
+                size=size,
+                has_next=has_next,
+            )
 
         try:
             total = int(
@@ -1601,73 +2002,121 @@ class PortalInvoiceService:
                 or 0
             )
         except TrytonRPCError as exc:
-            logger.exception("Impossible de compter les factures pour party=%s.", profile.party_id)
+            logger.exception("Impossible de compter les factures pour party=%s.", party_id)
             raise PortalInvoiceServiceError("Impossible de charger vos factures pour le portail.") from exc
 
         if total == 0:
-            pagination = PortalInvoicePagination(
-                page=1,
-                pages=1,
-                page_size=size,
-                total=0,
-                has_next=False,
-                has_previous=False,
-            )
-            return PortalInvoiceListResult(invoices=[], pagination=pagination)
-
-        pages = max(1, (total + size - 1) // size)
-        current_page = min(max(int(page or 1), 1), pages)
-        offset = (current_page - 1) * size
+            return self._build_invoice_list_result([], total=0, page=1, size=size)
 
+        current_page, _, offset = page_window(total, page, size)
         try:
-            invoice_ids = self.client.call(
+            records = self.client.search_read(
                 "model.account.invoice",
-                "search",
-                [domain, offset, size, [("invoice_date", "DESC"), ("id", "DESC")], context],
+                domain,
+                self.INVOICE_LIST_FIELDS,
+                offset=offset,
+                limit=size,
+                order=[("invoice_date", "DESC"), ("id", "DESC")],
+                context=context,
             )
         except TrytonRPCError as exc:
-            logger.exception("Impossible de lister les factures pour party=%s.", profile.party_id)
+            logger.exception("Impossible de lister les factures pour party=%s.", party_id)
             raise PortalInvoiceServiceError("Impossible de charger vos factures pour le portail.") from exc
 
-        if not invoice_ids:
-            pagination = PortalInvoicePagination(
-                page=current_page,
-                pages=pages,
-                page_size=size,
-                total=total,
-                has_next=current_page < pages,
-                has_previous=current_page > 1,
-            )
-            return PortalInvoiceListResult(invoices=[], pagination=pagination)
+        return self._build_invoice_list_result(records, total=total, page=current_page, size=size)
 
-        fields = [
-            "id",
-            "number",
-            "invoice_date",
-            "payment_term_date",
-            "state",
-            "total_amount",
-            "amount_to_pay",
-            "currency",
-        ]
+    def status_histogram(self, *, login: str) -> dict[str, int]:
+        """Compte les factures du client par état, en une seule lecture de la colonne ``state``."""
+        party_id = self.account_service.resolve_party(login=login)
+        domain = self._build_invoice_domain(party_id)
         try:
-            records = self.client.call(
-                "model.account.invoice",
-                "read",
-                [invoice_ids, fields, context],
-            )
+            records = self.client.search_read("model.account.invoice", domain, ["state"], context=self._rpc_context())
         except TrytonRPCError as exc:
-            logger.exception("Impossible de lire les factures %s.", invoice_ids)
-            raise PortalInvoiceServiceError("Lecture des factures impossible. Réessayez plus tard.") from exc
+            logger.exception("Impossible de compter les factures par état pour party=%s.", party_id)
+            raise PortalInvoiceServiceError("Impossible de charger le résumé de vos factures.") from exc
+        return _count_states(records)
+
+    def outstanding_totals(self, *, login: str, use_cache: bool = True) -> dict[str, Decimal]:
+        """Somme exacte des montants dus par devise, sur toutes les factures ouvertes du client.
+
+        Les factures sont lues par tranches de ``OUTSTANDING_CHUNK_SIZE`` (pagination par id) et
+        le résultat est mis en cache par génération du party pendant ``totals_cache_timeout`` secondes.
+        """
+        party_id = self.account_service.resolve_party(login=login)
+        cache_key = self._outstanding_cache_key(party_id)
+        if use_cache and self.totals_cache_timeout:
+            cached = cache.get(cache_key)
+            if isinstance(cached, dict):
+                return cached
+        totals: dict[str, Decimal] = {}
+        domain = self._build_invoice_domain(party_id, statuses=self.OUTSTANDING_STATES)
+        last_id = 0
+        while True:
+            try:
+                records = self.client.search_read(
+                    "model.account.invoice",
+                    [*domain, ("id", ">", last_id)],
+                    self.OUTSTANDING_FIELDS,
+                    limit=self.OUTSTANDING_CHUNK_SIZE,
+                    order=[("id", "ASC")],
+                    context=self._rpc_context(),
+                )
+            except TrytonRPCError as exc:
+                logger.exception("Impossible de calculer le solde des factures pour party=%s.", party_id)
+                raise PortalInvoiceServiceError("Impossible de calculer le solde de vos factures.") from exc
+            last_id = self._add_outstanding(totals, records or [], last_id)
+            if len(records or []) < self.OUTSTANDING_CHUNK_SIZE:
+                break
+        if self.totals_cache_timeout:
+            cache.set(cache_key, totals, self.totals_cache_timeout)
+        return totals
+
+    def _outstanding_cache_key(self, party_id: int) -> str:
+        generation = self.account_service.party_cache_generation(party_id=party_id)
+        return f"{self.OUTSTANDING_CACHE_KEY_PREFIX}:{party_id}:{generation}"
+
+    def _add_outstanding(self, totals: dict[str, Decimal], records: list[dict[str, Any]], last_id: int) -> int:
+        for record in records:
+            last_id = max(last_id, PortalAccountService._extract_id(record.get("id")) or 0)
+            amount = self._to_decimal(record.get("amount_to_pay"))
+            if not amount:
+                continue
+            nested_currency = record.get("currency.")
+            label = (nested_currency or {}).get("code") if isinstance(nested_currency, dict) else None
+            label = label or self._currency_label(record.get("currency")) or ""
+            totals[label] = totals.get(label, Decimal("0")) + amount
+        return last_id
 
-        invoices = [self._parse_invoice_record(record) for record in records or []]
+    def _build_invoice_domain(self, party_id: int, *, statuses: Sequence[str] | None = None) -> list[object]:
+        domain: list[object] = [
+            ("party", "=", party_id),
+            ("type", "=", "out"),
+        ]
+        if statuses is not None:
+            domain.append(("state", "in", statuses))
+        return domain
+
+    def _build_invoice_list_result(
+        self,
+        records: list[dict[str, Any]],
+        *,
+        total: int,
+        page: int,
+        size: int,
+        has_next: Optional[bool] = None,
+    ) -> PortalInvoiceListResult:
+        pages = max(1, (total + size - 1) // size)
+        has_next = page < pages if has_next is None else has_next
+        invoices = [self._parse_invoice_record(record) for record in records]
         pagination = PortalInvoicePagination(
-            page=current_page,
+            page=page,
             pages=pages,
             page_size=size,
             total=total,
-            has_next=current_page < pages,
-            has_previous=current_page > 1,
+            has_next=has_next,
+            has_previous=page > 1,
+            next_cursor=encode_cursor(records[-1], "invoice_date") if records and has_next else None,
+            previous_cursor=encode_cursor(records[0], "invoice_date") if records and page > 1 else None,
         )
         return PortalInvoiceListResult(invoices=invoices, pagination=pagination)
 
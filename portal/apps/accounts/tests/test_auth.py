@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
 
+from apps.accounts.services import PortalAccountServiceError
 from apps.core.services import TrytonAuthError, TrytonRPCError
 
 
@@ -20,9 +21,11 @@ class ClientAuthTests(TestCase):
         self.assertTemplateUsed(response, "accounts/login.html")
         self.assertIn("form", response.context)
 
+    @patch("apps.accounts.auth_backend.TrytonBackend.account_service_class")
     @patch("apps.accounts.auth_backend.TrytonClient")
-    def test_login_success_redirects_to_dashboard(self, mock_client_cls):
+    def test_login_success_redirects_to_dashboard(self, mock_client_cls, mock_account_service_cls):
         mock_client = mock_client_cls.return_value
+        mock_account_service_cls.return_value.resolve_identity.return_value = (42, 77)
         mock_client.login.return_value = (42, "session-token")
         mock_client.get_session_context.return_value = {
             "user_id": 42,
@@ -48,6 +51,7 @@ class ClientAuthTests(TestCase):
         session_payload = self.client.session.get("tryton_session")
         self.assertIsNotNone(session_payload)
         self.assertEqual(session_payload["session"], "session-token")
+        self.assertEqual(session_payload["party_id"], 77)
         mock_client.close.assert_called_once()
         mock_client.call.assert_called_once_with(
             "model.res.user",
@@ -70,9 +74,11 @@ class ClientAuthTests(TestCase):
         self.assertFalse(self.UserModel.objects.filter(username="client@example.com").exists())
         mock_client.call.assert_not_called()
 
+    @patch("apps.accounts.auth_backend.TrytonBackend.account_service_class")
     @patch("apps.accounts.auth_backend.TrytonClient")
-    def test_login_success_without_preferences_fallbacks(self, mock_client_cls):
+    def test_login_success_without_preferences_fallbacks(self, mock_client_cls, mock_account_service_cls):
         mock_client = mock_client_cls.return_value
+        mock_account_service_cls.return_value.resolve_identity.side_effect = PortalAccountServiceError("absent")
         mock_client.login.return_value = (42, "session-token")
         mock_client.get_session_context.return_value = {
             "user_id": 42,
@@ -94,6 +100,8 @@ class ClientAuthTests(TestCase):
         self.assertEqual(user.email, "client@example.com")
         self.assertEqual(user.first_name, "client@example.com")
         self.assertEqual(user.last_name, "")
+        self.assertNotIn("party_id", self.client.session.get("tryton_session"))
+
     def test_dashboard_requires_authentication(self):
         response = self.client.get(self.dashboard_url)
 
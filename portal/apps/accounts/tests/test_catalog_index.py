@@ -0,0 +1,67 @@
+from django.test import SimpleTestCase
+
+from apps.accounts.catalog_index import CatalogSearchIndex, fold
+from apps.accounts.services import PortalOrderProduct
+
+
+class CatalogSearchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = CatalogSearchIndex(
+            [
+                PortalOrderProduct(id=1, name="Palette de bois", code="PAL-48", unit_id=5, unit_name="palette"),
+                PortalOrderProduct(id=2, name="Planche d'épinette", code="PL-2", unit_id=7, unit_name="pied"),
+                PortalOrderProduct(id=3, name="Bois recyclé", code="PAL", unit_id=None, unit_name=None),
+                PortalOrderProduct(id=4, name="Palette bleue", code="PAL-BLUE", unit_id=5, unit_name="palette"),
+            ],
+            version="v1",
+        )
+
+    def _ids(self, query, unit=""):
+        return [self.index.products[rank].id for rank in self.index.search(query, unit=unit).ranks]
+
+    def test_fold_strips_accents_and_case(self):
+        self.assertEqual(fold("Épinette RECYCLÉE"), "epinette recyclee")
+
+    def test_prefix_terms_are_accent_insensitive_and_combined(self):
+        self.assertEqual(self._ids("epin"), [2])
+        self.assertEqual(self._ids("Recyc"), [3])
+        self.assertEqual(self._ids("pal bois"), [1, 3])
+
+    def test_exact_code_match_comes_first_then_catalog_order(self):
+        self.assertEqual(self._ids("pal"), [3, 1, 4])
+
+    def test_unit_facets_count_matches_before_the_unit_filter(self):
+        result = self.index.search("pal", unit="5")
+
+        self.assertEqual([self.index.products[rank].id for rank in result.ranks], [1, 4])
+        self.assertEqual(
+            result.unit_filters,
+            [
+                {"value": "5", "label": "palette", "count": 2},
+                {"value": "none", "label": "Sans unité", "count": 1},
+            ],
+        )
+
+    def test_empty_query_lists_everything_and_filters_missing_unit(self):
+        self.assertEqual(self._ids(""), [1, 2, 3, 4])
+        self.assertEqual(self._ids("", unit="none"), [3])
+        self.assertEqual(self._ids("", unit="abc"), [1, 2, 3, 4])
+
+    def test_matches_slice_pages_across_boosted_and_catalog_order(self):
+        ranks = self.index.search("pal").ranks
+
+        self.assertEqual(len(ranks), 3)
+        self.assertEqual([self.index.products[rank].id for rank in ranks[1:3]], [1, 4])
+        self.assertEqual(self.index.products[ranks[-1]].id, 4)
+        self.assertEqual(ranks[5:8], [])
+
+    def test_fragments_are_rendered_once_per_product(self):
+        rendered = []
+
+        def render(product):
+            rendered.append(product.id)
+            return str(product.id).encode()
+
+        self.assertEqual(self.index.fragments([0, 2], render), [b"1", b"3"])
+        self.assertEqual(self.index.fragments([2, 3], render), [b"3", b"4"])
+        self.assertEqual(rendered, [1, 3, 4])
@@ -1,18 +1,26 @@
-from unittest.mock import patch
+import threading
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
 
 from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.template.loader import render_to_string
 from django.test import TestCase
 from django.urls import reverse
 
 from apps.accounts.services import (
+    PortalAccountService,
     PortalInvoiceSummary,
     PortalInvoiceListResult,
     PortalInvoicePagination,
     PortalOrderSummary,
     PortalOrderListResult,
     PortalOrderPagination,
+    PortalOrderServiceError,
 )
-from apps.accounts.views import ClientDashboardView
+from apps.accounts.views import ClientDashboardFragmentView, ClientDashboardView
 
 
 class NoopInvoiceService:
@@ -26,6 +34,12 @@ class NoopInvoiceService:
     def count_invoices(self, *args, **kwargs):
         return 0
 
+    def status_histogram(self, *args, **kwargs):
+        return {}
+
+    def outstanding_totals(self, *args, **kwargs):
+        return {}
+
 
 class NoopOrderService:
     def __init__(self, *args, **kwargs):
@@ -36,6 +50,90 @@ class NoopOrderService:
         pagination = PortalOrderPagination(page=1, pages=1, page_size=page_size, total=0, has_next=False, has_previous=False)
         return PortalOrderListResult(orders=[], pagination=pagination)
 
+    def status_histogram(self, *args, **kwargs):
+        return {}
+
+
+class SlowOrderService(NoopOrderService):
+    release = threading.Event()
+
+    def list_orders(self, *args, **kwargs):
+        self.release.wait(timeout=5)
+        return super().list_orders(*args, **kwargs)
+
+
+class LateFailingOrderService(NoopOrderService):
+    release = threading.Event()
+    finished = threading.Event()
+
+    def list_orders(self, *args, **kwargs):
+        self.release.wait(timeout=5)
+        try:
+            raise PortalOrderServiceError("Erreur tardive des commandes.")
+        finally:
+            self.finished.set()
+
+
+class FailingOrderService(NoopOrderService):
+    def list_orders(self, *args, **kwargs):
+        raise AssertionError("The dashboard shell must not call Tryton.")
+
+    def status_histogram(self, *args, **kwargs):
+        raise AssertionError("The dashboard shell must not call Tryton.")
+
+
+class PartyOrderService(NoopOrderService):
+    histogram_calls = 0
+
+    def __init__(self, *args, **kwargs):
+        self.account_service = PortalAccountService(client=MagicMock(), metadata=MagicMock())
+        self.account_service.remember_party(login="client@example.com", party_id=77)
+
+    def status_histogram(self, *args, **kwargs):
+        type(self).histogram_calls += 1
+        return {"draft": 2}
+
+
+class UnresolvedPartyOrderService(NoopOrderService):
+    """Party not known yet: resolving it would be a Tryton call on ``tryton_client``."""
+
+    tryton_client = MagicMock()
+
+    def __init__(self, *args, **kwargs):
+        self.account_service = PortalAccountService(client=self.tryton_client, metadata=MagicMock())
+
+
+class SiblingFailureOrderService(PartyOrderService):
+    """The orders list fails while the summary is still being built."""
+
+    summary_started = threading.Event()
+    failed = threading.Event()
+
+    def list_orders(self, *args, **kwargs):
+        self.summary_started.wait(timeout=2)
+        raise PortalOrderServiceError("Commandes indisponibles.")
+
+    def status_histogram(self, *args, **kwargs):
+        self.summary_started.set()
+        self.failed.wait(timeout=2)
+        return super().status_histogram(*args, **kwargs)
+
+
+class CountingInvoiceService(NoopInvoiceService):
+    list_calls = 0
+
+    def list_invoices(self, *args, **kwargs):
+        type(self).list_calls += 1
+        return super().list_invoices(*args, **kwargs)
+
+
+class CountingPartyOrderService(PartyOrderService):
+    list_calls = 0
+
+    def list_orders(self, *args, **kwargs):
+        type(self).list_calls += 1
+        return super().list_orders(*args, **kwargs)
+
 
 class DashboardGreetingTests(TestCase):
     def setUp(self):
@@ -164,6 +262,187 @@ class DashboardGreetingTests(TestCase):
         self.assertEqual(items[1]["status_label"], "Confirmée")
 
 
+class DashboardWidgetLoadingTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username="client@example.com", email="client@example.com")
+        self.client.force_login(user, backend="django.contrib.auth.backends.ModelBackend")
+        SlowOrderService.release.clear()
+        self.addCleanup(SlowOrderService.release.set)
+
+    @patch.object(ClientDashboardView, "widget_timeouts", {"orders": 0.1})
+    @patch.object(ClientDashboardView, "order_service_class", SlowOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_slow_widget_degrades_to_empty_block(self, *_):
+        started = time.monotonic()
+        response = self.client.get(reverse("accounts:dashboard"), {"complet": "1"})
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["recent_orders"], [])
+        messages = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertIn("Le bloc « commandes récentes » est momentanément indisponible.", messages)
+
+    @patch.object(ClientDashboardView, "widget_timeouts", {"orders": 0.05})
+    @patch.object(ClientDashboardView, "order_service_class", SlowOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_stuck_widgets_do_not_starve_later_requests(self, *_):
+        for _ in range(10):
+            response = self.client.get(reverse("accounts:dashboard"), {"complet": "1"})
+
+        messages = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertNotIn("Le bloc « factures récentes » est momentanément indisponible.", messages)
+
+    @patch.object(ClientDashboardView, "widget_timeouts", {"orders": 0.05})
+    @patch.object(ClientDashboardView, "order_service_class", LateFailingOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_late_widget_error_does_not_leak_into_the_next_page(self, *_):
+        LateFailingOrderService.release.clear()
+        LateFailingOrderService.finished.clear()
+        self.addCleanup(LateFailingOrderService.release.set)
+        self.client.get(reverse("accounts:dashboard"), {"complet": "1"})
+        LateFailingOrderService.release.set()
+        self.assertTrue(LateFailingOrderService.finished.wait(timeout=2))
+        time.sleep(0.05)
+
+        with patch.object(ClientDashboardView, "order_service_class", NoopOrderService):
+            response = self.client.get(reverse("accounts:dashboard"), {"complet": "1"})
+
+        messages = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertNotIn("Erreur tardive des commandes.", messages)
+
+
+class DashboardFragmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        user = get_user_model().objects.create_user(username="client@example.com", email="client@example.com")
+        self.client.force_login(user, backend="django.contrib.auth.backends.ModelBackend")
+        SlowOrderService.release.clear()
+        self.addCleanup(SlowOrderService.release.set)
+
+    @patch.object(ClientDashboardView, "order_service_class", FailingOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_shell_renders_without_calling_tryton(self, *_):
+        response = self.client.get(reverse("accounts:dashboard"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["pending_fragments"], {"summary", "invoices", "orders", "activity"})
+        for fragment in ("summary", "invoices", "orders", "activity"):
+            self.assertContains(response, reverse("accounts:dashboard-fragment", args=[fragment]))
+
+    @patch.object(ClientDashboardView, "order_service_class", UnresolvedPartyOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_shell_without_session_party_makes_no_rpc(self, *_):
+        UnresolvedPartyOrderService.tryton_client.reset_mock()
+
+        response = self.client.get(reverse("accounts:dashboard"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["pending_fragments"], {"summary", "invoices", "orders", "activity"})
+        self.assertEqual(UnresolvedPartyOrderService.tryton_client.method_calls, [])
+
+    @patch.object(ClientDashboardView, "order_service_class", NoopOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_summary_fragment_snapshot_is_reused_by_the_shell(self, *_):
+        response = self.client.get(reverse("accounts:dashboard-fragment", args=["summary"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "data-orders-to-complete-label")
+        self.assertEqual(response["Cache-Control"], "private, no-store")
+
+        with patch.object(ClientDashboardView, "order_service_class", FailingOrderService):
+            shell = self.client.get(reverse("accounts:dashboard"))
+
+        self.assertEqual(shell.context["summary"]["orders_to_complete_label"], "0 commandes")
+
+    @patch.object(ClientDashboardView, "widget_timeouts", {"orders": 0.1})
+    @patch.object(ClientDashboardView, "order_service_class", SlowOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_slow_fragment_reports_error_inline(self, *_):
+        response = self.client.get(reverse("accounts:dashboard-fragment", args=["activity"]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Le bloc « commandes récentes » est momentanément indisponible.")
+        self.assertEqual(list(get_messages(response.wsgi_request)), [])
+
+    @patch.object(ClientDashboardFragmentView, "order_service_class", NoopOrderService)
+    @patch.object(ClientDashboardFragmentView, "invoice_service_class", NoopInvoiceService)
+    def test_unknown_fragment_returns_404(self, *_):
+        response = self.client.get(reverse("accounts:dashboard-fragment", args=["inconnu"]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class DashboardPartyCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        user = get_user_model().objects.create_user(username="client@example.com", email="client@example.com")
+        self.client.force_login(user, backend="django.contrib.auth.backends.ModelBackend")
+        PartyOrderService.histogram_calls = 0
+        session = self.client.session
+        session["tryton_session"] = {"username": "client@example.com", "party_id": 77, "user_id": 1}
+        session.save()
+        self.url = reverse("accounts:dashboard-fragment", args=["summary"])
+
+    @patch.object(ClientDashboardView, "order_service_class", PartyOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_summary_is_cached_per_party_until_generation_bump(self, *_):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(PartyOrderService.histogram_calls, 1)
+
+        shell = self.client.get(reverse("accounts:dashboard"))
+        self.assertNotIn("summary", shell.context["pending_fragments"])
+        self.assertEqual(shell.context["summary"]["orders_to_complete_label"], "2 commandes")
+
+        PortalAccountService(client=MagicMock()).bump_party_cache_generation(party_id=77)
+        self.client.get(self.url)
+        self.assertEqual(PartyOrderService.histogram_calls, 2)
+
+    @patch.object(ClientDashboardView, "order_service_class", SiblingFailureOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_sibling_widget_failure_does_not_prevent_caching(self, *_):
+        SiblingFailureOrderService.summary_started.clear()
+        SiblingFailureOrderService.failed.clear()
+        SiblingFailureOrderService.histogram_calls = 0
+        notify = ClientDashboardView._notify
+
+        def notify_then_release(view, level, text):
+            notify(view, level, text)
+            SiblingFailureOrderService.failed.set()
+
+        with patch.object(ClientDashboardView, "_notify", notify_then_release):
+            response = self.client.get(reverse("accounts:dashboard"), {"complet": "1"})
+        self.assertEqual(response.context["recent_orders"], [])
+        self.client.get(self.url)
+
+        self.assertEqual(SiblingFailureOrderService.histogram_calls, 1)
+
+    @patch.object(ClientDashboardView, "order_service_class", PartyOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", NoopInvoiceService)
+    def test_activity_fragment_is_cached_for_the_shell(self, *_):
+        self.client.get(reverse("accounts:dashboard-fragment", args=["activity"]))
+
+        shell = self.client.get(reverse("accounts:dashboard"))
+
+        self.assertNotIn("activity", shell.context["pending_fragments"])
+        self.assertEqual(shell.context["activity_items"], [])
+
+    @patch.object(ClientDashboardView, "order_service_class", CountingPartyOrderService)
+    @patch.object(ClientDashboardView, "invoice_service_class", CountingInvoiceService)
+    def test_activity_fragment_reuses_the_lists_loaded_by_their_fragments(self, *_):
+        CountingInvoiceService.list_calls = 0
+        CountingPartyOrderService.list_calls = 0
+        for fragment in ("invoices", "orders", "activity"):
+            response = self.client.get(reverse("accounts:dashboard-fragment", args=[fragment]))
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(CountingInvoiceService.list_calls, 1)
+        self.assertEqual(CountingPartyOrderService.list_calls, 1)
+        shell = self.client.get(reverse("accounts:dashboard"))
+        self.assertEqual(shell.context["pending_fragments"], {"summary"})
+
+
 class DashboardSummaryTests(TestCase):
     def setUp(self):
         self.view = ClientDashboardView()
@@ -172,24 +451,15 @@ class DashboardSummaryTests(TestCase):
         self.view.order_service = NoopOrderService()
 
     def test_build_summary_counts_waiting_payment_invoices(self):
-        def mock_count_invoices(login, statuses):
-            if "draft" in statuses:
-                return 1
-            if "posted" in statuses:
-                return 2
-            if "validated" in statuses:
-                return 3
-            if "waiting_payment" in statuses:
-                return 5
-            return 0
-
-        self.view.invoice_service.count_invoices = mock_count_invoices
-        # Also mock order counts to avoid errors
-        self.view.order_service.list_orders = lambda **kwargs: PortalOrderListResult(
-            orders=[], pagination=PortalOrderPagination(1, 1, 1, 0, False, False)
-        )
+        self.view.invoice_service.status_histogram = lambda login: {
+            "draft": 1,
+            "posted": 2,
+            "validated": 3,
+            "waiting_payment": 5,
+            "paid": 8,
+        }
 
-        summary = self.view._build_summary(invoices_result=None, login="test")
+        summary, ok = self.view._build_summary(login="test")
 
         # Check breakdown
         breakdown = {item["label"]: item["count"] for item in summary["invoices_breakdown"]}
@@ -200,28 +470,31 @@ class DashboardSummaryTests(TestCase):
 
         # Check total due count (1 + 2 + 3 + 5 = 11)
         self.assertEqual(summary["invoices_due_count"], 11)
+        self.assertTrue(ok)
+
+    def test_build_summary_is_not_ok_when_a_count_fails(self):
+        def failing_histogram(**kwargs):
+            raise PortalOrderServiceError("Résumé des commandes indisponible.")
+
+        self.view.widget_errors = []
+        self.view.widget_messages = []
+        self.view.order_service.status_histogram = failing_histogram
+
+        summary, ok = self.view._build_summary(login="test")
+
+        self.assertFalse(ok)
+        self.assertEqual(summary["orders_active_count"], 0)
 
     def test_build_summary_counts_draft_orders(self):
-        def mock_list_orders(login, statuses=None, **kwargs):
-            total = 0
-            if statuses:
-                if "draft" in statuses:
-                    total += 1
-                if "quotation" in statuses:
-                    total += 2
-                if "confirmed" in statuses:
-                    total += 3
-                if "processing" in statuses or "sent" in statuses:
-                    total += 4
-            
-            return PortalOrderListResult(
-                orders=[],
-                pagination=PortalOrderPagination(1, 1, 1, total, False, False)
-            )
-
-        self.view.order_service.list_orders = mock_list_orders
-        
-        summary = self.view._build_summary(invoices_result=None, login="test")
+        requested = {}
+
+        def mock_status_histogram(login, period_days=None):
+            requested["period_days"] = period_days
+            return {"draft": 1, "quotation": 2, "confirmed": 3, "processing": 3, "sent": 1, "done": 7}
+
+        self.view.order_service.status_histogram = mock_status_histogram
+
+        summary, ok = self.view._build_summary(login="test")
 
         # Check breakdown
         breakdown = {item["label"]: item["count"] for item in summary["orders_breakdown"]}
@@ -232,3 +505,28 @@ class DashboardSummaryTests(TestCase):
 
         # Check total active count (1 + 2 + 3 + 4 = 10)
         self.assertEqual(summary["orders_active_count"], 10)
+        self.assertEqual(summary["orders_to_complete_count"], 3)
+        self.assertEqual(requested["period_days"], ClientDashboardView.order_period_days)
+
+    def test_build_summary_reports_outstanding_totals_per_currency(self):
+        self.view.invoice_service.outstanding_totals = lambda login: {
+            "USD": Decimal("12.00"),
+            "CAD": Decimal("1250.45"),
+        }
+
+        summary, ok = self.view._build_summary(login="test")
+
+        self.assertEqual(summary["invoices_due_total"], Decimal("1250.45"))
+        self.assertEqual(summary["invoices_currency"], "CAD")
+        self.assertEqual(
+            summary["invoices_due_totals"],
+            [
+                {"currency": "CAD", "amount": Decimal("1250.45")},
+                {"currency": "USD", "amount": Decimal("12.00")},
+            ],
+        )
+
+        html = render_to_string("accounts/includes/dashboard_summary.html", {"summary": summary})
+        self.assertIn("Solde dû", html)
+        self.assertIn("1250,45", html)
+        self.assertIn("12,00", html)
@@ -6,6 +6,7 @@ from unittest.mock import MagicMock, patch
 
 from django.contrib.auth import get_user_model
 from django.contrib.messages import get_messages
+from django.core.cache import cache
 from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 
@@ -37,33 +38,31 @@ class PortalInvoiceServiceTests(SimpleTestCase):
             address=PortalClientAddress(),
         )
         self.account_service.fetch_client_profile.return_value = self.profile
+        self.account_service.resolve_party.return_value = self.profile.party_id
 
     def test_list_invoices_returns_paginated_results(self):
-        self.tryton_client.call.side_effect = [
-            2,
-            [11, 22],
-            [
-                {
-                    "id": 11,
-                    "number": "INV-001",
-                    "invoice_date": "2025-11-01",
-                    "payment_term_date": "2025-11-30",
-                    "state": "posted",
-                    "total_amount": "100.00",
-                    "amount_to_pay": "25.00",
-                    "currency": [5, "CAD"],
-                },
-                {
-                    "id": 22,
-                    "number": "INV-002",
-                    "invoice_date": "2025-10-01",
-                    "payment_term_date": None,
-                    "state": "paid",
-                    "total_amount": "50.00",
-                    "amount_to_pay": None,
-                    "currency": [5, "CAD"],
-                },
-            ],
+        self.tryton_client.call.return_value = 2
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 11,
+                "number": "INV-001",
+                "invoice_date": "2025-11-01",
+                "payment_term_date": "2025-11-30",
+                "state": "posted",
+                "total_amount": "100.00",
+                "amount_to_pay": "25.00",
+                "currency": [5, "CAD"],
+            },
+            {
+                "id": 22,
+                "number": "INV-002",
+                "invoice_date": "2025-10-01",
+                "payment_term_date": None,
+                "state": "paid",
+                "total_amount": "50.00",
+                "amount_to_pay": None,
+                "currency": [5, "CAD"],
+            },
         ]
 
         result = self.service.list_invoices(login="client@example.com", page=1, page_size=20)
@@ -76,6 +75,74 @@ class PortalInvoiceServiceTests(SimpleTestCase):
         domain_payload = call_args.args[2][0]
         self.assertIn(("party", "=", 77), domain_payload)
         self.assertIn(("type", "=", "out"), domain_payload)
+        read_kwargs = self.tryton_client.search_read.call_args.kwargs
+        self.assertEqual(read_kwargs["limit"], 20)
+        self.assertEqual(read_kwargs["order"], [("invoice_date", "DESC"), ("id", "DESC")])
+
+    def _invoice_records(self, *ids):
+        return [
+            {
+                "id": invoice_id,
+                "number": f"INV-{invoice_id:03d}",
+                "invoice_date": f"2025-10-{invoice_id:02d}",
+                "payment_term_date": None,
+                "state": "posted",
+                "total_amount": "10.00",
+                "amount_to_pay": "10.00",
+                "currency": [5, "CAD"],
+            }
+            for invoice_id in ids
+        ]
+
+    def test_list_invoices_keyset_reads_limit_plus_one_and_caches_total(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.account_service.party_cache_generation.return_value = 1
+        self.tryton_client.search_read.return_value = self._invoice_records(9, 8, 7)
+        self.tryton_client.call.return_value = 7  # search_count
+
+        first = self.service.list_invoices(login="client@example.com", page=1, page_size=2, keyset=True)
+        again = self.service.list_invoices(login="client@example.com", page=1, page_size=2, keyset=True)
+
+        self.assertEqual([invoice.id for invoice in first.invoices], [9, 8])
+        self.assertTrue(first.pagination.has_next)
+        self.assertFalse(first.pagination.has_previous)
+        self.assertEqual(first.pagination.total, 7)
+        self.assertEqual(first.pagination.pages, 4)
+        self.assertEqual(again.pagination.total, 7)
+        self.tryton_client.call.assert_called_once()
+        read_kwargs = self.tryton_client.search_read.call_args.kwargs
+        self.assertEqual(read_kwargs["limit"], 3)
+        self.assertNotIn("offset", read_kwargs)
+        self.assertEqual(read_kwargs["order"], [("invoice_date", "DESC NULLS FIRST"), ("id", "DESC")])
+        self.assertIsNotNone(first.pagination.next_cursor)
+
+    def test_list_invoices_keyset_follows_after_cursor(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.account_service.party_cache_generation.return_value = 1
+        self.tryton_client.call.return_value = 2  # search_count
+        self.tryton_client.search_read.return_value = self._invoice_records(8, 7)
+        first = self.service.list_invoices(login="client@example.com", page=1, page_size=1, keyset=True)
+        self.tryton_client.search_read.return_value = self._invoice_records(7)
+        self.tryton_client.call.reset_mock()
+
+        result = self.service.list_invoices(
+            login="client@example.com",
+            page=2,
+            page_size=1,
+            after=first.pagination.next_cursor,
+        )
+
+        domain = self.tryton_client.search_read.call_args.args[1]
+        self.assertIn(
+            ["OR", ("invoice_date", "<", "2025-10-08"), [("invoice_date", "=", "2025-10-08"), ("id", "<", 8)]],
+            domain,
+        )
+        self.assertEqual(result.pagination.page, 2)
+        self.assertTrue(result.pagination.has_previous)
+        self.assertFalse(result.pagination.has_next)
+        self.tryton_client.call.assert_not_called()
 
     def test_list_invoices_returns_empty_result_when_none(self):
         self.tryton_client.call.side_effect = [0]
@@ -87,6 +154,51 @@ class PortalInvoiceServiceTests(SimpleTestCase):
         self.assertEqual(result.invoices, [])
         self.assertEqual(self.tryton_client.call.call_count, 1)
 
+    def test_status_histogram_counts_states_from_a_single_read(self):
+        self.tryton_client.search_read.return_value = [
+            {"id": 1, "state": "posted"},
+            {"id": 2, "state": "posted"},
+            {"id": 3, "state": "paid"},
+        ]
+
+        histogram = self.service.status_histogram(login="client@example.com")
+
+        self.assertEqual(histogram, {"posted": 2, "paid": 1})
+        call_args = self.tryton_client.search_read.call_args
+        self.assertEqual(call_args.args[2], ["state"])
+        self.assertIn(("party", "=", 77), call_args.args[1])
+        self.tryton_client.call.assert_not_called()
+
+
+    def test_outstanding_totals_sums_every_chunk_per_currency(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.service.OUTSTANDING_CHUNK_SIZE = 2
+        self.account_service.party_cache_generation.return_value = 1
+        self.tryton_client.search_read.side_effect = [
+            [
+                {"id": 3, "amount_to_pay": "10.10", "currency": 5, "currency.": {"id": 5, "code": "CAD"}},
+                {"id": 7, "amount_to_pay": {"__class__": "Decimal", "decimal": "0.20"}, "currency": [5, "CAD"]},
+            ],
+            [
+                {"id": 9, "amount_to_pay": "5.00", "currency": 6, "currency.": {"id": 6, "code": "USD"}},
+            ],
+        ]
+
+        totals = self.service.outstanding_totals(login="client@example.com")
+        cached = self.service.outstanding_totals(login="client@example.com")
+
+        self.assertEqual(totals, {"CAD": Decimal("10.30"), "USD": Decimal("5.00")})
+        self.assertEqual(cached, totals)
+        self.assertEqual(self.tryton_client.search_read.call_count, 2)
+        second_domain = self.tryton_client.search_read.call_args_list[1].args[1]
+        self.assertIn(("id", ">", 7), second_domain)
+        self.assertIn(("state", "in", PortalInvoiceService.OUTSTANDING_STATES), second_domain)
+
+        self.account_service.party_cache_generation.return_value = 2
+        self.tryton_client.search_read.side_effect = [[]]
+        self.assertEqual(self.service.outstanding_totals(login="client@example.com"), {})
+
 
 class InvoiceListViewTests(TestCase):
     def setUp(self):
@@ -127,6 +239,7 @@ class InvoiceListViewTests(TestCase):
         kwargs = service.list_invoices.call_args.kwargs
         self.assertEqual(kwargs["page"], 2)
         self.assertEqual(kwargs["page_size"], PortalInvoiceService.DEFAULT_PAGE_SIZE)
+        self.assertTrue(kwargs["keyset"])
         self.assertIn("invoices", response.context)
         self.assertIn("pagination", response.context)
         self.assertIn("summary", response.context)
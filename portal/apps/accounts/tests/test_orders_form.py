@@ -9,8 +9,10 @@ from django.contrib.messages import get_messages
 from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 
+from apps.accounts.catalog_index import CatalogSearchIndex
 from apps.accounts.forms import OrderDraftForm, OrderLineFormSet, ORDER_LINES_FORMSET_PREFIX
 from apps.accounts.services import (
+    PortalCatalogSnapshot,
     PortalClientAddress,
     PortalClientProfile,
     PortalOrderAddress,
@@ -23,6 +25,7 @@ from apps.accounts.services import (
     PortalOrderServiceError,
     PortalOrderSubmissionResult,
 )
+from apps.core.services import TrytonRPCError
 
 
 class OrderDraftFormTests(SimpleTestCase):
@@ -102,6 +105,7 @@ class PortalOrderServiceTests(SimpleTestCase):
             address=PortalClientAddress(),
         )
         self.account_service.fetch_client_profile.return_value = self.profile
+        self.account_service.resolve_party.return_value = self.profile.party_id
         self.account_service._get_address_postal_field = MagicMock(return_value="postal_code")
         self.service._company_id = 42
         self.service._company_currency_id = 5
@@ -109,26 +113,23 @@ class PortalOrderServiceTests(SimpleTestCase):
         self.service._resolve_currency_id = MagicMock(return_value=5)
 
     def test_list_orderable_products_returns_catalog(self):
-        self.tryton_client.call.side_effect = [
-            [11, 22],
-            [
-                {
-                    "id": 11,
-                    "name": "Palette standard",
-                    "code": "PAL-STD",
-                    "default_uom": [5, "palette"],
-                    "list_price": "10.00",
-                    "template": [101, "Palette standard"],
-                },
-                {
-                    "id": 22,
-                    "name": "Bois recyclé",
-                    "code": None,
-                    "default_uom": [6, "lb"],
-                    "list_price": "12.50",
-                    "template": [102, "Bois recyclé"],
-                },
-            ],
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 11,
+                "name": "Palette standard",
+                "code": "PAL-STD",
+                "default_uom": [5, "palette"],
+                "list_price": "10.00",
+                "template": [101, "Palette standard"],
+            },
+            {
+                "id": 22,
+                "name": "Bois recyclé",
+                "code": None,
+                "default_uom": [6, "lb"],
+                "list_price": "12.50",
+                "template": [102, "Bois recyclé"],
+            },
         ]
 
         products = self.service.list_orderable_products(force_refresh=True)
@@ -139,18 +140,17 @@ class PortalOrderServiceTests(SimpleTestCase):
         self.assertEqual(products[0].unit_price, Decimal("10.00"))
 
     def test_list_orderable_products_falls_back_to_template_price(self):
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 11,
+                "name": "Palette standard",
+                "code": "PAL-STD",
+                "default_uom": [5, "palette"],
+                "list_price": None,
+                "template": [101, "Palette standard"],
+            }
+        ]
         self.tryton_client.call.side_effect = [
-            [11],
-            [
-                {
-                    "id": 11,
-                    "name": "Palette standard",
-                    "code": "PAL-STD",
-                    "default_uom": [5, "palette"],
-                    "list_price": None,
-                    "template": [101, "Palette standard"],
-                }
-            ],
             [
                 {
                     "id": 101,
@@ -164,6 +164,61 @@ class PortalOrderServiceTests(SimpleTestCase):
         self.assertEqual(len(products), 1)
         self.assertEqual(products[0].unit_price, Decimal("19.99"))
 
+    def _catalog_records(self, price="10.00"):
+        return [
+            {
+                "id": 11,
+                "name": "Palette standard",
+                "code": "PAL-STD",
+                "default_uom": [5, "palette"],
+                "list_price": price,
+                "template": [101, "Palette standard"],
+            }
+        ]
+
+    def test_catalog_snapshot_is_shared_between_service_instances(self):
+        self.tryton_client.search_read.return_value = self._catalog_records()
+        first = self.service.catalog_snapshot()
+
+        other = PortalOrderService(client=self.tryton_client, account_service=self.account_service)
+        products = other.list_orderable_products()
+
+        self.assertEqual([product.id for product in products], [11])
+        self.assertEqual(other.catalog_snapshot().version, first.version)
+        self.tryton_client.search_read.assert_called_once()
+
+    def test_catalog_version_changes_only_with_content(self):
+        self.tryton_client.search_read.return_value = self._catalog_records()
+        first = self.service.catalog_snapshot(force_refresh=True)
+        same = self.service.catalog_snapshot(force_refresh=True)
+        self.tryton_client.search_read.return_value = self._catalog_records(price="11.00")
+        changed = self.service.catalog_snapshot(force_refresh=True)
+
+        self.assertEqual(first.version, same.version)
+        self.assertNotEqual(first.version, changed.version)
+
+    def test_create_draft_order_rejects_products_outside_the_orderable_catalog(self):
+        self.tryton_client.search_read.return_value = self._catalog_records()
+        snapshot = self.service.catalog_snapshot()
+        self.service._fetch_party_addresses = MagicMock(
+            return_value=[PortalOrderAddress(id=12, label="Entrepôt principal")]
+        )
+
+        with self.assertRaisesMessage(PortalOrderServiceError, "n'est plus disponible"):
+            self.service.create_draft_order(
+                login="client@example.com",
+                client_reference=None,
+                shipping_date=date(2025, 11, 15),
+                shipping_address_id=12,
+                lines=[
+                    PortalOrderLineInput(product_id=11, quantity=Decimal("2")),
+                    PortalOrderLineInput(product_id=33, quantity=Decimal("1")),
+                ],
+                catalog_version=snapshot.version,
+            )
+
+        self.tryton_client.call.assert_not_called()
+
     def test_create_draft_order_builds_payload_and_returns_result(self):
         self.service._fetch_party_addresses = MagicMock(
             return_value=[PortalOrderAddress(id=12, label="Entrepôt principal")]
@@ -176,8 +231,9 @@ class PortalOrderServiceTests(SimpleTestCase):
             unit_name="palette",
             unit_price=Decimal("25.00"),
         )
-        self.service._read_products = MagicMock(return_value={101: product})
-        self.service._read_order_number = MagicMock(return_value="SO0009")
+        self.service.catalog_snapshot = MagicMock(
+            return_value=PortalCatalogSnapshot(version="v1", built_at=0.0, products={101: product})
+        )
         self.tryton_client.call.return_value = [310]
 
         result = self.service.create_draft_order(
@@ -187,6 +243,7 @@ class PortalOrderServiceTests(SimpleTestCase):
             shipping_address_id=12,
             lines=[PortalOrderLineInput(product_id=101, quantity=Decimal("5.00"), notes="Urgent")],
             instructions="Livraison avant midi",
+            catalog_version="v1",
         )
 
         called_args = self.tryton_client.call.call_args
@@ -204,21 +261,86 @@ class PortalOrderServiceTests(SimpleTestCase):
         self.assertEqual(payload["lines"][0][1][0]["unit"], 5)
         self.assertEqual(payload["lines"][0][1][0]["unit_price"], 25.0)
         self.assertEqual(result.order_id, 310)
-        self.assertEqual(result.number, "SO0009")
+        self.assertIsNone(result.number)
         self.assertEqual(result.portal_reference, "PO-005")
+        self.tryton_client.call.assert_called_once()
+        self.account_service.fetch_client_profile.assert_not_called()
+        self.account_service.bump_party_cache_generation.assert_called_once_with(party_id=77)
+
+    def test_create_draft_order_reuses_addresses_and_products_loaded_for_the_form(self):
+        self.tryton_client.search_read.side_effect = [
+            self._catalog_records(),
+            [{"id": 12, "rec_name": "Entrepôt principal", "street": None, "city": None}],
+        ]
+        shown = self.service.catalog_snapshot()
+        self.service.list_shipment_addresses(login="client@example.com")
+        self.tryton_client.call.return_value = [310]
+
+        self.service.create_draft_order(
+            login="client@example.com",
+            client_reference=None,
+            shipping_date=date(2025, 11, 15),
+            shipping_address_id=12,
+            lines=[PortalOrderLineInput(product_id=11, quantity=Decimal("2"))],
+            catalog_version=shown.version,
+        )
+
+        self.assertEqual(self.tryton_client.search_read.call_count, 2)
+        self.account_service.resolve_party.assert_called_once_with(login="client@example.com")
+        create_args = self.tryton_client.call.call_args.args
+        self.assertEqual(create_args[:2], ("model.sale.sale", "create"))
+        self.assertEqual(create_args[2][0][0]["lines"][0][1][0]["unit_price"], 10.0)
+
+    def test_create_draft_order_rejects_products_changed_since_the_form_was_shown(self):
+        self.tryton_client.search_read.return_value = self._catalog_records()
+        shown = self.service.catalog_snapshot()
+        self.service._fetch_party_addresses = MagicMock(
+            return_value=[PortalOrderAddress(id=12, label="Entrepôt principal")]
+        )
+        self.tryton_client.search_read.return_value = self._catalog_records(price="12.00")
+        self.service.catalog_snapshot(force_refresh=True)
+
+        with self.assertRaises(PortalOrderServiceError):
+            self.service.create_draft_order(
+                login="client@example.com",
+                client_reference=None,
+                shipping_date=date(2025, 11, 15),
+                shipping_address_id=12,
+                lines=[PortalOrderLineInput(product_id=11, quantity=Decimal("2"))],
+                catalog_version=shown.version,
+            )
+
+        self.tryton_client.call.assert_not_called()
+
+    def test_create_draft_order_rejects_a_missing_or_unknown_catalog_version(self):
+        self.tryton_client.search_read.return_value = self._catalog_records()
+        self.service.catalog_snapshot()
+        self.service._fetch_party_addresses = MagicMock(
+            return_value=[PortalOrderAddress(id=12, label="Entrepôt principal")]
+        )
+
+        for catalog_version in ("expired", "", None):
+            with self.subTest(catalog_version=catalog_version), self.assertRaises(PortalOrderServiceError):
+                self.service.create_draft_order(
+                    login="client@example.com",
+                    client_reference=None,
+                    shipping_date=date(2025, 11, 15),
+                    shipping_address_id=12,
+                    lines=[PortalOrderLineInput(product_id=11, quantity=Decimal("2"))],
+                    catalog_version=catalog_version,
+                )
+
+        self.tryton_client.call.assert_not_called()
 
     def test_list_shipment_addresses_uses_stable_order(self):
-        self.tryton_client.call.side_effect = [
-            [12],
-            [
-                {
-                    "id": 12,
-                    "rec_name": "Entrepôt principal",
-                    "street": "1269 rang 6",
-                    "city": "Saint-Prime",
-                    "postal_code": "G8K 2C3",
-                }
-            ],
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 12,
+                "rec_name": "Entrepôt principal",
+                "street": "1269 rang 6",
+                "city": "Saint-Prime",
+                "postal_code": "G8K 2C3",
+            }
         ]
 
         party_id, addresses = self.service.list_shipment_addresses(login="client@example.com")
@@ -226,12 +348,10 @@ class PortalOrderServiceTests(SimpleTestCase):
         self.assertEqual(party_id, 77)
         self.assertEqual(len(addresses), 1)
         self.assertEqual(addresses[0].id, 12)
-        search_call = self.tryton_client.call.call_args_list[0]
-        args = search_call.args
-        self.assertEqual(args[0], "model.party.address")
-        self.assertEqual(args[2][3], [("id", "ASC")])
-        read_call = self.tryton_client.call.call_args_list[1]
-        address_fields = read_call.args[2][1]
+        search_call = self.tryton_client.search_read.call_args
+        self.assertEqual(search_call.args[0], "model.party.address")
+        self.assertEqual(search_call.kwargs["order"], [("id", "ASC")])
+        address_fields = search_call.args[2]
         self.assertIn("rec_name", address_fields)
         self.assertIn("postal_code", address_fields)
 
@@ -272,32 +392,46 @@ class PortalOrderServiceTests(SimpleTestCase):
         self.assertEqual(detail.lines[0].unit, "palette")
         self.assertEqual(detail.lines[0].quantity, Decimal("5"))
 
+    def test_list_orders_keyset_first_page_skips_count_when_complete(self):
+        self.account_service.party_cache_generation.return_value = 1
+        self.tryton_client.search_read.return_value = [
+            {"id": 311, "number": "SO0002", "state": "done", "create_date": "2025-11-11"},
+            {"id": 310, "number": "SO0001", "state": "draft", "create_date": "2025-11-10"},
+        ]
+
+        result = self.service.list_orders(login="client@example.com", page=1, page_size=20, keyset=True)
+
+        self.assertEqual(result.pagination.total, 2)
+        self.assertFalse(result.pagination.has_next)
+        self.assertIsNone(result.pagination.next_cursor)
+        self.tryton_client.call.assert_not_called()
+        read_kwargs = self.tryton_client.search_read.call_args.kwargs
+        self.assertEqual(read_kwargs["limit"], 21)
+        self.assertEqual(read_kwargs["order"], [("create_date", "DESC NULLS FIRST"), ("id", "DESC")])
+
     def test_list_orders_returns_paginated_results(self):
-        self.tryton_client.call.side_effect = [
-            2,  # search_count
-            [310, 311],  # search with pagination
-            [
-                {
-                    "id": 310,
-                    "number": "SO0001",
-                    "reference": "PO-88",
-                    "state": "processing",
-                    "shipping_date": "2025-11-25",
-                    "total_amount": {"__class__": "Decimal", "decimal": "100.00"},
-                    "currency": [5, "CAD"],
-                    "create_date": "2025-11-10",
-                },
-                {
-                    "id": 311,
-                    "number": "SO0002",
-                    "reference": "PO-90",
-                    "state": "done",
-                    "shipping_date": None,
-                    "total_amount": "150.50",
-                    "currency": [5, "CAD"],
-                    "create_date": "2025-11-11",
-                },
-            ],
+        self.tryton_client.call.return_value = 2  # search_count
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 310,
+                "number": "SO0001",
+                "reference": "PO-88",
+                "state": "processing",
+                "shipping_date": "2025-11-25",
+                "total_amount": {"__class__": "Decimal", "decimal": "100.00"},
+                "currency": [5, "CAD"],
+                "create_date": "2025-11-10",
+            },
+            {
+                "id": 311,
+                "number": "SO0002",
+                "reference": "PO-90",
+                "state": "done",
+                "shipping_date": None,
+                "total_amount": "150.50",
+                "currency": [5, "CAD"],
+                "create_date": "2025-11-11",
+            },
         ]
 
         result = self.service.list_orders(
@@ -315,12 +449,19 @@ class PortalOrderServiceTests(SimpleTestCase):
         self.assertEqual(result.orders[0].state_label, "En traitement")
         self.assertEqual(result.orders[0].total_amount, Decimal("100.00"))
         self.assertEqual(result.orders[0].currency_label, "CAD")
-        call_args = self.tryton_client.call.call_args_list[1]
-        domain = call_args.args[2][0]
+        call_args = self.tryton_client.search_read.call_args
+        domain = call_args.args[1]
+        self.assertEqual(call_args.kwargs["limit"], 20)
         self.assertIn(("state", "in", ["processing"]), domain)
         self.assertIn(("party", "=", 77), domain)
         self.assertTrue(any(isinstance(item, list) and item[0] == "OR" for item in domain))
 
+    def test_status_histogram_raises_service_error_on_rpc_failure(self):
+        self.tryton_client.search_read.side_effect = TrytonRPCError("boom")
+
+        with self.assertRaises(PortalOrderServiceError):
+            self.service.status_histogram(login="client@example.com", period_days=30)
+
 
 class OrderCreateViewTests(TestCase):
     def setUp(self):
@@ -330,12 +471,18 @@ class OrderCreateViewTests(TestCase):
         self.url = reverse("accounts:orders-new")
         self.dashboard_url = reverse("accounts:dashboard")
 
+    @staticmethod
+    def _snapshot(*products, version="v1"):
+        return PortalCatalogSnapshot(
+            version=version, built_at=0.0, products={product.id: product for product in products}
+        )
+
     @patch("apps.accounts.views.OrderCreateView.service_class")
     def test_get_renders_form_with_products_and_addresses(self, service_cls):
         service = service_cls.return_value
-        service.list_orderable_products.return_value = [
+        service.catalog_snapshot.return_value = self._snapshot(
             PortalOrderProduct(id=101, name="Palette 48x40", code="PAL-4840", unit_id=5, unit_name="palette")
-        ]
+        )
         service.list_shipment_addresses.return_value = (
             77,
             [PortalOrderAddress(id=12, label="Entrepôt principal")],
@@ -347,15 +494,16 @@ class OrderCreateViewTests(TestCase):
         self.assertTemplateUsed(response, "accounts/orders_form.html")
         self.assertIn("form", response.context)
         self.assertIn("line_formset", response.context)
-        service.list_orderable_products.assert_called_once()
+        self.assertContains(response, 'name="catalog_version" value="v1"')
+        service.catalog_snapshot.assert_called_once()
         service.list_shipment_addresses.assert_called_once()
 
     @patch("apps.accounts.views.OrderCreateView.service_class")
     def test_post_valid_data_creates_order_and_redirects(self, service_cls):
         service = service_cls.return_value
-        service.list_orderable_products.return_value = [
+        service.catalog_snapshot.return_value = self._snapshot(
             PortalOrderProduct(id=101, name="Palette 48x40", code="PAL-4840", unit_id=5, unit_name="palette")
-        ]
+        )
         service.list_shipment_addresses.return_value = (
             77,
             [PortalOrderAddress(id=12, label="Entrepôt principal")],
@@ -371,6 +519,7 @@ class OrderCreateViewTests(TestCase):
             "shipping_date": "2025-11-20",
             "shipping_address": "12",
             "notes": "Livraison arrière",
+            "catalog_version": "v1",
             f"{ORDER_LINES_FORMSET_PREFIX}-TOTAL_FORMS": "1",
             f"{ORDER_LINES_FORMSET_PREFIX}-INITIAL_FORMS": "0",
             f"{ORDER_LINES_FORMSET_PREFIX}-MIN_NUM_FORMS": "0",
@@ -391,15 +540,16 @@ class OrderCreateViewTests(TestCase):
         self.assertEqual(len(kwargs["lines"]), 1)
         self.assertIsInstance(kwargs["lines"][0], PortalOrderLineInput)
         self.assertEqual(kwargs["lines"][0].product_id, 101)
+        self.assertEqual(kwargs["catalog_version"], "v1")
         messages = list(get_messages(response.wsgi_request))
         self.assertTrue(any("Votre commande a été transmise" in msg.message for msg in messages))
 
     @patch("apps.accounts.views.OrderCreateView.service_class")
     def test_post_ignores_deleted_lines(self, service_cls):
         service = service_cls.return_value
-        service.list_orderable_products.return_value = [
+        service.catalog_snapshot.return_value = self._snapshot(
             PortalOrderProduct(id=101, name="Palette 48x40", code="PAL-4840", unit_id=5, unit_name="palette")
-        ]
+        )
         service.list_shipment_addresses.return_value = (
             77,
             [PortalOrderAddress(id=12, label="Entrepôt principal")],
@@ -434,6 +584,48 @@ class OrderCreateViewTests(TestCase):
         self.assertEqual(len(kwargs["lines"]), 1)
         self.assertEqual(kwargs["lines"][0].quantity, Decimal("4"))
 
+    def test_post_rejects_prices_changed_since_the_form_was_shown(self):
+        tryton_client = MagicMock()
+        account_service = MagicMock()
+        account_service.resolve_party.return_value = 77
+        product = {"id": 101, "name": "Palette 48x40", "code": "PAL-4840", "default_uom": [5, "palette"]}
+        tryton_client.search_read.return_value = [{**product, "list_price": "10.00"}]
+
+        def build_service():
+            service = PortalOrderService(client=tryton_client, account_service=account_service)
+            service._ensure_company_context = MagicMock()
+            service._fetch_party_addresses = MagicMock(
+                return_value=[PortalOrderAddress(id=12, label="Entrepôt principal")]
+            )
+            return service
+
+        with patch("apps.accounts.views.OrderCreateView.service_class", side_effect=build_service):
+            shown = self.client.get(self.url)
+            shown_version = shown.context["catalog_version"]
+            tryton_client.search_read.return_value = [{**product, "list_price": "12.00"}]
+            build_service().catalog_snapshot(force_refresh=True)
+
+            response = self.client.post(
+                self.url,
+                data={
+                    "shipping_date": "2025-11-20",
+                    "shipping_address": "12",
+                    "catalog_version": shown_version,
+                    f"{ORDER_LINES_FORMSET_PREFIX}-TOTAL_FORMS": "1",
+                    f"{ORDER_LINES_FORMSET_PREFIX}-INITIAL_FORMS": "0",
+                    f"{ORDER_LINES_FORMSET_PREFIX}-MIN_NUM_FORMS": "0",
+                    f"{ORDER_LINES_FORMSET_PREFIX}-MAX_NUM_FORMS": "10",
+                    f"{ORDER_LINES_FORMSET_PREFIX}-0-product": "101",
+                    f"{ORDER_LINES_FORMSET_PREFIX}-0-quantity": "3",
+                },
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.context["catalog_version"], shown_version)
+        messages = [message.message for message in get_messages(response.wsgi_request)]
+        self.assertTrue(any("catalogue vient d'être mis à jour" in message for message in messages))
+        tryton_client.call.assert_not_called()
+
 
 class OrderListViewTests(TestCase):
     def setUp(self):
@@ -474,6 +666,7 @@ class OrderListViewTests(TestCase):
         self.assertEqual(kwargs["search"], "SO")
         self.assertEqual(kwargs["page"], 1)
         self.assertEqual(kwargs["page_size"], PortalOrderService.DEFAULT_PAGE_SIZE)
+        self.assertTrue(kwargs["keyset"])
         self.assertIn("orders", response.context)
         self.assertIn("pagination", response.context)
 
@@ -498,11 +691,11 @@ class OrderCatalogViewTests(TestCase):
     @patch("apps.accounts.views.OrderCatalogView.service_class")
     def test_returns_paginated_results(self, service_cls):
         service = service_cls.return_value
-        service.list_orderable_products.return_value = [
+        service.catalog_search_index.return_value = CatalogSearchIndex([
             PortalOrderProduct(id=101, name="Palette A", code="PAL-A", unit_id=5, unit_name="palette"),
             PortalOrderProduct(id=202, name="Planche B", code="PL-B", unit_id=7, unit_name="pied"),
             PortalOrderProduct(id=303, name="Granule C", code="GR-C", unit_id=None, unit_name=None),
-        ]
+        ])
 
         response = self.client.get(self.url, {"page": "2", "page_size": "1"})
 
@@ -513,16 +706,16 @@ class OrderCatalogViewTests(TestCase):
         self.assertEqual(len(payload["results"]), 1)
         self.assertEqual(payload["results"][0]["id"], 202)
         self.assertIn("filters", payload)
-        service.list_orderable_products.assert_called_once()
+        service.catalog_search_index.assert_called_once()
 
     @patch("apps.accounts.views.OrderCatalogView.service_class")
     def test_filters_by_query_and_unit(self, service_cls):
         service = service_cls.return_value
-        service.list_orderable_products.return_value = [
+        service.catalog_search_index.return_value = CatalogSearchIndex([
             PortalOrderProduct(id=101, name="Palette standard", code="PAL-STD", unit_id=5, unit_name="palette"),
             PortalOrderProduct(id=202, name="Palette bleue", code="PAL-BLUE", unit_id=5, unit_name="palette"),
             PortalOrderProduct(id=303, name="Bois recyclé", code="WOOD", unit_id=7, unit_name="lb"),
-        ]
+        ])
 
         response = self.client.get(self.url, {"q": "palette", "unit": "5"})
 
@@ -531,10 +724,48 @@ class OrderCatalogViewTests(TestCase):
         self.assertEqual(payload["pagination"]["total"], 2)
         self.assertTrue(all("Palette" in item["name"] for item in payload["results"]))
 
+    @patch("apps.accounts.views.orjson", None)
+    @patch("apps.accounts.views.OrderCatalogView.service_class")
+    def test_standard_json_encoder_builds_the_same_payload(self, service_cls):
+        service = service_cls.return_value
+        service.catalog_search_index.return_value = CatalogSearchIndex([
+            PortalOrderProduct(id=101, name="Planche d'épinette", code="PL-E", unit_id=7, unit_name="pied"),
+        ])
+
+        response = self.client.get(self.url, {"q": "épi"})
+
+        payload = response.json()
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(payload["results"][0]["name"], "Planche d'épinette")
+        self.assertEqual(payload["query"], "épi")
+        self.assertEqual(payload["filters"]["unit"][0]["label"], "pied")
+
+    @patch("apps.accounts.views.OrderCatalogView.service_class")
+    def test_returns_not_modified_when_etag_matches(self, service_cls):
+        service = service_cls.return_value
+        products = [PortalOrderProduct(id=101, name="Palette A", code="PAL-A", unit_id=5, unit_name="palette")]
+        service.catalog_search_index.return_value = CatalogSearchIndex(products, version="v1")
+
+        first = self.client.get(self.url, {"q": "pal"})
+        etag = first["ETag"]
+        cached = self.client.get(self.url, {"q": "pal"}, HTTP_IF_NONE_MATCH=etag)
+        other_page = self.client.get(self.url, {"q": "pal", "page": "2"}, HTTP_IF_NONE_MATCH=etag)
+        service.catalog_search_index.return_value = CatalogSearchIndex(products, version="v2")
+        new_version = self.client.get(self.url, {"q": "pal"}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("private", first["Cache-Control"])
+        self.assertIn("max-age=", first["Cache-Control"])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], etag)
+        self.assertEqual(other_page.status_code, 200)
+        self.assertEqual(new_version.status_code, 200)
+        self.assertNotEqual(new_version["ETag"], etag)
+
     @patch("apps.accounts.views.OrderCatalogView.service_class")
     def test_returns_error_when_service_fails(self, service_cls):
         service = service_cls.return_value
-        service.list_orderable_products.side_effect = PortalOrderServiceError("Erreur Tryton")
+        service.catalog_search_index.side_effect = PortalOrderServiceError("Erreur Tryton")
 
         response = self.client.get(self.url)
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from unittest.mock import MagicMock, patch, call
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
@@ -22,10 +23,24 @@ class PortalAccountServiceProfileTests(TestCase):
         self.service = PortalAccountService(client=self.tryton_client)
         self.service._user_has_party_field = True
         self.service._address_postal_field = "zip"
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _cached_profile(self) -> PortalClientProfile:
+        return PortalClientProfile(
+            user_id=42,
+            party_id=77,
+            login="client@example.com",
+            email="client@example.com",
+            first_name="Alice",
+            last_name="Tremblay",
+            company_name="ITF",
+            phone=None,
+            address=PortalClientAddress(),
+        )
 
     def test_fetch_client_profile_returns_dataclass_snapshot(self):
-        self.tryton_client.call.side_effect = [
-            [42],  # res.user search
+        self.tryton_client.search_read.side_effect = [
             [
                 {
                     "id": 42,
@@ -33,27 +48,27 @@ class PortalAccountServiceProfileTests(TestCase):
                     "email": "client@example.com",
                     "party": 77,
                 }
-            ],  # res.user read
-            [
-                {
-                    "id": 77,
-                    "name": "ITF",
-                }
-            ],  # party read
-            [91],  # contact search
+            ],  # res.user search_read
             [
                 {
                     "value": "4185551234",
                 }
-            ],  # contact read
-            [18],  # address search
+            ],  # contact search_read
             [
                 {
                     "street": "123 rue Principale",
                     "city": "Mashteuiatsh",
                     "zip": "G0W 2H0",
                 }
-            ],  # address read
+            ],  # address search_read
+        ]
+        self.tryton_client.call.side_effect = [
+            [
+                {
+                    "id": 77,
+                    "name": "ITF",
+                }
+            ],  # party read
         ]
 
         profile = self.service.fetch_client_profile(login="client@example.com")
@@ -67,17 +82,140 @@ class PortalAccountServiceProfileTests(TestCase):
         self.assertEqual(profile.address.city, "Mashteuiatsh")
         self.assertEqual(profile.address.postal_code, "G0W 2H0")
 
+    def test_resolve_party_reads_user_once_and_reuses_remembered_party(self):
+        self.tryton_client.search_read.return_value = [{"id": 42, "party": 77}]
+
+        self.assertEqual(self.service.resolve_party(login="Client@Example.com"), 77)
+        self.assertEqual(self.service.resolve_party(login="client@example.com"), 77)
+        self.assertEqual(self.tryton_client.search_read.call_count, 1)
+
+        self.service.remember_party(login="autre@example.com", party_id=88)
+        self.assertEqual(self.service.resolve_party(login="autre@example.com"), 88)
+        self.assertEqual(self.tryton_client.search_read.call_count, 1)
+        self.tryton_client.call.assert_not_called()
+
+    def test_fetch_client_profile_reads_nested_party_in_one_call(self):
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 42,
+                "name": "Alice Tremblay",
+                "email": "client@example.com",
+                "party": 77,
+                "party.": {
+                    "id": 77,
+                    "name": "ITF",
+                    "contact_mechanisms.": [
+                        {"id": 5, "type": "email", "value": "client@example.com"},
+                        {"id": 6, "type": "phone", "value": "4185551234"},
+                    ],
+                    "addresses.": [
+                        {"id": 18, "street": "123 rue Principale", "city": "Mashteuiatsh", "zip": "G0W 2H0"},
+                    ],
+                },
+            }
+        ]
+
+        profile = self.service.fetch_client_profile(login="client@example.com")
+
+        self.assertEqual(profile.company_name, "ITF")
+        self.assertEqual(profile.phone, "4185551234")
+        self.assertEqual(profile.address.postal_code, "G0W 2H0")
+        self.tryton_client.search_read.assert_called_once()
+        self.assertIn("party.addresses.zip", self.tryton_client.search_read.call_args.args[2])
+        self.tryton_client.call.assert_not_called()
+
+    def test_nested_profile_read_asks_the_registry_for_the_postal_field(self):
+        metadata = MagicMock()
+        metadata.address_postal_field.return_value = "zip"
+        service = PortalAccountService(client=self.tryton_client, metadata=metadata)
+        service._user_has_party_field = True
+        self.tryton_client.search_read.return_value = [{"id": 42, "name": "Alice", "party": 77}]
+
+        service._get_profile_user_record("client@example.com")
+
+        fields = self.tryton_client.search_read.call_args.args[2]
+        self.assertIn("party.addresses.zip", fields)
+        self.assertNotIn("party.addresses.postal_code", fields)
+
+    def test_fetch_client_profile_serves_cached_snapshot(self):
+        profile = self._cached_profile()
+        with patch.object(self.service, "_load_client_profile", return_value=profile) as load_mock:
+            first = self.service.fetch_client_profile(login="client@example.com")
+            second = PortalAccountService(client=self.tryton_client).fetch_client_profile(login="Client@Example.com")
+
+        load_mock.assert_called_once_with("client@example.com")
+        self.assertEqual(first, profile)
+        self.assertEqual(second, profile)
+
+    def test_update_client_profile_writes_fresh_snapshot_through_cache(self):
+        self.tryton_client.search_read.return_value = [{"id": 42, "name": "Alice Tremblay", "party": 77}]
+        self.service._store_client_profile(self._cached_profile())
+        refreshed = self._cached_profile()
+        refreshed.company_name = "ITF Nouveau"
+
+        with patch.object(self.service, "_load_client_profile", return_value=refreshed), patch.object(
+            self.service, "_upsert_phone"
+        ), patch.object(self.service, "_upsert_primary_address"):
+            self.service.update_client_profile(
+                login="client@example.com",
+                company_name="ITF Nouveau",
+                first_name="Alice",
+                last_name="Tremblay",
+                phone="",
+                address="",
+                city="",
+                postal_code="",
+            )
+
+        with patch.object(self.service, "_load_client_profile") as load_mock:
+            profile = self.service.fetch_client_profile(login="client@example.com")
+        load_mock.assert_not_called()
+        self.assertEqual(profile.company_name, "ITF Nouveau")
+
+    def test_update_client_profile_bumps_party_cache_generation(self):
+        self.tryton_client.search_read.return_value = [{"id": 42, "name": "Alice Tremblay", "party": 77}]
+        before = self.service.party_cache_generation(party_id=77)
+
+        with patch.object(self.service, "_load_client_profile", return_value=self._cached_profile()), patch.object(
+            self.service, "_upsert_phone"
+        ), patch.object(self.service, "_upsert_primary_address"):
+            self.service.update_client_profile(
+                login="client@example.com",
+                company_name="ITF",
+                first_name="Alice",
+                last_name="Tremblay",
+                phone="",
+                address="",
+                city="",
+                postal_code="",
+            )
+
+        self.assertEqual(self.service.party_cache_generation(party_id=77), before + 1)
+        self.assertEqual(PortalAccountService(client=MagicMock()).party_cache_generation(party_id=77), before + 1)
+
+    def test_change_password_invalidates_cached_profile(self):
+        self.tryton_client.search_read.return_value = [{"id": 42, "name": "Alice Tremblay", "party": 77}]
+        self.service._store_client_profile(self._cached_profile())
+
+        with patch.object(self.service, "validate_credentials", return_value=True):
+            self.service.change_password(
+                login="client@example.com",
+                current_password="Ancien123!",
+                new_password="Nouveau123!",
+            )
+
+        self.assertIsNone(cache.get(self.service._profile_cache_key("client@example.com")))
+
     def test_update_client_profile_updates_user_party_phone_and_address(self):
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 42,
+                "name": "Alice Tremblay",
+                "email": "client@example.com",
+                "party": 77,
+            }
+        ]  # res.user search_read
         self.tryton_client.call.side_effect = [
-            [42],  # res.user search
-            [
-                {
-                    "id": 42,
-                    "name": "Alice Tremblay",
-                    "email": "client@example.com",
-                    "party": 77,
-                }
-            ],  # res.user read
             None,  # res.user write
             None,  # party write
             [91],  # contact search
@@ -113,19 +251,18 @@ class PortalAccountServiceProfileTests(TestCase):
             )
 
         self.assertEqual(profile, refreshed)
-        self.assertGreaterEqual(self.tryton_client.call.call_count, 8)
+        self.assertGreaterEqual(self.tryton_client.call.call_count, 6)
 
     def test_update_client_profile_removes_phone_when_empty(self):
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 42,
+                "name": "Alice Tremblay",
+                "email": "client@example.com",
+                "party": 77,
+            }
+        ]  # res.user search_read
         self.tryton_client.call.side_effect = [
-            [42],  # res.user search
-            [
-                {
-                    "id": 42,
-                    "name": "Alice Tremblay",
-                    "email": "client@example.com",
-                    "party": 77,
-                }
-            ],  # res.user read
             None,  # res.user write
             None,  # party write
             [91],  # contact search
@@ -171,16 +308,15 @@ class PortalAccountServiceProfileTests(TestCase):
         )
 
     def test_update_client_profile_creates_phone_when_missing(self):
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 42,
+                "name": "Alice Tremblay",
+                "email": "client@example.com",
+                "party": 77,
+            }
+        ]  # res.user search_read
         self.tryton_client.call.side_effect = [
-            [42],  # res.user search
-            [
-                {
-                    "id": 42,
-                    "name": "Alice Tremblay",
-                    "email": "client@example.com",
-                    "party": 77,
-                }
-            ],  # res.user read
             None,  # res.user write
             None,  # party write
             [],  # contact search
@@ -230,16 +366,15 @@ class PortalAccountServiceProfileTests(TestCase):
         )
 
     def test_change_password_requires_valid_current_password(self):
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 42,
+                "name": "Alice Tremblay",
+                "email": "client@example.com",
+                "party": 77,
+            }
+        ]  # res.user search_read
         self.tryton_client.call.side_effect = [
-            [42],  # res.user search
-            [
-                {
-                    "id": 42,
-                    "name": "Alice Tremblay",
-                    "email": "client@example.com",
-                    "party": 77,
-                }
-            ],  # res.user read
             None,  # res.user write
         ]
         with patch.object(self.service, "validate_credentials", return_value=True) as validate_mock:
@@ -251,16 +386,15 @@ class PortalAccountServiceProfileTests(TestCase):
         validate_mock.assert_called_once()
 
     def test_change_password_raises_when_tryton_write_fails(self):
+        self.tryton_client.search_read.return_value = [
+            {
+                "id": 42,
+                "name": "Alice Tremblay",
+                "email": "client@example.com",
+                "party": 77,
+            }
+        ]
         self.tryton_client.call.side_effect = [
-            [42],
-            [
-                {
-                    "id": 42,
-                    "name": "Alice Tremblay",
-                    "email": "client@example.com",
-                    "party": 77,
-                }
-            ],
             TrytonRPCError("boom"),  # type: ignore[name-defined]
         ]
         with patch.object(self.service, "validate_credentials", return_value=True):
@@ -273,8 +407,7 @@ class PortalAccountServiceProfileTests(TestCase):
 
     def test_fetch_client_profile_errors_when_party_field_missing(self):
         self.service._user_has_party_field = False
-        self.tryton_client.call.side_effect = [
-            [42],
+        self.tryton_client.search_read.side_effect = [
             [
                 {
                     "id": 42,
@@ -289,46 +422,47 @@ class PortalAccountServiceProfileTests(TestCase):
             self.service.fetch_client_profile(login="client@example.com")
 
         self.assertEqual(
-            self.tryton_client.call.mock_calls[2],
+            self.tryton_client.search_read.mock_calls[1],
             call(
                 "model.party.contact_mechanism",
-                "search",
-                [[("type", "=", "email"), ("value", "=", "client@example.com")], 0, 1, None, {}],
+                [("type", "=", "email"), ("value", "=", "client@example.com")],
+                ["party"],
+                limit=1,
+                context={},
             ),
         )
 
     def test_fetch_client_profile_uses_contact_mechanism_when_party_field_missing(self):
         self.service._user_has_party_field = False
-        self.tryton_client.call.side_effect = [
-            [42],  # user search
+        self.tryton_client.search_read.side_effect = [
             [
                 {
                     "id": 42,
                     "name": "Alice Tremblay",
                     "email": "client@example.com",
                 }
-            ],
-            [91],  # contact search
+            ],  # user search_read
             [
                 {
                     "party": 77,
                 }
-            ],  # contact read
-            [
-                {
-                    "id": 77,
-                    "name": "ITF",
-                }
-            ],  # party read
-            [],  # phone search (aucun contact)
-            [18],  # address search
+            ],  # contact search_read
+            [],  # phone search_read (aucun contact)
             [
                 {
                     "street": "123 rue Principale",
                     "city": "Mashteuiatsh",
                     "zip": "G0W 2H0",
                 }
-            ],
+            ],  # address search_read
+        ]
+        self.tryton_client.call.side_effect = [
+            [
+                {
+                    "id": 77,
+                    "name": "ITF",
+                }
+            ],  # party read
         ]
 
         profile = self.service.fetch_client_profile(login="client@example.com")
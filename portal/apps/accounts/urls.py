@@ -1,6 +1,7 @@
 from django.urls import path
 
 from .views import (
+    ClientDashboardFragmentView,
     ClientDashboardView,
     ClientLoginView,
     ClientLogoutView,
@@ -19,6 +20,11 @@ urlpatterns = [
     path("", ClientLoginView.as_view(), name="login"),
     path("deconnexion/", ClientLogoutView.as_view(), name="logout"),
     path("tableau-de-bord/", ClientDashboardView.as_view(), name="dashboard"),
+    path(
+        "tableau-de-bord/blocs/<slug:fragment>/",
+        ClientDashboardFragmentView.as_view(),
+        name="dashboard-fragment",
+    ),
     path("profil/", ClientProfileView.as_view(), name="profile"),
     path("inscription/", ClientSignupView.as_view(), name="signup"),
     path("factures/", InvoiceListView.as_view(), name="invoices-list"),
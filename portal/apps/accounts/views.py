@@ -1,16 +1,24 @@
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import date
 from decimal import Decimal
 from math import ceil
-from typing import Optional
+from typing import Any, Callable, Optional, Sequence
 from html import unescape
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login as auth_login
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView, LogoutView
-from django.http import JsonResponse
+from django.core.cache import cache
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse, reverse_lazy
+from django.utils.http import parse_etags, quote_etag
 from django.views.generic import FormView, TemplateView, View
 
 from .forms import (
@@ -38,6 +46,43 @@ from .services import (
     PortalOrderSummary,
 )
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson est optionnel
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def _json_bytes(value: Any) -> bytes:
+    """Encodage JSON compact, via orjson lorsqu'il est installé."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _session_party_id(request) -> Optional[int]:
+    """Party résolu à la connexion et gardé en session, s'il appartient à l'utilisateur courant."""
+    payload = request.session.get("tryton_session") or {}
+    party_id = payload.get("party_id")
+    login = (payload.get("username") or "").strip().lower()
+    current_login = (getattr(request.user, "username", "") or "").strip().lower()
+    if not party_id or not login or login != current_login:
+        return None
+    return party_id
+
+
+def _remember_session_party(request, *services) -> None:
+    """Transmet aux services le party résolu à la connexion pour éviter une recherche Tryton."""
+    party_id = _session_party_id(request)
+    if party_id is None:
+        return
+    payload = request.session["tryton_session"]
+    login = payload["username"].strip().lower()
+    for service in services:
+        account_service = getattr(service, "account_service", None)
+        if account_service is not None:
+            account_service.remember_party(login=login, party_id=party_id, user_id=payload.get("user_id"))
+
 
 class ClientLoginView(LoginView):
     template_name = "accounts/login.html"
@@ -71,33 +116,171 @@ class ClientDashboardView(LoginRequiredMixin, TemplateView):
     order_service_class = PortalOrderService
     recent_limit = 5
     order_period_days = PortalOrderService.DEFAULT_PERIOD_DAYS
+    widget_timeouts: dict[str, float] = {}
+    widget_labels = {
+        "invoices": "factures récentes",
+        "orders": "commandes récentes",
+        "summary": "résumé du compte",
+    }
+    summary_snapshot_key_prefix = "accounts.dashboard.summary.v1"
+    summary_snapshot_ttl = 10 * 60
+    widget_cache_key_prefix = "accounts.dashboard.v1"
+    fragment_names = ("summary", "invoices", "orders", "activity")
 
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.invoice_service = self.invoice_service_class()
         self.order_service = self.order_service_class()
+        self.widget_errors: list[str] = []
+        # Filled from widget threads, published with ``messages`` on the request thread only.
+        self.widget_messages: list[tuple[int, str]] = []
+        self.widget_cache_timeout = max(0, int(getattr(settings, "PORTAL_DASHBOARD_CACHE_TTL", 300)))
+        _remember_session_party(request, self.invoice_service, self.order_service)
 
     def get(self, request, *args, **kwargs):
+        """Render the shell without touching Tryton; widgets are filled in through fragments.
+
+        Widgets already cached for the party's current generation are rendered inline; the party
+        comes from the session only, so a session without one renders every widget as a fragment.
+        ``?complet=1`` renders every widget server-side (fallback for browsers without JavaScript).
+        """
         login = self._current_login()
-        invoices_result = self._safe_load_invoices(login)
-        orders_result = self._safe_load_orders(login)
+        if not request.GET.get("complet"):
+            context: dict[str, object] = {"summary": cache.get(self._summary_snapshot_key(login))}
+            pending = set(self.fragment_names)
+            summary = self._get_cached_widget("summary")
+            if summary is not None:
+                context["summary"] = summary
+                pending.discard("summary")
+            for name in ("invoices", "orders"):
+                cached = self._get_cached_widget(name)
+                if cached is not None:
+                    context.update(self._widget_context({name: cached}))
+                    pending.discard(name)
+            activity = self._get_cached_widget("activity")
+            if activity is not None:
+                context["activity_items"] = activity
+                pending.discard("activity")
+            return self.render_to_response(
+                self.get_context_data(greeting_name=self._greeting_name(), pending_fragments=pending, **context)
+            )
 
-        summary = self._build_summary(invoices_result, login)
-        activity = self._build_activity_feed(
-            invoices=invoices_result.invoices if invoices_result else [],
-            orders=orders_result.orders if orders_result else [],
+        widgets = self._load_widgets(
+            {
+                "invoices": lambda: self._load_recent_invoices(login),
+                "orders": lambda: self._load_recent_orders(login),
+                "summary": lambda: self._cached_widget("summary", lambda: self._build_summary(login)),
+            }
         )
-
         return self.render_to_response(
             self.get_context_data(
                 greeting_name=self._greeting_name(),
-                summary=summary,
-                recent_invoices=invoices_result.invoices[: self.recent_limit] if invoices_result else [],
-                recent_orders=orders_result.orders if orders_result else [],
-                activity_items=activity,
+                pending_fragments=set(),
+                **self._widget_context(widgets),
             )
         )
 
+    def _widget_cache_key(self, name: str) -> Optional[str]:
+        """Per-party key that changes whenever the party's cache generation is bumped.
+
+        Only the session's party is used: resolving it here would put a Tryton call in front of the shell.
+        """
+        account_service = getattr(self.order_service, "account_service", None)
+        if account_service is None or not self.widget_cache_timeout:
+            return None
+        party_id = _session_party_id(self.request)
+        if party_id is None:
+            return None
+        generation = account_service.party_cache_generation(party_id=party_id)
+        return f"{self.widget_cache_key_prefix}:{party_id}:{generation}:{name}"
+
+    def _get_cached_widget(self, name: str) -> Any:
+        key = self._widget_cache_key(name)
+        return cache.get(key) if key else None
+
+    def _cached_widget(self, name: str, loader: Callable[[], tuple[Any, bool]]) -> Any:
+        """Serve a widget from the per-party cache, computing and storing it on a miss.
+
+        ``loader`` returns ``(value, ok)``; a value built while one of its own reads failed is not cached.
+        """
+        key = self._widget_cache_key(name)
+        if key:
+            value = cache.get(key)
+            if value is not None:
+                return value
+        value, ok = loader()
+        if key and ok and value is not None:
+            cache.set(key, value, self.widget_cache_timeout)
+        return value
+
+    def _widget_context(self, widgets: dict[str, Any]) -> dict[str, object]:
+        context: dict[str, object] = {}
+        if "summary" in widgets:
+            context["summary"] = widgets["summary"] or self._empty_summary()
+        invoices_result = widgets.get("invoices")
+        orders_result = widgets.get("orders")
+        if "invoices" in widgets:
+            context["recent_invoices"] = invoices_result.invoices[: self.recent_limit] if invoices_result else []
+        if "orders" in widgets:
+            context["recent_orders"] = orders_result.orders if orders_result else []
+        if "invoices" in widgets and "orders" in widgets:
+            context["activity_items"] = self._build_activity_feed(
+                invoices=invoices_result.invoices if invoices_result else [],
+                orders=orders_result.orders if orders_result else [],
+            )
+        return context
+
+    def _summary_snapshot_key(self, login: str) -> str:
+        return f"{self.summary_snapshot_key_prefix}:{login}"
+
+    def _notify(self, level: int, text: str) -> None:
+        self.widget_errors.append(text)
+        self.widget_messages.append((level, text))
+
+    def _publish_widget_messages(self) -> None:
+        # Anything a late loader reports after this point is dropped instead of leaking into the next page.
+        pending, self.widget_messages = self.widget_messages, []
+        for level, text in pending:
+            messages.add_message(self.request, level, text)
+
+    def _load_widgets(self, loaders: dict[str, Callable[[], Any]]) -> dict[str, Any]:
+        """Run the widget loaders concurrently; a widget past its timeout renders empty.
+
+        Each request gets one thread per widget, so nothing queues and a loader stuck on a slow
+        Tryton only holds its own thread. Timeouts count from the moment a loader starts.
+        """
+        started: dict[str, float] = {}
+
+        def run(name: str, loader: Callable[[], Any]) -> Any:
+            started[name] = time.monotonic()
+            return loader()
+
+        results: dict[str, Any] = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, len(loaders)), thread_name_prefix="dashboard-widget")
+        try:
+            futures = {name: executor.submit(run, name, loader) for name, loader in loaders.items()}
+            for name, future in futures.items():
+                timeout = self._widget_timeout(name)
+                remaining = timeout - (time.monotonic() - started.get(name, time.monotonic()))
+                try:
+                    results[name] = future.result(timeout=max(0.0, remaining))
+                except FutureTimeoutError:
+                    logger.warning("Dashboard widget '%s' timed out after %.1fs.", name, timeout)
+                    self._notify(
+                        messages.WARNING,
+                        f"Le bloc « {self.widget_labels.get(name, name)} » est momentanément indisponible.",
+                    )
+                    results[name] = None
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        self._publish_widget_messages()
+        return results
+
+    def _widget_timeout(self, name: str) -> float:
+        if name in self.widget_timeouts:
+            return float(self.widget_timeouts[name])
+        return float(getattr(settings, "PORTAL_DASHBOARD_WIDGET_TIMEOUT", 5.0))
+
     def _greeting_name(self) -> str:
         """Return a clean display name for the dashboard hero."""
         first_name = (getattr(self.request.user, "first_name", "") or "").strip()
@@ -106,34 +289,45 @@ class ClientDashboardView(LoginRequiredMixin, TemplateView):
         fallback = (getattr(self.request.user, "email", "") or getattr(self.request.user, "username", "") or "").strip()
         return fallback
 
-    def _safe_load_invoices(self, login: str) -> PortalInvoiceListResult | None:
+    def _load_recent_invoices(self, login: str) -> PortalInvoiceListResult | None:
+        """Recent invoices, cached per party generation: the list and activity widgets share one read."""
+        return self._cached_widget("invoices", lambda: self._safe_load_invoices(login))
+
+    def _load_recent_orders(self, login: str) -> PortalOrderListResult | None:
+        return self._cached_widget("orders", lambda: self._safe_load_orders(login))
+
+    def _safe_load_invoices(self, login: str) -> tuple[PortalInvoiceListResult | None, bool]:
         try:
-            return self.invoice_service.list_invoices(
+            result = self.invoice_service.list_invoices(
                 login=login,
                 page=1,
                 page_size=self.recent_limit,
             )
         except PortalInvoiceServiceError as exc:
-            messages.error(self.request, str(exc))
-            return None
+            self._notify(messages.ERROR, str(exc))
+            return None, False
+        return result, True
 
-    def _safe_load_orders(self, login: str) -> PortalOrderListResult | None:
+    def _safe_load_orders(self, login: str) -> tuple[PortalOrderListResult | None, bool]:
         try:
-            return self.order_service.list_orders(
+            result = self.order_service.list_orders(
                 login=login,
                 period_days=self.order_period_days,
                 page=1,
                 page_size=self.recent_limit,
             )
         except PortalOrderServiceError as exc:
-            messages.error(self.request, str(exc))
-            return None
+            self._notify(messages.ERROR, str(exc))
+            return None, False
+        return result, True
 
-    def _build_summary(self, invoices_result: PortalInvoiceListResult | None, login: str) -> dict[str, object]:
-        summary: dict[str, object] = {
+    @staticmethod
+    def _empty_summary() -> dict[str, object]:
+        return {
             "invoices_due_count": 0,
             "invoices_due_total": None,
             "invoices_currency": None,
+            "invoices_due_totals": [],
             "orders_active_count": 0,
             "orders_to_complete_count": 0,
             "orders_to_complete_label": "0 commande",
@@ -141,11 +335,18 @@ class ClientDashboardView(LoginRequiredMixin, TemplateView):
             "orders_breakdown": [],
         }
 
-        # Invoices stats
-        inv_draft = self.invoice_service.count_invoices(login=login, statuses=["draft"])
-        inv_posted = self.invoice_service.count_invoices(login=login, statuses=["posted"])
-        inv_validated = self.invoice_service.count_invoices(login=login, statuses=["validated"])
-        inv_waiting = self.invoice_service.count_invoices(login=login, statuses=["waiting_payment"])
+    def _build_summary(self, login: str) -> tuple[dict[str, object], bool]:
+        """Return ``(summary, ok)``; ``ok`` is false when one of the counts could not be read."""
+        summary = self._empty_summary()
+        ok = True
+
+        invoice_counts = self._status_histogram(self.invoice_service, PortalInvoiceServiceError, login=login)
+        if invoice_counts is None:
+            ok, invoice_counts = False, {}
+        inv_draft = invoice_counts.get("draft", 0)
+        inv_posted = invoice_counts.get("posted", 0)
+        inv_validated = invoice_counts.get("validated", 0)
+        inv_waiting = invoice_counts.get("waiting_payment", 0)
         summary["invoices_breakdown"] = [
             {"label": "Brouillon", "count": inv_draft},
             {"label": "Comptabilisées", "count": inv_posted},
@@ -154,11 +355,18 @@ class ClientDashboardView(LoginRequiredMixin, TemplateView):
         ]
         summary["invoices_due_count"] = inv_posted + inv_validated + inv_waiting + inv_draft
 
-        # Orders stats
-        ord_draft = self._count_orders(login=login, statuses=("draft",))
-        ord_quotation = self._count_orders(login=login, statuses=("quotation",))
-        ord_confirmed = self._count_orders(login=login, statuses=("confirmed",))
-        ord_processing = self._count_orders(login=login, statuses=("processing", "sent"))
+        order_counts = self._status_histogram(
+            self.order_service,
+            PortalOrderServiceError,
+            login=login,
+            period_days=self.order_period_days,
+        )
+        if order_counts is None:
+            ok, order_counts = False, {}
+        ord_draft = order_counts.get("draft", 0)
+        ord_quotation = order_counts.get("quotation", 0)
+        ord_confirmed = order_counts.get("confirmed", 0)
+        ord_processing = order_counts.get("processing", 0) + order_counts.get("sent", 0)
         summary["orders_breakdown"] = [
             {"label": "Brouillon", "count": ord_draft},
             {"label": "Soumission", "count": ord_quotation},
@@ -167,40 +375,35 @@ class ClientDashboardView(LoginRequiredMixin, TemplateView):
         ]
         summary["orders_active_count"] = ord_draft + ord_quotation + ord_confirmed + ord_processing
 
-        # Keep total amount from recent list for now (best effort without backend sum)
-        if invoices_result:
-            due_total = Decimal("0")
-            currency = None
-            for invoice in invoices_result.invoices:
-                if invoice.amount_due is not None and invoice.amount_due > 0:
-                    due_total += invoice.amount_due
-                if not currency and invoice.currency_label:
-                    currency = invoice.currency_label
-            summary["invoices_due_total"] = due_total
-            summary["invoices_currency"] = currency
-
-        summary["orders_to_complete_count"] = self._count_orders(
-            login=login,
-            statuses=("draft", "quotation"),
-        )
+        try:
+            due_totals = self.invoice_service.outstanding_totals(login=login)
+        except PortalInvoiceServiceError as exc:
+            self._notify(messages.ERROR, str(exc))
+            ok = False
+        else:
+            summary["invoices_due_totals"] = [
+                {"currency": currency or None, "amount": amount}
+                for currency, amount in sorted(due_totals.items(), key=lambda item: item[1], reverse=True)
+            ]
+            if summary["invoices_due_totals"]:
+                primary = summary["invoices_due_totals"][0]
+                summary["invoices_due_total"] = primary["amount"]
+                summary["invoices_currency"] = primary["currency"]
+            else:
+                summary["invoices_due_total"] = Decimal("0")
+
+        summary["orders_to_complete_count"] = ord_draft + ord_quotation
         count = summary["orders_to_complete_count"]
         plural = "s" if count != 1 else ""
         summary["orders_to_complete_label"] = f"{count} commande{plural}"
-        return summary
+        return summary, ok
 
-    def _count_orders(self, *, login: str, statuses: tuple[str, ...]) -> int:
+    def _status_histogram(self, service, error_class, **kwargs) -> Optional[dict[str, int]]:
         try:
-            result = self.order_service.list_orders(
-                login=login,
-                statuses=statuses,
-                period_days=self.order_period_days,
-                page=1,
-                page_size=1,
-            )
-        except PortalOrderServiceError as exc:
-            messages.error(self.request, str(exc))
-            return 0
-        return result.pagination.total
+            return service.status_histogram(**kwargs)
+        except error_class as exc:
+            self._notify(messages.ERROR, str(exc))
+            return None
 
     def _build_activity_feed(
         self,
@@ -298,15 +501,73 @@ class ClientDashboardView(LoginRequiredMixin, TemplateView):
         return (self.request.user.username or "").strip().lower()
 
 
+class ClientDashboardFragmentView(ClientDashboardView):
+    """Render one dashboard widget as an HTML fragment for the progressive dashboard shell."""
+
+    fragment_templates = {
+        "summary": "accounts/includes/dashboard_summary.html",
+        "invoices": "accounts/includes/dashboard_invoices.html",
+        "orders": "accounts/includes/dashboard_orders.html",
+        "activity": "accounts/includes/dashboard_activity.html",
+    }
+
+    def get(self, request, *args, **kwargs):
+        fragment = kwargs.get("fragment")
+        if fragment not in self.fragment_templates:
+            raise Http404("Bloc de tableau de bord inconnu.")
+        login = self._current_login()
+        if fragment == "activity":
+            context = {"activity_items": self._cached_widget("activity", lambda: self._load_activity(login))}
+        elif fragment == "summary":
+            widgets = self._load_widgets(
+                {"summary": lambda: self._cached_widget("summary", lambda: self._build_summary(login))}
+            )
+            context = self._widget_context(widgets)
+            if widgets["summary"] is not None and not self.widget_errors:
+                cache.set(self._summary_snapshot_key(login), widgets["summary"], self.summary_snapshot_ttl)
+        elif fragment == "invoices":
+            context = self._widget_context(self._load_widgets({"invoices": lambda: self._load_recent_invoices(login)}))
+        else:
+            context = self._widget_context(self._load_widgets({"orders": lambda: self._load_recent_orders(login)}))
+        context["fragment_errors"] = self.widget_errors
+        response = self.response_class(
+            request=request,
+            template=[self.fragment_templates[fragment]],
+            context=context,
+            using=self.template_engine,
+        )
+        response["Cache-Control"] = "private, no-store"
+        return response
+
+    def _load_activity(self, login: str) -> tuple[list[dict[str, object]], bool]:
+        # The invoices and orders fragments are loaded first (see dashboard-fragments.js), so these are cache hits.
+        widgets = self._load_widgets(
+            {
+                "invoices": lambda: self._load_recent_invoices(login),
+                "orders": lambda: self._load_recent_orders(login),
+            }
+        )
+        # A list that failed or timed out comes back as None.
+        ok = all(value is not None for value in widgets.values())
+        return self._widget_context(widgets)["activity_items"], ok
+
+    def _notify(self, level: int, text: str) -> None:
+        # Errors belong to the fragment itself, not to the next full page.
+        self.widget_errors.append(text)
+
+
 class InvoiceListView(LoginRequiredMixin, TemplateView):
     template_name = "accounts/invoices_list.html"
     login_url = reverse_lazy("accounts:login")
     service_class = PortalInvoiceService
     default_page_size = PortalInvoiceService.DEFAULT_PAGE_SIZE
+    # "keyset" follows cursors (no search_count/offset per page); "offset" keeps numbered pages.
+    pagination_mode = "keyset"
 
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.invoice_service = self.service_class()
+        _remember_session_party(request, self.invoice_service)
 
     def get(self, request, *args, **kwargs):
         page = self._safe_positive_int(request.GET.get("page"), default=1)
@@ -316,6 +577,7 @@ class InvoiceListView(LoginRequiredMixin, TemplateView):
                 login=self._current_login(),
                 page=page,
                 page_size=self.default_page_size,
+                **self._cursor_kwargs(),
             )
         except PortalInvoiceServiceError as exc:
             messages.error(request, str(exc))
@@ -342,6 +604,15 @@ class InvoiceListView(LoginRequiredMixin, TemplateView):
     def _current_login(self) -> str:
         return (self.request.user.username or "").strip().lower()
 
+    def _cursor_kwargs(self) -> dict[str, object]:
+        if self.pagination_mode != "keyset":
+            return {}
+        return {
+            "keyset": True,
+            "after": self.request.GET.get("apres") or None,
+            "before": self.request.GET.get("avant") or None,
+        }
+
     @staticmethod
     def _build_summary(invoices: list) -> dict[str, object]:
         due_total = Decimal("0")
@@ -516,7 +787,9 @@ class OrderCreateView(LoginRequiredMixin, TemplateView):
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.order_service = self.service_class()
+        _remember_session_party(request, self.order_service)
         self._product_options: list[tuple[int, str]] | None = None
+        self._catalog_version = ""
         self._addresses_cache: list[tuple[int, str]] | None = None
 
     def get(self, request, *args, **kwargs):
@@ -538,6 +811,8 @@ class OrderCreateView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context.setdefault("catalog_url", reverse("accounts:orders-catalog"))
+        # Toujours la version des choix de produits affichés, même quand le formulaire est réaffiché.
+        context.setdefault("catalog_version", self._catalog_version)
         return context
 
     def post(self, request, *args, **kwargs):
@@ -561,6 +836,7 @@ class OrderCreateView(LoginRequiredMixin, TemplateView):
                     shipping_address_id=form.cleaned_data["shipping_address"],
                     lines=lines,
                     instructions=form.cleaned_data.get("notes"),
+                    catalog_version=form.cleaned_data.get("catalog_version"),
                 )
             except PortalOrderServiceError as exc:
                 messages.error(request, str(exc))
@@ -614,12 +890,14 @@ class OrderCreateView(LoginRequiredMixin, TemplateView):
 
     def _product_choices(self) -> list[tuple[int, str]]:
         if self._product_options is None:
-            products = self.order_service.list_orderable_products()
+            snapshot = self.order_service.catalog_snapshot()
+            products = list(snapshot.products.values())
             if not products:
                 raise PortalOrderServiceError(
                     "Aucun produit n’est disponible pour le portail. Contactez notre équipe pour activer le catalogue."
                 )
             self._product_options = [(product.id, product.choice_label) for product in products]
+            self._catalog_version = snapshot.version
         return self._product_options
 
     def _address_choices(self) -> list[tuple[int, str]]:
@@ -642,10 +920,13 @@ class OrderListView(LoginRequiredMixin, TemplateView):
     service_class = PortalOrderService
     default_page_size = PortalOrderService.DEFAULT_PAGE_SIZE
     default_period_days = PortalOrderService.DEFAULT_PERIOD_DAYS
+    # "keyset" follows cursors (no search_count/offset per page); "offset" keeps numbered pages.
+    pagination_mode = "keyset"
 
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.order_service = self.service_class()
+        _remember_session_party(request, self.order_service)
 
     def get(self, request, *args, **kwargs):
         filters = self._parse_filters()
@@ -658,6 +939,7 @@ class OrderListView(LoginRequiredMixin, TemplateView):
                 search=filters["search"],
                 page=filters["page"],
                 page_size=filters["page_size"],
+                **self._cursor_kwargs(),
             )
         except PortalOrderServiceError as exc:
             messages.error(request, str(exc))
@@ -694,6 +976,15 @@ class OrderListView(LoginRequiredMixin, TemplateView):
             "page_size": page_size,
         }
 
+    def _cursor_kwargs(self) -> dict[str, object]:
+        if self.pagination_mode != "keyset":
+            return {}
+        return {
+            "keyset": True,
+            "after": self.request.GET.get("apres") or None,
+            "before": self.request.GET.get("avant") or None,
+        }
+
     def _build_status_options(self, selected: list[str]) -> list[dict[str, object]]:
         normalized_selected = {value.strip().lower() for value in selected}
         options = []
@@ -741,6 +1032,7 @@ class OrderDetailView(LoginRequiredMixin, TemplateView):
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.order_service = self.service_class()
+        _remember_session_party(request, self.order_service)
 
     def get(self, request, *args, **kwargs):
         order_id = kwargs.get("order_id")
@@ -764,7 +1056,11 @@ class OrderDetailView(LoginRequiredMixin, TemplateView):
 
 
 class OrderCatalogView(LoginRequiredMixin, View):
-    """Retour JSON paginé pour le catalogue de produits."""
+    """Retour JSON paginé pour le catalogue de produits.
+
+    Une page ne dépend que de la version du catalogue et des paramètres : l'ETag les combine, un
+    ``If-None-Match`` correspondant reçoit un 304 sans recherche ni sérialisation.
+    """
 
     login_url = reverse_lazy("accounts:login")
     service_class = PortalOrderService
@@ -773,30 +1069,59 @@ class OrderCatalogView(LoginRequiredMixin, View):
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.order_service = self.service_class()
+        self.max_age = max(0, int(getattr(settings, "PORTAL_ORDER_CATALOG_MAX_AGE", 60)))
 
     def get(self, request, *args, **kwargs):
         try:
-            products = self.order_service.list_orderable_products()
+            index = self.order_service.catalog_search_index()
         except PortalOrderServiceError as exc:
             return JsonResponse({"error": str(exc)}, status=503)
 
         query = (request.GET.get("q") or "").strip()
-        matches = self._apply_query_filter(products, query)
         unit_param = (request.GET.get("unit") or "").strip()
-        unit_filters = self._build_unit_filters(matches)
-        filtered = self._apply_unit_filter(matches, unit_param)
         page = self._parse_positive_int(request.GET.get("page"), default=1)
         page_size = self._sanitize_page_size(request.GET.get("page_size"))
-        page_slice, pagination = self._paginate(filtered, page, page_size)
-
-        payload = {
-            "results": [self._serialize_product(product) for product in page_slice],
-            "pagination": pagination,
-            "filters": {"unit": unit_filters},
-            "query": query,
-            "active_filters": {"unit": unit_param},
-        }
-        return JsonResponse(payload)
+        etag = self._etag(index.version, query=query, unit=unit_param, page=page, page_size=page_size)
+        if self._etag_matches(request, etag):
+            return self._with_cache_headers(HttpResponseNotModified(), etag)
+
+        result = index.search(query, unit=unit_param)
+        page_ranks, pagination = self._paginate(result.ranks, page, page_size)
+
+        envelope = _json_bytes(
+            {
+                "pagination": pagination,
+                "filters": {"unit": result.unit_filters},
+                "query": query,
+                "active_filters": {"unit": unit_param},
+            }
+        )
+        fragments = index.fragments(page_ranks, self._render_product)
+        content = b'{"results":[' + b",".join(fragments) + b"]," + envelope[1:]
+        return self._with_cache_headers(HttpResponse(content, content_type="application/json"), etag)
+
+    @staticmethod
+    def _etag(version: str, **params: object) -> str:
+        raw = json.dumps([version, params], sort_keys=True, ensure_ascii=False)
+        return quote_etag(hashlib.sha1(raw.encode("utf-8")).hexdigest())
+
+    @staticmethod
+    def _etag_matches(request, etag: str) -> bool:
+        header = request.headers.get("If-None-Match")
+        if not header:
+            return False
+        candidates = [tag.removeprefix("W/") for tag in parse_etags(header)]
+        return "*" in candidates or etag in candidates
+
+    def _with_cache_headers(self, response, etag: str):
+        response["ETag"] = etag
+        # Réponse propre à une session authentifiée : seul le navigateur peut la conserver.
+        response["Cache-Control"] = f"private, max-age={self.max_age}"
+        return response
+
+    @classmethod
+    def _render_product(cls, product: PortalOrderProduct) -> bytes:
+        return _json_bytes(cls._serialize_product(product))
 
     @staticmethod
     def _serialize_product(product: PortalOrderProduct) -> dict[str, object]:
@@ -810,60 +1135,12 @@ class OrderCatalogView(LoginRequiredMixin, View):
             "summary": product.choice_label,
         }
 
-    @staticmethod
-    def _apply_query_filter(products: list[PortalOrderProduct], query: str) -> list[PortalOrderProduct]:
-        normalized = query.strip().lower()
-        if not normalized:
-            return list(products)
-        filtered: list[PortalOrderProduct] = []
-        for product in products:
-            haystack = " ".join(
-                part
-                for part in [product.name, product.code or "", product.unit_name or ""]
-                if part
-            ).lower()
-            if normalized in haystack:
-                filtered.append(product)
-        return filtered
-
-    @staticmethod
-    def _apply_unit_filter(
-        products: list[PortalOrderProduct],
-        unit_param: str,
-    ) -> list[PortalOrderProduct]:
-        if not unit_param:
-            return list(products)
-        if unit_param == "none":
-            return [product for product in products if product.unit_id is None]
-        try:
-            unit_id = int(unit_param)
-        except (TypeError, ValueError):
-            return list(products)
-        return [product for product in products if product.unit_id == unit_id]
-
-    @staticmethod
-    def _build_unit_filters(products: list[PortalOrderProduct]) -> list[dict[str, object]]:
-        counts: dict[str, dict[str, object]] = {}
-        for product in products:
-            key = "none" if product.unit_id is None else str(product.unit_id)
-            label = product.unit_name.strip() if product.unit_name else "Sans unité"
-            entry = counts.get(key)
-            if entry is None:
-                entry = {"value": key, "label": label, "count": 0}
-                counts[key] = entry
-            if not entry["label"] and label:
-                entry["label"] = label
-            entry["count"] += 1
-        options = list(counts.values())
-        options.sort(key=lambda item: str(item["label"]).lower())
-        return options
-
     def _paginate(
         self,
-        products: list[PortalOrderProduct],
+        products: Sequence[Any],
         page: int,
         page_size: int,
-    ) -> tuple[list[PortalOrderProduct], dict[str, object]]:
+    ) -> tuple[list[Any], dict[str, object]]:
         total = len(products)
         if total == 0:
             pagination = {
@@ -880,7 +1157,7 @@ class OrderCatalogView(LoginRequiredMixin, View):
         current_page = max(1, min(page, pages))
         start = (current_page - 1) * page_size
         end = start + page_size
-        subset = products[start:end]
+        subset = list(products[start:end])
         pagination = {
             "page": current_page,
             "pages": pages,
@@ -1,4 +1,10 @@
+import logging
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
 
 
 class CoreConfig(AppConfig):
@@ -7,6 +13,18 @@ class CoreConfig(AppConfig):
     verbose_name = "Portail - Noyau"
 
     _tryton_client = None
+    _metadata_registry = None
+
+    def ready(self):
+        """Warm the Tryton metadata registry without delaying startup."""
+        if getattr(settings, "TRYTON_METADATA_WARMUP", False):
+            threading.Thread(target=self._warm_metadata, name="tryton-metadata-warmup", daemon=True).start()
+
+    def _warm_metadata(self):
+        try:
+            self.get_metadata_registry().warm(self.get_tryton_client())
+        except Exception:  # noqa: BLE001 - warming is best effort, services load lazily
+            logger.warning("Préchargement des métadonnées Tryton impossible.", exc_info=True)
 
     def get_tryton_client(self):
         """
@@ -18,9 +36,21 @@ class CoreConfig(AppConfig):
         if self._tryton_client is None:
             from .services.tryton_client import TrytonClient
 
-            self._tryton_client = TrytonClient()
+            self._tryton_client = TrytonClient(share_session=getattr(settings, "TRYTON_SHARE_SESSION", True))
         return self._tryton_client
 
     def set_tryton_client(self, client):
         """Test helper to inject a preconfigured Tryton client."""
         self._tryton_client = client
+
+    def get_metadata_registry(self):
+        """Return the process-wide registry of static Tryton metadata."""
+        if self._metadata_registry is None:
+            from .services.metadata import TrytonMetadataRegistry
+
+            self._metadata_registry = TrytonMetadataRegistry()
+        return self._metadata_registry
+
+    def set_metadata_registry(self, registry):
+        """Test helper to inject a preconfigured metadata registry."""
+        self._metadata_registry = registry
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.services import get_metadata_registry
+
+
+class Command(BaseCommand):
+    help = "Recharge les métadonnées Tryton partagées (entreprise, groupe portail, champs des modèles)."
+
+    def handle(self, *args, **options):
+        loaded = get_metadata_registry().refresh()
+        if not loaded:
+            self.stderr.write(self.style.WARNING("Aucune métadonnée Tryton n'a pu être chargée."))
+            return
+        for name, value in loaded.items():
+            if isinstance(value, list):
+                value = f"{len(value)} champs"
+            self.stdout.write(f"{name}: {value}")
+        self.stdout.write(self.style.SUCCESS("Métadonnées Tryton rechargées."))
@@ -7,7 +7,13 @@ the `CoreConfig` application configuration.
 
 from django.apps import apps
 
-from .products import PublicProduct, PublicProductService, PublicProductServiceError, build_products_schema
+from .metadata import TrytonMetadataRegistry
+from .products import (
+    PublicProduct,
+    PublicProductService,
+    PublicProductServiceError,
+    build_products_schema,
+)
 from .tryton_client import TrytonAuthError, TrytonClient, TrytonRPCError
 
 
@@ -20,13 +26,20 @@ def get_tryton_client() -> TrytonClient:
     return TrytonClient()
 
 
+def get_metadata_registry() -> TrytonMetadataRegistry:
+    """Return the process-wide registry of static Tryton metadata."""
+    return apps.get_app_config("core").get_metadata_registry()
+
+
 __all__ = [
     "PublicProduct",
     "PublicProductService",
     "PublicProductServiceError",
     "TrytonAuthError",
     "TrytonClient",
+    "TrytonMetadataRegistry",
     "TrytonRPCError",
     "build_products_schema",
+    "get_metadata_registry",
     "get_tryton_client",
 ]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from django.core.cache import BaseCache
+
+
+class LocalLRUCache:
+    """Bounded, thread-safe in-process LRU with a per-entry expiry."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = max(0, int(maxsize))
+        self.ttl = float(ttl)
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return ``(found, value)`` so cached falsy values stay distinguishable from misses."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        lifetime = self.ttl if ttl is None else min(float(ttl), self.ttl)
+        if self.maxsize == 0 or lifetime <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + lifetime, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TwoTierCache:
+    """In-process LRU (L1) in front of a shared Django cache (L2).
+
+    L2 entries are written under the Django key ``version`` read from ``VERSION_KEY``.
+    ``invalidate()`` bumps that counter, which orphans every L2 entry at once; each
+    process notices the new version within ``VERSION_CHECK_INTERVAL`` seconds and
+    drops its L1.
+    """
+
+    VERSION_KEY = "tryton:cache:version"
+    VERSION_CHECK_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        backend: BaseCache,
+        *,
+        maxsize: int,
+        local_ttl: float,
+        version_key: Optional[str] = None,
+    ) -> None:
+        self.backend = backend
+        if version_key is not None:
+            self.VERSION_KEY = version_key
+        self.local = LocalLRUCache(maxsize, local_ttl)
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self._version: Optional[int] = None
+        self._version_checked_at = 0.0
+
+    def get(self, key: str) -> Any:
+        version = self._current_version()
+        found, value = self.local.get(key)
+        if found:
+            return value
+        value = self.backend.get(key, version=version)
+        return self._record_l2(key, value)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        version = self._current_version()
+        self.backend.set(key, value, ttl, version=version)
+        self.local.set(key, value, ttl)
+
+    def invalidate(self) -> int:
+        """Invalidate every entry in all processes and return the new version."""
+        try:
+            version = self.backend.incr(self.VERSION_KEY)
+        except ValueError:
+            version = (self._version or 1) + 1
+            self.backend.set(self.VERSION_KEY, version, None)
+        self._apply_version(int(version))
+        return self._version
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "l1_hits": self.local.hits,
+            "l1_misses": self.local.misses,
+            "l1_evictions": self.local.evictions,
+            "l1_size": len(self.local),
+            "l2_hits": self.l2_hits,
+            "l2_misses": self.l2_misses,
+            "version": self._version or 0,
+        }
+
+    def _record_l2(self, key: str, value: Any) -> Any:
+        if value is None:
+            self.l2_misses += 1
+            return None
+        self.l2_hits += 1
+        self.local.set(key, value)
+        return value
+
+    def _version_is_fresh(self) -> bool:
+        return (
+            self._version is not None
+            and time.monotonic() - self._version_checked_at < self.VERSION_CHECK_INTERVAL
+        )
+
+    def _current_version(self) -> int:
+        if not self._version_is_fresh():
+            version = self.backend.get(self.VERSION_KEY)
+            if version is None:
+                # Version 1 matches Django's default key version.
+                self.backend.add(self.VERSION_KEY, 1, None)
+                version = self.backend.get(self.VERSION_KEY) or 1
+            self._apply_version(int(version))
+        return self._version
+
+    def _apply_version(self, version: int) -> None:
+        if self._version is not None and version != self._version:
+            self.local.clear()
+        self._version = version
+        self._version_checked_at = time.monotonic()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import TwoTierCache
+from .tryton_client import TrytonClient, TrytonRPCError
+
+logger = logging.getLogger(__name__)
+
+
+class TrytonMetadataRegistry:
+    """Process-wide registry of Tryton facts that practically never change.
+
+    Company defaults, the portal group id and model field maps are stored in the
+    shared Django cache and mirrored in process memory for ``ttl`` seconds.
+    ``refresh()`` bumps the registry version so every process reloads them.
+    """
+
+    KEY_PREFIX = "tryton:metadata"
+    VERSION_KEY = "tryton:metadata:version"
+    COMPANY = "company"
+    ADDRESS_POSTAL_FIELDS = ("postal_code", "zip", "postcode")
+    WARM_MODELS = ("model.res.user", "model.party.address")
+
+    def __init__(self, *, ttl: Optional[int] = None) -> None:
+        self.ttl = int(ttl if ttl is not None else getattr(settings, "TRYTON_METADATA_TTL", 24 * 60 * 60))
+        self._store = TwoTierCache(cache, maxsize=64, local_ttl=self.ttl, version_key=self.VERSION_KEY)
+
+    def get(self, name: str) -> Any:
+        return self._store.get(self._key(name))
+
+    def set(self, name: str, value: Any) -> None:
+        if value is not None:
+            self._store.set(self._key(name), value, self.ttl)
+
+    def get_or_load(self, name: str, loader: Callable[[], Any]) -> Any:
+        value = self.get(name)
+        if value is None:
+            value = loader()
+            self.set(name, value)
+        return value
+
+    def clear(self) -> None:
+        """Forget every fact, in this process and (within a few seconds) in all others."""
+        self._store.invalidate()
+
+    def company_record(
+        self,
+        client: TrytonClient,
+        context: Optional[dict[str, Any]] = None,
+    ) -> Optional[dict[str, Any]]:
+        """Return the ``{"id", "currency"}`` record of the first Tryton company."""
+
+        def _load() -> Optional[dict[str, Any]]:
+            records = client.search_read(
+                "model.company.company",
+                [],
+                ["id", "currency"],
+                limit=1,
+                order=[("id", "ASC")],
+                context=dict(context or {}),
+            )
+            return records[0] if records else None
+
+        return self.get_or_load(self.COMPANY, _load)
+
+    @staticmethod
+    def field_map(definitions: Any) -> dict[str, Optional[str]]:
+        """Reduce a ``fields_get`` payload to ``{field_name: field_type}``."""
+        if not isinstance(definitions, dict):
+            return {}
+        return {
+            name: (definition.get("type") if isinstance(definition, dict) else None)
+            for name, definition in definitions.items()
+        }
+
+    def model_fields(
+        self,
+        model: str,
+        client: TrytonClient,
+        context: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Optional[str]]:
+        """Return ``{field_name: field_type}`` for a Tryton model, from ``fields_get``."""
+
+        def _load() -> dict[str, Optional[str]]:
+            return self.field_map(client.call(model, "fields_get", [[], dict(context or {})]))
+
+        return self.get_or_load(f"fields:{model}", _load)
+
+    def address_postal_field(self, client: TrytonClient, context: Optional[dict[str, Any]] = None) -> Optional[str]:
+        fields = self.model_fields("model.party.address", client, context)
+        return next((name for name in self.ADDRESS_POSTAL_FIELDS if name in fields), None)
+
+    def portal_group_id(
+        self,
+        name: str,
+        client: TrytonClient,
+        context: Optional[dict[str, Any]] = None,
+    ) -> Optional[int]:
+        """Return the id of the portal group, or None when it does not exist yet."""
+
+        def _load() -> Optional[int]:
+            group_ids = client.call(
+                "model.res.group",
+                "search",
+                [[("name", "=", name)], 0, 1, None, dict(context or {})],
+            )
+            return int(group_ids[0]) if group_ids else None
+
+        return self.get_or_load(f"portal_group:{name}", _load)
+
+    def remember_portal_group_id(self, name: str, group_id: int) -> None:
+        self.set(f"portal_group:{name}", int(group_id))
+
+    def warm(self, client: Optional[TrytonClient] = None) -> dict[str, Any]:
+        """Load every known fact; failures are logged and left for lazy loading."""
+        loaded: dict[str, Any] = {}
+        try:
+            if client is None:
+                from . import get_tryton_client
+
+                client = get_tryton_client()
+            loaded[self.COMPANY] = self.company_record(client)
+            for model in self.WARM_MODELS:
+                loaded[f"fields:{model}"] = sorted(self.model_fields(model, client))
+            group_name = getattr(settings, "TRYTON_PORTAL_GROUP", "Portail Clients")
+            loaded[f"portal_group:{group_name}"] = self.portal_group_id(group_name, client)
+        except (TrytonRPCError, ValueError) as exc:
+            logger.warning("Préchargement des métadonnées Tryton incomplet: %s", exc)
+        return loaded
+
+    def refresh(self, client: Optional[TrytonClient] = None) -> dict[str, Any]:
+        """Drop every cached fact and load them again."""
+        self.clear()
+        return self.warm(client)
+
+    def _key(self, name: str) -> str:
+        return f"{self.KEY_PREFIX}:{name}"
@@ -2,16 +2,19 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import time
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Iterable, Optional
 
 from django.apps import apps
 from django.conf import settings
 from django.core.cache import cache
 from django.utils.html import strip_tags
 
-from .tryton_client import TrytonClient, TrytonRPCError
+from .metadata import TrytonMetadataRegistry
+from .tryton_client import TrytonAuthError, TrytonClient, TrytonRPCError
 
 logger = logging.getLogger(__name__)
 
@@ -60,34 +63,91 @@ class PublicProduct:
 class PublicProductService:
     """Expose Tryton pallet products for the public marketing site."""
 
-    CATALOG_CACHE_KEY = "core.products.catalog.v2"
+    CATALOG_CACHE_KEY = "core.products.catalog.v3"
+    CATALOG_REFRESH_LOCK_KEY = "core.products.catalog.refresh"
+    # Soft TTL: past it the catalog is still served while one background refresh runs.
     CATALOG_TTL_SECONDS = 15 * 60
+    # Hard TTL: safety net if refreshes keep failing.
+    CATALOG_STALE_TTL_SECONDS = 24 * 60 * 60
+    CATALOG_REFRESH_LOCK_SECONDS = 5 * 60
+    TEMPLATE_BATCH_SIZE = 100
+    VARIANT_FIELDS = ["id", "template", "quantity"]
+    TEMPLATE_FIELDS = ["name", "code", "categories"]
 
     def __init__(
         self,
         *,
         client: Optional[TrytonClient] = None,
         cache_timeout: Optional[int] = None,
+        stale_timeout: Optional[int] = None,
+        variant_chunk_size: Optional[int] = None,
+        variant_concurrency: Optional[int] = None,
+        metadata: Optional[TrytonMetadataRegistry] = None,
     ) -> None:
         self.client = client or self._default_client()
+        self.metadata = metadata or apps.get_app_config("core").get_metadata_registry()
         self.cache_timeout = cache_timeout if cache_timeout is not None else self.CATALOG_TTL_SECONDS
+        self.stale_timeout = max(
+            self.cache_timeout,
+            stale_timeout if stale_timeout is not None else self.CATALOG_STALE_TTL_SECONDS,
+        )
+        if variant_chunk_size is None:
+            variant_chunk_size = getattr(settings, "TRYTON_CATALOG_CHUNK_SIZE", 40)
+        if variant_concurrency is None:
+            variant_concurrency = getattr(settings, "TRYTON_CATALOG_CONCURRENCY", 4)
+        self.variant_chunk_size = max(1, int(variant_chunk_size))
+        self.variant_concurrency = max(1, int(variant_concurrency))
         self._company_id: Optional[int] = None
         language = getattr(settings, "LANGUAGE_CODE", "fr")
         self._base_context: dict[str, Any] = {"language": language}
 
     def list_available_products(self, *, use_cache: bool = True) -> list[PublicProduct]:
-        """Return all salable Tryton templates that currently have a positive quantity."""
+        """Return all salable Tryton templates that currently have a positive quantity.
+
+        A cached catalog is returned even past its soft TTL; the rebuild then happens in
+        the background. Only a missing catalog makes the caller wait for Tryton.
+        """
         if use_cache:
-            cached = cache.get(self.CATALOG_CACHE_KEY)
-            if cached is not None:
-                return cached
+            products = self._serve_cached(cache.get(self.CATALOG_CACHE_KEY))
+            if products is not None:
+                return products
+        return self.refresh_catalog()
+
+    def refresh_catalog(self) -> list[PublicProduct]:
+        """Rebuild the catalog from Tryton and store it for the next requests."""
         products = self._fetch_catalog()
-        cache.set(self.CATALOG_CACHE_KEY, products, self.cache_timeout)
+        cache.set(self.CATALOG_CACHE_KEY, self._catalog_entry(products), self.stale_timeout)
         return products
 
     def invalidate_cache(self) -> None:
         cache.delete(self.CATALOG_CACHE_KEY)
 
+    def _catalog_entry(self, products: list[PublicProduct]) -> dict[str, Any]:
+        return {"products": products, "fresh_until": time.time() + self.cache_timeout}
+
+    def _serve_cached(self, entry: Any) -> Optional[list[PublicProduct]]:
+        if not isinstance(entry, dict) or "products" not in entry:
+            return None
+        if time.time() >= entry.get("fresh_until", 0) and cache.add(
+            self.CATALOG_REFRESH_LOCK_KEY, True, self.CATALOG_REFRESH_LOCK_SECONDS
+        ):
+            self._start_background(self._background_refresh)
+        return entry["products"]
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh_catalog()
+        except PublicProductServiceError as exc:
+            logger.warning("Rafraîchissement du catalogue public impossible, version précédente conservée: %s", exc)
+        except Exception:
+            logger.exception("Erreur inattendue lors du rafraîchissement du catalogue public.")
+        finally:
+            cache.delete(self.CATALOG_REFRESH_LOCK_KEY)
+
+    @staticmethod
+    def _start_background(target: Callable[[], None]) -> None:
+        threading.Thread(target=target, name="public-catalog-refresh", daemon=True).start()
+
     def _fetch_catalog(self) -> list[PublicProduct]:
         context = self._rpc_context()
         variant_ids = self._search_variants(context)
@@ -106,6 +166,14 @@ class PublicProductService:
         if not positive_template_ids:
             return []
         templates = self._read_templates(positive_template_ids, context)
+        return self._build_catalog(templates, template_quantities, positive_template_ids)
+
+    def _build_catalog(
+        self,
+        templates: list[dict[str, Any]],
+        template_quantities: dict[int, Decimal],
+        positive_template_ids: list[int],
+    ) -> list[PublicProduct]:
         positive_set = set(positive_template_ids)
 
         catalog: list[PublicProduct] = []
@@ -134,7 +202,7 @@ class PublicProductService:
             ("active", "=", True),
         ]
         try:
-            variant_ids = self.client.call(
+            variant_ids = self.client.coalesced_call(
                 "model.product.product",
                 "search",
                 [domain, 0, None, [("create_date", "DESC")], context],
@@ -145,19 +213,25 @@ class PublicProductService:
         return self._normalize_ids(variant_ids)
 
     def _read_variant_records(self, variant_ids: Iterable[int], context: dict[str, Any]) -> list[dict[str, Any]]:
+        """Read variant chunks through ``call_many``, ``variant_concurrency`` chunks per wave.
+
+        Results keep chunk order. The first failing wave ends the read: no later wave is sent.
+        Chunks of that wave are already in flight (``TRYTON_CATALOG_CONCURRENCY`` should not
+        exceed ``TRYTON_MAX_CONCURRENCY``) and a request sent to Tryton cannot be withdrawn,
+        so the wave boundary is where the remaining reads are cancelled.
+        """
         ids_list = sorted({vid for vid in variant_ids if vid is not None})
+        batches = list(self._chunked(ids_list, self.variant_chunk_size))
         records: list[dict[str, Any]] = []
-        for batch in self._chunked(ids_list, 40):
+        for wave in self._chunked(batches, self.variant_concurrency):
+            calls = [("model.product.product", "read", [batch, self.VARIANT_FIELDS, context]) for batch in wave]
             try:
-                result = self.client.call(
-                    "model.product.product",
-                    "read",
-                    [batch, ["id", "template", "quantity"], context],
-                ) or []
+                results = self.client.call_many(calls)
             except TrytonRPCError as exc:
-                logger.exception("Impossible de lire les variantes produits %s.", batch)
+                logger.exception("Impossible de lire les variantes produits %s.", wave)
                 raise PublicProductServiceError("Lecture du stock Tryton impossible.") from exc
-            records.extend(result)
+            for result in results:
+                records.extend(result or [])
         return records
 
     def _aggregate_template_quantities(self, records: list[dict[str, Any]]) -> dict[int, Decimal]:
@@ -173,26 +247,39 @@ class PublicProductService:
     def _read_templates(self, template_ids: Iterable[int], context: dict[str, Any]) -> list[dict[str, Any]]:
         ids_list = [tid for tid in template_ids if tid is not None]
         templates: list[dict[str, Any]] = []
-        for template_id in ids_list:
-            try:
-                result = self.client.call(
-                    "model.product.template",
-                    "read",
-                    [[template_id], ["name", "code", "categories"], context],
-                ) or []
-            except TrytonRPCError as exc:
-                logger.warning("Gabarit produit %s illisible, il sera ignoré (erreur: %s)", template_id, exc)
-                continue
-            templates.extend(result)
+        for batch in self._chunked(ids_list, self.TEMPLATE_BATCH_SIZE):
+            templates.extend(self._read_template_batch(batch, context))
         return templates
 
+    def _read_template_batch(self, batch: list[int], context: dict[str, Any]) -> list[dict[str, Any]]:
+        """Read a batch of templates, bisecting on record errors so only unreadable templates are skipped.
+
+        Errors without an RPC ``code`` come from the transport (Tryton unreachable, invalid response):
+        bisecting would only multiply failing calls, so they abort the read.
+        """
+        try:
+            return self.client.coalesced_call(
+                "model.product.template",
+                "read",
+                [batch, self.TEMPLATE_FIELDS, context],
+            ) or []
+        except TrytonRPCError as exc:
+            if exc.code is None or isinstance(exc, TrytonAuthError):
+                logger.exception("Impossible de lire les gabarits produits %s.", batch)
+                raise PublicProductServiceError("Catalogue Tryton inaccessible. Réessayez plus tard.") from exc
+            if len(batch) == 1:
+                logger.warning("Gabarit produit %s illisible, il sera ignoré (erreur: %s)", batch[0], exc)
+                return []
+        middle = len(batch) // 2
+        return self._read_template_batch(batch[:middle], context) + self._read_template_batch(batch[middle:], context)
+
     def _fallback_template_ids(self, context: dict[str, Any]) -> list[int]:
         domain = [
             ("salable", "=", True),
             ("active", "=", True),
         ]
         try:
-            template_ids = self.client.call(
+            template_ids = self.client.coalesced_call(
                 "model.product.template",
                 "search",
                 [domain, 0, 60, [("name", "ASC")], context],
@@ -205,17 +292,12 @@ class PublicProductService:
     def _resolve_company_id(self) -> int:
         if self._company_id is not None:
             return self._company_id
-        context = self._rpc_context(include_company=False)
         try:
-            company_ids = self.client.call(
-                "model.company.company",
-                "search",
-                [[], 0, 1, [("id", "ASC")], context],
-            )
+            record = self.metadata.company_record(self.client, self._rpc_context(include_company=False))
         except TrytonRPCError as exc:
             logger.exception("Impossible de déterminer l'entreprise par défaut pour le portail public.")
             raise PublicProductServiceError("Aucune entreprise Tryton disponible pour le portail.") from exc
-        company_id = self._extract_id(company_ids[0] if company_ids else None)
+        company_id = self._extract_id((record or {}).get("id"))
         if company_id is None:
             raise PublicProductServiceError("Tryton n'a pas retourné d'entreprise valide.")
         self._company_id = company_id
@@ -314,8 +396,8 @@ class PublicProductService:
             return None
 
     @staticmethod
-    def _chunked(values: Iterable[int], size: int) -> Iterable[list[int]]:
-        batch: list[int] = []
+    def _chunked(values: Iterable[Any], size: int) -> Iterable[list[Any]]:
+        batch: list[Any] = []
         for value in values:
             batch.append(value)
             if len(batch) >= size:
@@ -4,15 +4,24 @@ import base64
 import hashlib
 import json
 import logging
+import math
+import threading
+import time
 import uuid
-from typing import Any, Iterable, MutableMapping, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, MutableMapping, Optional, Sequence, Tuple, Union
 import httpx
 from django.conf import settings
 from django.core.cache import caches
 
+from .cache import TwoTierCache
+
 logger = logging.getLogger(__name__)
 
 JSONType = Union[MutableMapping[str, Any], Iterable[Any], str, int, float, bool, None]
+# A call_many entry: (service, method) or (service, method, params)
+CallSpec = Union[Tuple[str, str], Tuple[str, str, Optional[Union[Iterable[Any], JSONType]]]]
 
 # Methods served from the root endpoint (no database segment in the URL)
 ROOT_ENDPOINT_METHODS = {
@@ -35,9 +44,22 @@ class TrytonAuthError(TrytonRPCError):
     """Raised when authentication or session renewal fails."""
 
 
+@dataclass(frozen=True)
+class SessionState:
+    """Immutable snapshot of the Tryton session; ``generation`` increases on every change."""
+
+    generation: int = 0
+    user_id: Optional[int] = None
+    token: Optional[str] = None
+    auth_header: Optional[str] = None
+
+
 class TrytonClient:
     """Lightweight JSON-RPC client tailored for Tryton interactions."""
 
+    # Delay between two looks at the cache while another process holds a cache lock
+    CACHE_LOCK_POLL_INTERVAL = 0.05
+
     def __init__(
         self,
         *,
@@ -49,9 +71,13 @@ class TrytonClient:
         retries: Optional[int] = None,
         cache_alias: str = "default",
         cache_ttl: Optional[int] = None,
+        session_id: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        share_session: bool = False,
+        local_cache_size: Optional[int] = None,
+        local_cache_ttl: Optional[float] = None,
         transport: Optional[httpx.BaseTransport] = None,
         http_client: Optional[httpx.Client] = None,
-        session_id: Optional[str] = None,
     ) -> None:
         self.base_url = base_url or getattr(settings, "TRYTON_RPC_URL")
         self.database = database or getattr(settings, "TRYTON_DATABASE", "tryton")
@@ -60,27 +86,74 @@ class TrytonClient:
         if not self.username or not self.password:
             raise ValueError("TRYTON_USER and TRYTON_PASSWORD settings are required to init TrytonClient.")
 
-        timeout_value = timeout if timeout is not None else getattr(settings, "TRYTON_TIMEOUT", 10.0)
-        retries_value = retries if retries is not None else getattr(settings, "TRYTON_RETRY_ATTEMPTS", 3)
+        self._timeout_value = timeout if timeout is not None else getattr(settings, "TRYTON_TIMEOUT", 10.0)
+        self._retries_value = retries if retries is not None else getattr(settings, "TRYTON_RETRY_ATTEMPTS", 3)
+
+        self._cache = caches[cache_alias]
+        self._cache_ttl = cache_ttl if cache_ttl is not None else getattr(settings, "TRYTON_SESSION_TTL", 300)
+        if local_cache_size is None:
+            local_cache_size = getattr(settings, "TRYTON_LOCAL_CACHE_SIZE", 512)
+        if local_cache_ttl is None:
+            local_cache_ttl = getattr(settings, "TRYTON_LOCAL_CACHE_TTL", 60)
+        # cached_call results: in-process LRU in front of the Django cache
+        self._result_cache = TwoTierCache(self._cache, maxsize=local_cache_size, local_ttl=local_cache_ttl)
+        self._session_id = session_id
+        # Replaced as a whole so concurrent readers never see a half-updated session
+        self._session_state = SessionState()
+        self._testing_mode = getattr(settings, "TESTING", False)
+
+        concurrency = (
+            max_concurrency if max_concurrency is not None else getattr(settings, "TRYTON_MAX_CONCURRENCY", 4)
+        )
+        self.max_concurrency = max(1, int(concurrency))
+        # Publish the session in the cache so every worker process reuses a single login
+        self.share_session = share_session
 
-        transport_instance = transport or httpx.HTTPTransport(retries=retries_value)
+        transport_instance = transport or httpx.HTTPTransport(retries=self._retries_value)
         self._client = http_client or httpx.Client(
             base_url=self.base_url,
-            timeout=httpx.Timeout(timeout_value),
+            timeout=httpx.Timeout(self._timeout_value),
             transport=transport_instance,
         )
 
-        self._cache = caches[cache_alias]
-        self._cache_ttl = cache_ttl if cache_ttl is not None else getattr(settings, "TRYTON_SESSION_TTL", 300)
-        self._session_id = session_id
-        self._session_user_id: Optional[int] = None
-        self._session_token: Optional[str] = None
-        self._auth_header: Optional[str] = None
-        self._testing_mode = getattr(settings, "TESTING", False)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._auth_lock = threading.RLock()
+        self._worker_state = threading.local()
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
 
-    def close(self) -> None:
-        """Close the underlying HTTP client."""
-        self._client.close()
+    @property
+    def _auth_header(self) -> Optional[str]:
+        return self._session_state.auth_header
+
+    @property
+    def _session_user_id(self) -> Optional[int]:
+        return self._session_state.user_id
+
+    @property
+    def _session_token(self) -> Optional[str]:
+        return self._session_state.token
+
+    def _install_session(
+        self,
+        user_id: Optional[int],
+        token: Optional[str],
+        auth_header: Optional[str],
+    ) -> SessionState:
+        state = SessionState(
+            generation=self._session_state.generation + 1,
+            user_id=user_id,
+            token=token,
+            auth_header=auth_header,
+        )
+        self._session_state = state
+        self._session_id = token
+        return state
+
+    def cache_stats(self) -> dict[str, int]:
+        """Hit/miss counters of the ``cached_call`` result cache."""
+        return self._result_cache.stats()
 
     def _database_path(self) -> str:
         return f"{self.database.rstrip('/')}/"
@@ -88,27 +161,23 @@ class TrytonClient:
     def _build_payload(self, method: str, params: Iterable[Any]) -> dict[str, Any]:
         return {"jsonrpc": "2.0", "method": method, "params": list(params), "id": str(uuid.uuid4())}
 
-    def _request(
-        self,
-        payload: dict[str, Any],
-        *,
-        path: Optional[str] = None,
-        headers: Optional[dict[str, str]] = None,
-    ) -> Any:
-        request_path = "" if path is None else path
-        try:
-            response = self._client.post(request_path, json=payload, headers=headers)
-            response.raise_for_status()
-        except httpx.HTTPStatusError as exc:
+    def _login_payload(self) -> dict[str, Any]:
+        return self._build_payload(
+            "common.db.login",
+            [self.username, {"password": self.password}],
+        )
+
+    @staticmethod
+    def _map_http_error(exc: httpx.HTTPError, payload: dict[str, Any]) -> TrytonRPCError:
+        if isinstance(exc, httpx.HTTPStatusError):
             status = exc.response.status_code
             if status in (401, 403):
-                raise TrytonAuthError("Authentication with Tryton failed.", code=status) from exc
-            logger.error("Tryton HTTP error calling %s: %s", payload.get("method"), exc)
-            raise TrytonRPCError("HTTP error while contacting Tryton.", data={"method": payload.get("method")}) from exc
-        except httpx.HTTPError as exc:
-            logger.error("Tryton HTTP error calling %s: %s", payload.get("method"), exc)
-            raise TrytonRPCError("HTTP error while contacting Tryton.", data={"method": payload.get("method")}) from exc
+                return TrytonAuthError("Authentication with Tryton failed.", code=status)
+        logger.error("Tryton HTTP error calling %s: %s", payload.get("method"), exc)
+        return TrytonRPCError("HTTP error while contacting Tryton.", data={"method": payload.get("method")})
 
+    @staticmethod
+    def _decode_response(response: httpx.Response, payload: dict[str, Any]) -> Any:
         # Tryton may return bare JSON arrays (e.g. login success)
         try:
             data = response.json()
@@ -128,22 +197,7 @@ class TrytonClient:
 
         return data
 
-    def _authenticate(self, force: bool = False) -> str:
-        if self._testing_mode and self._auth_header and not force:
-            return self._auth_header
-        if self._auth_header and not force:
-            return self._auth_header
-
-        payload = self._build_payload(
-            "common.db.login",
-            [self.username, {"password": self.password}],
-        )
-        try:
-            result = self._request(payload, path=self._database_path())
-        except TrytonRPCError as exc:
-            logger.error("Failed to authenticate against Tryton (user=%s): %s", self.username, exc)
-            raise
-
+    def _store_login_result(self, result: Any) -> SessionState:
         if not result:
             raise TrytonAuthError("Tryton did not return a session identifier.")
 
@@ -156,33 +210,234 @@ class TrytonClient:
         else:
             raise TrytonAuthError("Unexpected login payload returned by Tryton.")
 
-        self._session_id = session_token
-        self._session_user_id = int(user_id)
-        self._session_token = session_token
         token_value = base64.b64encode(f"{self.username}:{user_id}:{session_token}".encode("utf-8")).decode("ascii")
-        self._auth_header = f"Session {token_value}"
-        return self._auth_header
+        return self._install_session(int(user_id), session_token, f"Session {token_value}")
 
-    def login(self, *, force: bool = False) -> tuple[int, str]:
-        """Authenticate and return the Tryton user id along with the session token."""
-        self._authenticate(force=force)
-        if self._session_user_id is None or self._session_token is None:
+    def _shared_session_key(self) -> str:
+        # Credentials are part of the digest so a password change never reuses an old session.
+        identity = f"{self.base_url}|{self.database}|{self.username}|{self.password}"
+        digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()
+        return f"tryton:session:{digest}"
+
+    def _shared_lock_key(self) -> str:
+        return f"{self._shared_session_key()}:lock"
+
+    def _shared_lock_timeout(self) -> int:
+        # Long enough for one login round-trip; a crashed holder only blocks peers this long.
+        return max(2, math.ceil(float(self._timeout_value) * 2))
+
+    @staticmethod
+    def _shared_session_payload(state: SessionState) -> dict[str, Any]:
+        return {
+            "user_id": state.user_id,
+            "session": state.token,
+            "auth_header": state.auth_header,
+        }
+
+    def _adopt_shared_session(self, data: Any, stale_header: Optional[str]) -> Optional[SessionState]:
+        """Install a session published by another process unless it is the one being replaced."""
+        if not isinstance(data, dict):
+            return None
+        header = data.get("auth_header")
+        if not header or header == stale_header or data.get("session") is None:
+            return None
+        try:
+            user_id = int(data["user_id"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return self._install_session(user_id, data["session"], header)
+
+    @staticmethod
+    def _session_credentials(state: SessionState) -> tuple[int, str]:
+        if state.user_id is None or state.token is None:
             raise TrytonAuthError("Tryton login did not return a valid session.")
-        return self._session_user_id, self._session_token
+        return state.user_id, state.token
 
     def get_session_context(self) -> dict[str, Any]:
         """Expose current session metadata for storage in Django sessions."""
-        if self._session_user_id is None or self._session_token is None or self._auth_header is None:
+        state = self._session_state
+        if state.user_id is None or state.token is None or state.auth_header is None:
             raise TrytonAuthError("No active Tryton session to export.")
         return {
-            "user_id": self._session_user_id,
-            "session": self._session_token,
+            "user_id": state.user_id,
+            "session": state.token,
             "username": self.username,
             "database": self.database,
-            "auth_header": self._auth_header,
+            "auth_header": state.auth_header,
             "base_url": str(self.base_url),
         }
 
+    @staticmethod
+    def _search_read_args(
+        model: str,
+        domain: Optional[Iterable[Any]],
+        fields: Optional[Iterable[str]],
+        offset: int,
+        limit: Optional[int],
+        order: Optional[Iterable[Any]],
+        context: Optional[MutableMapping[str, Any]],
+    ) -> tuple[str, list[Any]]:
+        service = model if model.startswith("model.") else f"model.{model}"
+        params = [
+            list(domain or []),
+            offset,
+            limit,
+            list(order) if order is not None else None,
+            list(fields) if fields is not None else None,
+            dict(context or {}),
+        ]
+        return service, params
+
+    @staticmethod
+    def _records(result: Any) -> list[dict[str, Any]]:
+        if not result:
+            return []
+        return [record for record in result if isinstance(record, dict)]
+
+    @staticmethod
+    def _normalize_call_spec(spec: CallSpec) -> Tuple[str, str, Any]:
+        if not isinstance(spec, (list, tuple)) or len(spec) not in (2, 3):
+            raise ValueError("Each call must be a (service, method) or (service, method, params) tuple.")
+        service, method = spec[0], spec[1]
+        params = spec[2] if len(spec) == 3 else None
+        return service, method, params
+
+    @staticmethod
+    def cache_key(method: str, params: Optional[Union[Iterable[Any], JSONType]]) -> str:
+        serialized_params: str
+        if params is None:
+            serialized_params = "null"
+        else:
+            try:
+                serialized_params = json.dumps(params, sort_keys=True, default=str)
+            except TypeError:
+                serialized_params = repr(params)
+        digest = hashlib.sha256(serialized_params.encode("utf-8")).hexdigest()
+        return f"tryton:{method}:{digest}"
+
+    @staticmethod
+    def _normalize_method(method: Union[str, Tuple[str, str]]) -> Tuple[str, str, str]:
+        if isinstance(method, tuple):
+            if len(method) != 2:
+                raise ValueError("Method tuple must contain exactly two elements (service, method).")
+            service, method_name = method
+        elif "." in method:
+            parts = method.split(".", 1)
+            if len(parts) != 2:
+                raise ValueError("Method must contain a dot separator or be provided as a tuple.")
+            service, method_name = parts
+        else:
+            raise ValueError("Method must contain a dot separator or be provided as a tuple.")
+        return service, method_name, f"{service}.{method_name}"
+
+    def _compose_method(self, service: str, method: str) -> str:
+        if method.startswith(f"{service}.") or method.startswith("common."):
+            return method
+        return f"{service}.{method}"
+
+    def _resolve_path(self, method: str) -> str:
+        if method in ROOT_ENDPOINT_METHODS:
+            return ""
+        if method == "common.db.login" or method.startswith(("model.", "wizard.", "report.", "common.db.")):
+            return self._database_path()
+        return ""
+
+
+    def close(self) -> None:
+        """Close the underlying HTTP client and the worker pool used by ``call_many``."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._client.close()
+
+    def _request(
+        self,
+        payload: dict[str, Any],
+        *,
+        path: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> Any:
+        request_path = "" if path is None else path
+        try:
+            response = self._client.post(request_path, json=payload, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise self._map_http_error(exc, payload) from exc
+        return self._decode_response(response, payload)
+
+    def reset_session(self):
+        """Clear the cached session identifier."""
+        with self._auth_lock:
+            self._install_session(None, None, None)
+
+    def _authenticate(self, force: bool = False) -> SessionState:
+        state = self._session_state
+        if state.auth_header and not force:
+            return state
+
+        with self._auth_lock:
+            # Another thread may have logged in while we were waiting for the lock.
+            state = self._session_state
+            if state.auth_header and not force:
+                return state
+            return self._login(state.auth_header if force else None)
+
+    def _renew_session(self, stale: SessionState) -> SessionState:
+        """Re-authenticate once for every caller that was rejected with the ``stale`` session."""
+        with self._auth_lock:
+            current = self._session_state
+            if current.auth_header is not None and current.generation != stale.generation:
+                return current
+            self.reset_session()
+            return self._login(stale.auth_header)
+
+    def _login(self, stale_header: Optional[str] = None) -> SessionState:
+        """Log in, going through the shared cache entry when ``share_session`` is enabled.
+
+        Only the process holding the cache lock calls ``common.db.login``; the others
+        wait for it to publish a session different from ``stale_header``.
+        """
+        if not self.share_session:
+            return self._request_login()
+
+        session_key = self._shared_session_key()
+        lock_key = self._shared_lock_key()
+        lock_timeout = self._shared_lock_timeout()
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + lock_timeout
+        while True:
+            state = self._adopt_shared_session(self._cache.get(session_key), stale_header)
+            if state:
+                return state
+            if self._cache.add(lock_key, owner, lock_timeout):
+                try:
+                    state = self._adopt_shared_session(self._cache.get(session_key), stale_header)
+                    if state:
+                        return state
+                    state = self._request_login()
+                    self._cache.set(session_key, self._shared_session_payload(state), self._cache_ttl)
+                    return state
+                finally:
+                    if self._cache.get(lock_key) == owner:
+                        self._cache.delete(lock_key)
+            if time.monotonic() >= deadline:
+                logger.warning("Tryton shared login lock held too long, logging in directly.")
+                return self._request_login()
+            time.sleep(self.CACHE_LOCK_POLL_INTERVAL)
+
+    def _request_login(self) -> SessionState:
+        try:
+            result = self._request(self._login_payload(), path=self._database_path())
+        except TrytonRPCError as exc:
+            logger.error("Failed to authenticate against Tryton (user=%s): %s", self.username, exc)
+            raise
+        return self._store_login_result(result)
+
+    def login(self, *, force: bool = False) -> tuple[int, str]:
+        """Authenticate and return the Tryton user id along with the session token."""
+        return self._session_credentials(self._authenticate(force=force))
+
     def call(
         self,
         service: str,
@@ -195,21 +450,155 @@ class TrytonClient:
         full_method = self._compose_method(service, method)
         attempt = 0
         current_params = params or []
+        session: Optional[SessionState] = None
         while attempt < 2:
             headers = None
             if use_session:
-                auth_header = self._authenticate(force=force_refresh or attempt > 0)
-                headers = {"Authorization": auth_header}
+                if session is None:
+                    session = self._authenticate(force=force_refresh)
+                else:
+                    session = self._renew_session(session)
+                headers = {"Authorization": session.auth_header}
             payload = self._build_payload(full_method, current_params)
             request_path = self._resolve_path(full_method)
             try:
                 return self._request(payload, path=request_path, headers=headers)
             except TrytonAuthError:
+                if not use_session:
+                    raise
                 logger.info("Tryton session expired, attempting re-authentication.")
-                self.reset_session()
                 attempt += 1
         raise TrytonAuthError("Unable to authenticate with Tryton after retrying.")
 
+    def submit(
+        self,
+        service: str,
+        method: str,
+        params: Optional[Union[Iterable[Any], JSONType]] = None,
+        *,
+        use_session: bool = True,
+    ) -> Future:
+        """Schedule ``call`` on the shared worker pool and return its future."""
+        return self._get_executor().submit(self._worker_call, service, method, params, use_session)
+
+    def _worker_call(self, service: str, method: str, params: Any, use_session: bool) -> Any:
+        self._worker_state.active = True
+        try:
+            return self.call(service, method, params, use_session=use_session)
+        finally:
+            self._worker_state.active = False
+
+    def call_many(
+        self,
+        calls: Sequence[CallSpec],
+        *,
+        use_session: bool = True,
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """
+        Run independent RPC calls concurrently and return their results in order.
+
+        At most ``max_concurrency`` calls are in flight at once. Each call keeps the
+        error mapping of ``call``; the first failure (in input order) is raised once
+        every call has finished, unless ``return_exceptions`` is set, in which case
+        exceptions are returned in place of the matching results.
+        """
+        specs = [self._normalize_call_spec(spec) for spec in calls]
+        # Stay sequential when pooling cannot help, and inside pool workers where
+        # waiting on queued futures could exhaust the pool.
+        sequential = len(specs) <= 1 or self.max_concurrency == 1 or getattr(self._worker_state, "active", False)
+
+        outcomes: list[tuple[Any, Optional[BaseException]]] = []
+        if sequential:
+            for service, method, params in specs:
+                try:
+                    outcomes.append((self.call(service, method, params, use_session=use_session), None))
+                except Exception as exc:  # noqa: BLE001 - mirrors Future.exception() in the pooled path
+                    outcomes.append((None, exc))
+        else:
+            futures = [
+                self.submit(service, method, params, use_session=use_session) for service, method, params in specs
+            ]
+            for future in futures:
+                error = future.exception()
+                outcomes.append((None if error is not None else future.result(), error))
+
+        results: list[Any] = []
+        for result, error in outcomes:
+            if error is not None and not return_exceptions:
+                raise error
+            results.append(error if error is not None else result)
+        return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="tryton-rpc",
+                )
+            return self._executor
+
+    def search_read(
+        self,
+        model: str,
+        domain: Optional[Iterable[Any]] = None,
+        fields: Optional[Iterable[str]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        order: Optional[Iterable[Any]] = None,
+        context: Optional[MutableMapping[str, Any]] = None,
+        *,
+        coalesce: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Search and read records in a single round-trip using Tryton's native ``search_read``.
+
+        ``coalesce`` shares the request with identical searches already in flight.
+        """
+        service, params = self._search_read_args(model, domain, fields, offset, limit, order, context)
+        caller = self.coalesced_call if coalesce else self.call
+        return self._records(caller(service, "search_read", params))
+
+    def coalesced_call(
+        self,
+        service: str,
+        method: str,
+        params: Optional[Union[Iterable[Any], JSONType]] = None,
+        *,
+        use_session: bool = True,
+    ) -> Any:
+        """Like ``call`` but identical calls already in flight in this process share one request.
+
+        Followers receive the leader's result object (or exception); treat it as read-only.
+        """
+        key = self.cache_key(self._compose_method(service, method), params)
+        return self._coalesce(key, lambda: self.call(service, method, params, use_session=use_session))
+
+    def _coalesce(self, key: str, loader: Callable[[], Any]) -> Any:
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            return future.result()
+
+        try:
+            result = loader()
+        except BaseException as exc:
+            self._finish_inflight(key)
+            future.set_exception(exc)
+            raise
+        self._finish_inflight(key)
+        future.set_result(result)
+        return result
+
+    def _finish_inflight(self, key: str) -> None:
+        # Drop the key before publishing so later callers start a fresh request.
+        with self._inflight_lock:
+            self._inflight.pop(key, None)
+
     def cached_call(
         self,
         method: Union[str, Tuple[str, str]],
@@ -217,18 +606,66 @@ class TrytonClient:
         *,
         ttl: Optional[int] = None,
         use_session: bool = True,
+        distributed: bool = False,
     ) -> Any:
+        """Return a cached RPC result, issuing a single Tryton call per key on a miss.
+
+        Concurrent misses in this process wait for the first caller. With ``distributed``
+        the leader also holds a cache lock so other processes wait for the cached result.
+        """
         service_name, method_name, full_method = self._normalize_method(method)
         cache_key = self.cache_key(full_method, params)
-        result = self._cache.get(cache_key)
+        result = self._result_cache.get(cache_key)
         if result is not None:
             return result
 
-        result = self.call(service_name, method_name, params=params, use_session=use_session)
         cache_ttl = self._cache_ttl if ttl is None else ttl
-        if cache_ttl:
-            self._cache.set(cache_key, result, cache_ttl)
-        return result
+
+        def fetch() -> Any:
+            return self.call(service_name, method_name, params=params, use_session=use_session)
+
+        def load() -> Any:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            if distributed and cache_ttl:
+                return self._load_under_cache_lock(cache_key, fetch, cache_ttl)
+            value = fetch()
+            if cache_ttl:
+                self._result_cache.set(cache_key, value, cache_ttl)
+            return value
+
+        return self._coalesce(cache_key, load)
+
+    def invalidate_cached_calls(self) -> None:
+        """Drop every ``cached_call`` result, in this process and all the others."""
+        self._result_cache.invalidate()
+
+    def _load_under_cache_lock(self, cache_key: str, fetch: Callable[[], Any], cache_ttl: int) -> Any:
+        lock_key = f"{cache_key}:lock"
+        lock_timeout = self._shared_lock_timeout()
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + lock_timeout
+        while not self._cache.add(lock_key, owner, lock_timeout):
+            if time.monotonic() >= deadline:
+                logger.warning("Tryton cache lock %s held too long, calling Tryton directly.", lock_key)
+                value = fetch()
+                self._result_cache.set(cache_key, value, cache_ttl)
+                return value
+            time.sleep(self.CACHE_LOCK_POLL_INTERVAL)
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        try:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            value = fetch()
+            self._result_cache.set(cache_key, value, cache_ttl)
+            return value
+        finally:
+            if self._cache.get(lock_key) == owner:
+                self._cache.delete(lock_key)
 
     def ping(self) -> bool:
         try:
@@ -243,49 +680,3 @@ class TrytonClient:
             logger.exception("Tryton ping failed.")
             return False
 
-    @staticmethod
-    def cache_key(method: str, params: Optional[Union[Iterable[Any], JSONType]]) -> str:
-        serialized_params: str
-        if params is None:
-            serialized_params = "null"
-        else:
-            try:
-                serialized_params = json.dumps(params, sort_keys=True, default=str)
-            except TypeError:
-                serialized_params = repr(params)
-        digest = hashlib.sha256(serialized_params.encode("utf-8")).hexdigest()
-        return f"tryton:{method}:{digest}"
-
-    @staticmethod
-    def _normalize_method(method: Union[str, Tuple[str, str]]) -> Tuple[str, str, str]:
-        if isinstance(method, tuple):
-            if len(method) != 2:
-                raise ValueError("Method tuple must contain exactly two elements (service, method).")
-            service, method_name = method
-        elif "." in method:
-            parts = method.split(".", 1)
-            if len(parts) != 2:
-                raise ValueError("Method must contain a dot separator or be provided as a tuple.")
-            service, method_name = parts
-        else:
-            raise ValueError("Method must contain a dot separator or be provided as a tuple.")
-        return service, method_name, f"{service}.{method_name}"
-
-    def reset_session(self):
-        """Clear the cached session identifier."""
-        self._session_id = None
-        self._session_user_id = None
-        self._session_token = None
-        self._auth_header = None
-
-    def _compose_method(self, service: str, method: str) -> str:
-        if method.startswith(f"{service}.") or method.startswith("common."):
-            return method
-        return f"{service}.{method}"
-
-    def _resolve_path(self, method: str) -> str:
-        if method in ROOT_ENDPOINT_METHODS:
-            return ""
-        if method == "common.db.login" or method.startswith(("model.", "wizard.", "report.", "common.db.")):
-            return self._database_path()
-        return ""
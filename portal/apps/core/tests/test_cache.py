@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import caches
+
+from apps.core.services.cache import LocalLRUCache, TwoTierCache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    caches["default"].clear()
+    yield
+    caches["default"].clear()
+
+
+def test_local_lru_evicts_least_recently_used_and_expires():
+    cache = LocalLRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.evictions == 1
+
+    with patch("apps.core.services.cache.time.monotonic", return_value=10**9):
+        assert cache.get("a") == (False, None)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_two_tier_serves_hits_from_memory():
+    backend = caches["default"]
+    cache = TwoTierCache(backend, maxsize=10, local_ttl=60)
+    cache.set("tryton:company", {"id": 1}, 300)
+
+    with patch.object(backend, "get", wraps=backend.get) as l2_get:
+        assert cache.get("tryton:company") == {"id": 1}
+        assert cache.get("tryton:company") == {"id": 1}
+    assert l2_get.call_count == 0
+    assert cache.stats()["l1_hits"] == 2
+
+
+def test_invalidate_is_seen_by_other_processes():
+    backend = caches["default"]
+    writer = TwoTierCache(backend, maxsize=10, local_ttl=60)
+    reader = TwoTierCache(backend, maxsize=10, local_ttl=60)
+    writer.set("tryton:uom", ["unit"], 300)
+    assert reader.get("tryton:uom") == ["unit"]
+
+    writer.invalidate()
+    assert writer.get("tryton:uom") is None
+
+    # The reader keeps its L1 copy until its next version check.
+    assert reader.get("tryton:uom") == ["unit"]
+    reader._version_checked_at -= TwoTierCache.VERSION_CHECK_INTERVAL
+    assert reader.get("tryton:uom") is None
+    assert reader.stats()["version"] == 2
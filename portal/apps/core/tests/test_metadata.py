@@ -0,0 +1,67 @@
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from apps.core.services import TrytonRPCError
+from apps.core.services.metadata import TrytonMetadataRegistry
+
+
+class TrytonMetadataRegistryTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.registry = TrytonMetadataRegistry(ttl=60)
+        self.registry.clear()
+        self.client = MagicMock()
+        self.client.search_read.return_value = [{"id": 1, "currency": 5}]
+        self.client.call.side_effect = self._call
+
+    @staticmethod
+    def _call(service, method, params):
+        if method == "fields_get" and service == "model.party.address":
+            return {"street": {"type": "char"}, "zip": {"type": "char"}}
+        if method == "fields_get":
+            return {"login": {"type": "char"}, "party": {"type": "many2one"}}
+        if service == "model.res.group":
+            return [3]
+        return []
+
+    def test_facts_are_loaded_once_and_shared_between_instances(self) -> None:
+        other = TrytonMetadataRegistry(ttl=60)
+
+        self.assertEqual(self.registry.company_record(self.client), {"id": 1, "currency": 5})
+        self.assertEqual(other.company_record(self.client), {"id": 1, "currency": 5})
+        self.assertEqual(self.registry.address_postal_field(self.client), "zip")
+        self.assertEqual(other.address_postal_field(self.client), "zip")
+
+        self.client.search_read.assert_called_once()
+        self.assertEqual(self.client.call.call_count, 1)
+
+    def test_refresh_reloads_every_fact(self) -> None:
+        self.registry.warm(self.client)
+        self.client.search_read.return_value = [{"id": 2, "currency": 6}]
+
+        loaded = self.registry.refresh(self.client)
+
+        self.assertEqual(loaded["company"], {"id": 2, "currency": 6})
+        self.assertEqual(loaded["fields:model.res.user"], ["login", "party"])
+        self.assertEqual(loaded["portal_group:Portail Clients"], 3)
+        self.assertEqual(self.registry.get("company"), {"id": 2, "currency": 6})
+
+    def test_warm_tolerates_unreachable_server(self) -> None:
+        self.client.search_read.side_effect = TrytonRPCError("down")
+
+        self.assertEqual(self.registry.warm(self.client), {})
+        self.assertIsNone(self.registry.get("company"))
+
+    def test_refresh_command_reports_loaded_facts(self) -> None:
+        out = StringIO()
+        with patch("apps.core.management.commands.refresh_tryton_metadata.get_metadata_registry") as factory:
+            factory.return_value.refresh.return_value = {
+                "company": {"id": 1, "currency": 5},
+                "fields:model.res.user": ["party"],
+            }
+            call_command("refresh_tryton_metadata", stdout=out)
+
+        self.assertIn("fields:model.res.user: 1 champs", out.getvalue())
+        self.assertIn("Métadonnées Tryton rechargées.", out.getvalue())
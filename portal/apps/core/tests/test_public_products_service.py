@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import time
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
+from django.core.cache import cache
 from django.test import SimpleTestCase
 
-from apps.core.services import PublicProductService, PublicProductServiceError, TrytonRPCError
+from apps.core.services import PublicProduct, PublicProductService, PublicProductServiceError, TrytonRPCError
 
 
 class PublicProductServiceTest(SimpleTestCase):
@@ -27,9 +29,21 @@ class PublicProductServiceTest(SimpleTestCase):
     def test_error_when_tryton_fails(self) -> None:
         with patch.object(PublicProductService, "_resolve_company_id", return_value=1):
             self.client.call.side_effect = TrytonRPCError("boom")
+            self.client.coalesced_call.side_effect = TrytonRPCError("boom")
             with self.assertRaises(PublicProductServiceError):
                 self.service.list_available_products(use_cache=False)
 
+    def test_company_is_loaded_once_through_the_metadata_registry(self) -> None:
+        self.client.search_read.return_value = [{"id": 5, "currency": 3}]
+
+        self.assertEqual(self.service._resolve_company_id(), 5)
+        other = PublicProductService(client=self.client, cache_timeout=1)
+        self.assertEqual(other._resolve_company_id(), 5)
+
+        self.client.search_read.assert_called_once()
+        self.assertEqual(self.client.search_read.call_args.args[0], "model.company.company")
+        self.client.call.assert_not_called()
+
     def _mock_template_calls(self) -> None:
         def _call(service, method, params=None, **_kwargs):
             if service == "model.product.template":
@@ -59,8 +73,132 @@ class PublicProductServiceTest(SimpleTestCase):
                     {"id": 101, "template": (11, "Palette 48x40"), "quantity": "12"},
                     {"id": 202, "template": (22, "Palette CHEP"), "quantity": "0"},
                 ]
-            if service == "model.company.company" and method == "search":
-                return [5]
             return []
 
         self.client.call.side_effect = _call
+        self.client.coalesced_call.side_effect = _call
+        self.client.call_many.side_effect = lambda calls: [_call(*spec) for spec in calls]
+
+
+class PublicProductServiceStaleWhileRevalidateTest(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = MagicMock()
+        self.service = PublicProductService(client=self.client, cache_timeout=60, stale_timeout=600)
+        self.product = PublicProduct(
+            template_id=11,
+            name="Palette 48x40",
+            code="PAL-001",
+            description=None,
+            categories=(),
+            quantity_available=Decimal("3"),
+        )
+
+    def tearDown(self) -> None:
+        cache.clear()
+
+    def test_stale_catalog_is_served_while_single_refresh_runs(self) -> None:
+        cache.set(
+            PublicProductService.CATALOG_CACHE_KEY,
+            {"products": [self.product], "fresh_until": time.time() - 1},
+            600,
+        )
+        with patch.object(PublicProductService, "_start_background") as start, patch.object(
+            PublicProductService, "_fetch_catalog"
+        ) as fetch:
+            first = self.service.list_available_products()
+            second = self.service.list_available_products()
+
+        self.assertEqual(first, [self.product])
+        self.assertEqual(second, [self.product])
+        fetch.assert_not_called()
+        start.assert_called_once()
+
+        refreshed = PublicProduct(
+            template_id=22,
+            name="Palette CHEP",
+            code=None,
+            description=None,
+            categories=(),
+            quantity_available=Decimal("5"),
+        )
+        with patch.object(PublicProductService, "_fetch_catalog", return_value=[refreshed]):
+            start.call_args.args[0]()
+
+        self.assertIsNone(cache.get(PublicProductService.CATALOG_REFRESH_LOCK_KEY))
+        self.assertEqual(self.service.list_available_products(), [refreshed])
+
+    def test_failed_refresh_keeps_stale_catalog(self) -> None:
+        cache.set(
+            PublicProductService.CATALOG_CACHE_KEY,
+            {"products": [self.product], "fresh_until": time.time() - 1},
+            600,
+        )
+        with patch.object(
+            PublicProductService, "_fetch_catalog", side_effect=PublicProductServiceError("down")
+        ), patch.object(PublicProductService, "_start_background", side_effect=lambda target: target()):
+            products = self.service.list_available_products()
+
+        self.assertEqual(products, [self.product])
+        self.assertEqual(cache.get(PublicProductService.CATALOG_CACHE_KEY)["products"], [self.product])
+        self.assertIsNone(cache.get(PublicProductService.CATALOG_REFRESH_LOCK_KEY))
+
+
+class PublicProductServiceTemplateBatchTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.client = MagicMock()
+        self.service = PublicProductService(client=self.client)
+
+    def test_read_templates_batches_and_isolates_unreadable_template(self) -> None:
+        requested: list[list[int]] = []
+
+        def _read(service, method, params=None, **_kwargs):
+            ids = params[0]
+            requested.append(list(ids))
+            if 3 in ids:
+                raise TrytonRPCError("Access error", code=-32000)
+            return [{"id": tid, "name": f"Palette {tid}"} for tid in ids]
+
+        self.client.coalesced_call.side_effect = _read
+
+        with self.assertLogs("apps.core.services.products", level="WARNING") as logs:
+            records = self.service._read_templates([1, 2, 3, 4], {"company": 1})
+
+        self.assertEqual([record["id"] for record in records], [1, 2, 4])
+        self.assertEqual(requested, [[1, 2, 3, 4], [1, 2], [3, 4], [3], [4]])
+        self.assertIn("Gabarit produit 3 illisible", logs.output[0])
+
+    def test_read_templates_does_not_bisect_transport_errors(self) -> None:
+        self.client.coalesced_call.side_effect = TrytonRPCError("HTTP error while contacting Tryton.")
+
+        with self.assertRaises(PublicProductServiceError):
+            self.service._read_templates(list(range(1, 101)), {"company": 1})
+
+        self.assertEqual(self.client.coalesced_call.call_count, 1)
+
+
+class PublicProductServiceVariantChunkTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.client = MagicMock()
+        self.service = PublicProductService(client=self.client, variant_chunk_size=2, variant_concurrency=3)
+
+    def test_chunks_are_read_in_waves_and_merged_in_order(self) -> None:
+        def _call_many(calls):
+            return [[{"id": vid, "template": (vid * 10, "T"), "quantity": "1"} for vid in params[0]] for _, _, params in calls]
+
+        self.client.call_many.side_effect = _call_many
+
+        records = self.service._read_variant_records([7, 6, 5, 4, 3, 2, 1], {"company": 1})
+
+        self.assertEqual([record["id"] for record in records], [1, 2, 3, 4, 5, 6, 7])
+        waves = [[params[0] for _, _, params in call.args[0]] for call in self.client.call_many.call_args_list]
+        self.assertEqual(waves, [[[1, 2], [3, 4], [5, 6]], [[7]]])
+
+    def test_failing_wave_stops_the_read(self) -> None:
+        service = PublicProductService(client=self.client, variant_chunk_size=1, variant_concurrency=2)
+        self.client.call_many.side_effect = TrytonRPCError("boom")
+
+        with self.assertRaises(PublicProductServiceError):
+            service._read_variant_records([1, 2, 3, 4, 5], {"company": 1})
+
+        self.client.call_many.assert_called_once()
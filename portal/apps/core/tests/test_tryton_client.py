@@ -1,11 +1,13 @@
 import base64
 import json
+import threading
+import time
 
 import httpx
 import pytest
 from django.core.cache import caches
 
-from apps.core.services.tryton_client import TrytonClient
+from apps.core.services.tryton_client import TrytonClient, TrytonRPCError
 
 
 @pytest.fixture(autouse=True)
@@ -126,3 +128,269 @@ def test_ping_handles_plain_list_response(configured_settings):
 
     client = TrytonClient(transport=_build_transport(handler))
     assert client.ping() is True
+
+
+def test_search_read_issues_single_native_call(configured_settings):
+    methods = []
+
+    def handler(payload, request):
+        if payload["method"] == "common.db.login":
+            return httpx.Response(200, json=[1, "session"])
+        methods.append(payload["method"])
+        assert payload["params"] == [
+            [["party", "=", 7]],
+            0,
+            5,
+            [["id", "DESC"]],
+            ["id", "number"],
+            {"company": 1},
+        ]
+        return httpx.Response(
+            200,
+            json={"jsonrpc": "2.0", "id": payload["id"], "result": [{"id": 3, "number": "SO3"}]},
+        )
+
+    client = TrytonClient(transport=_build_transport(handler))
+    records = client.search_read(
+        "model.sale.sale",
+        [("party", "=", 7)],
+        ["id", "number"],
+        limit=5,
+        order=[("id", "DESC")],
+        context={"company": 1},
+    )
+
+    assert records == [{"id": 3, "number": "SO3"}]
+    assert methods == ["model.sale.sale.search_read"]
+
+
+def test_call_many_preserves_order_and_error_mapping(configured_settings):
+    def handler(payload, request):
+        if payload["method"] == "common.db.login":
+            return httpx.Response(200, json=[1, "session"])
+        if payload["method"] == "model.sale.sale.search_count":
+            return httpx.Response(
+                200,
+                json={"jsonrpc": "2.0", "id": payload["id"], "error": {"code": 500, "message": "boom"}},
+            )
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": payload["params"][0]})
+
+    client = TrytonClient(transport=_build_transport(handler), max_concurrency=3)
+    calls = [
+        ("model.party.party", "search", [["a"]]),
+        ("model.sale.sale", "search_count", [[]]),
+        ("model.party.party", "search", [["c"]]),
+    ]
+
+    results = client.call_many(calls, return_exceptions=True)
+    assert results[0] == ["a"]
+    assert isinstance(results[1], TrytonRPCError)
+    assert results[2] == ["c"]
+
+    with pytest.raises(TrytonRPCError):
+        client.call_many(calls)
+    client.close()
+
+
+def test_call_many_reauthenticates_once_on_concurrent_401(configured_settings):
+    lock = threading.Lock()
+    calls = {"login": 0}
+    barrier = threading.Barrier(4, timeout=5)
+
+    def handler(payload, request):
+        if payload["method"] == "common.db.login":
+            with lock:
+                calls["login"] += 1
+                count = calls["login"]
+            return httpx.Response(200, json=[1, f"session-{count}"])
+        expired = base64.b64encode(b"admin:1:session-1").decode()
+        if request.headers["Authorization"] == f"Session {expired}":
+            barrier.wait()
+            return httpx.Response(status_code=401)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": "ok"})
+
+    client = TrytonClient(transport=_build_transport(handler), max_concurrency=4)
+    client.login()
+
+    results = client.call_many([("model.party.party", "search", [[]])] * 4)
+
+    assert results == ["ok"] * 4
+    assert calls["login"] == 2
+    client.close()
+
+
+def test_shared_session_is_reused_across_clients(configured_settings):
+    calls = {"login": 0}
+
+    def handler(payload, request):
+        if payload["method"] == "common.db.login":
+            calls["login"] += 1
+            return httpx.Response(200, json=[1, f"session-{calls['login']}"])
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": 1})
+
+    first = TrytonClient(transport=_build_transport(handler), share_session=True)
+    second = TrytonClient(transport=_build_transport(handler), share_session=True)
+    isolated = TrytonClient(transport=_build_transport(handler))
+
+    first.call("model.sale.sale", "search_count", [[], {}])
+    second.call("model.sale.sale", "search_count", [[], {}])
+    assert calls["login"] == 1
+    assert second.get_session_context()["session"] == "session-1"
+
+    isolated.call("model.sale.sale", "search_count", [[], {}])
+    assert calls["login"] == 2
+
+
+def test_shared_session_single_flight_on_expiry(configured_settings):
+    calls = {"login": 0}
+    valid = {"session": None}
+    barrier = threading.Barrier(3)
+
+    def handler(payload, request):
+        if payload["method"] == "common.db.login":
+            calls["login"] += 1
+            valid["session"] = f"session-{calls['login']}"
+            return httpx.Response(200, json=[1, valid["session"]])
+        expected = base64.b64encode(f"admin:1:{valid['session']}".encode()).decode()
+        if request.headers["Authorization"] != f"Session {expected}":
+            return httpx.Response(status_code=401)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": 1})
+
+    clients = [TrytonClient(transport=_build_transport(handler), share_session=True) for _ in range(3)]
+    for client in clients:
+        client.call("model.sale.sale", "search_count", [[], {}])
+    assert calls["login"] == 1
+
+    # Tryton drops the session: every worker gets a 401, only one logs in again.
+    valid["session"] = "expired"
+    errors = []
+
+    def worker(client):
+        barrier.wait()
+        try:
+            client.call("model.sale.sale", "search_count", [[], {}])
+        except Exception as exc:  # pragma: no cover - surfaced by the assertion below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert calls["login"] == 2
+
+
+def test_renew_with_outdated_generation_reuses_current_session(configured_settings):
+    calls = {"login": 0}
+
+    def handler(payload, request):
+        assert payload["method"] == "common.db.login"
+        calls["login"] += 1
+        return httpx.Response(200, json=[1, f"session-{calls['login']}"])
+
+    client = TrytonClient(transport=_build_transport(handler))
+    stale = client._authenticate()
+    renewed = client._renew_session(stale)
+    assert renewed.generation > stale.generation
+    assert calls["login"] == 2
+
+    # A second caller rejected with the same old session must not log in again.
+    again = client._renew_session(stale)
+    assert again == renewed
+    assert calls["login"] == 2
+
+
+def test_concurrent_reset_and_calls_keep_consistent_session(configured_settings):
+    calls = {"login": 0}
+    lock = threading.Lock()
+    issued = set()
+
+    def handler(payload, request):
+        if payload["method"] == "common.db.login":
+            with lock:
+                calls["login"] += 1
+                token = f"session-{calls['login']}"
+                issued.add(base64.b64encode(f"admin:1:{token}".encode()).decode())
+            return httpx.Response(200, json=[1, token])
+        header = request.headers["Authorization"]
+        assert header.startswith("Session ") and header[len("Session "):] in issued
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": 1})
+
+    client = TrytonClient(transport=_build_transport(handler))
+    errors = []
+
+    def caller():
+        try:
+            for _ in range(20):
+                client.call("model.sale.sale", "search_count", [[], {}])
+        except Exception as exc:  # pragma: no cover - surfaced by the assertion below
+            errors.append(exc)
+
+    def resetter():
+        for _ in range(5):
+            client.reset_session()
+
+    threads = [threading.Thread(target=caller) for _ in range(4)] + [threading.Thread(target=resetter)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert 1 <= calls["login"] <= 6
+
+
+def test_coalesced_call_shares_inflight_request(configured_settings):
+    calls = {"search": 0}
+    release = threading.Event()
+
+    def handler(payload, request):
+        if payload["method"] == "common.db.login":
+            return httpx.Response(200, json=[1, "session-1"])
+        calls["search"] += 1
+        release.wait(timeout=2)
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": [101, 202]})
+
+    client = TrytonClient(transport=_build_transport(handler))
+    client.login()
+    results = []
+
+    def worker():
+        results.append(client.coalesced_call("model.product.product", "search", [[], 0, None, None, {}]))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    # Let every follower register on the leader's future before the response returns.
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[101, 202]] * 5
+    assert calls["search"] == 1
+    assert client._inflight == {}
+
+
+def test_cached_call_distributed_waits_for_lock_holder(configured_settings):
+    calls = {"version": 0}
+
+    def handler(payload, request):
+        calls["version"] += 1
+        return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": "7.0"})
+
+    client = TrytonClient(transport=_build_transport(handler))
+    cache = caches["default"]
+    key = client.cache_key("common.server.version", None)
+    # Another process holds the lock and publishes the result shortly after.
+    cache.add(f"{key}:lock", "other-process", 5)
+    publisher = threading.Timer(0.1, lambda: cache.set(key, "6.8", 60))
+    publisher.start()
+
+    result = client.cached_call("common.server.version", use_session=False, distributed=True)
+    publisher.join()
+
+    assert result == "6.8"
+    assert calls["version"] == 0
@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+# Tests never talk to a live Tryton server: skip the startup metadata warm-up.
+os.environ.setdefault("TRYTON_METADATA_WARMUP", "0")
+
+
+@pytest.fixture(autouse=True)
+def reset_tryton_metadata():
+    """Keep metadata and catalogs loaded through one test's mocked client out of the next test."""
+    from apps.accounts.services import get_order_catalog
+    from apps.core.services import get_metadata_registry
+
+    get_metadata_registry().clear()
+    get_order_catalog().clear()
+    yield
@@ -16,7 +16,23 @@ env = environ.Env(
     TRYTON_SESSION_TTL=(int, 300),
     TRYTON_TIMEOUT=(float, 10.0),
     TRYTON_RETRY_ATTEMPTS=(int, 3),
+    TRYTON_MAX_CONCURRENCY=(int, 4),
+    TRYTON_SHARE_SESSION=(bool, True),
+    TRYTON_LOCAL_CACHE_SIZE=(int, 512),
+    TRYTON_LOCAL_CACHE_TTL=(int, 60),
+    TRYTON_CATALOG_CHUNK_SIZE=(int, 40),
+    TRYTON_CATALOG_CONCURRENCY=(int, 4),
     TRYTON_PORTAL_GROUP=(str, "Portail Clients"),
+    PORTAL_PROFILE_CACHE_TTL=(int, 300),
+    PORTAL_INVOICE_TOTALS_CACHE_TTL=(int, 300),
+    PORTAL_DASHBOARD_WIDGET_TIMEOUT=(float, 5.0),
+    PORTAL_DASHBOARD_CACHE_TTL=(int, 300),
+    PORTAL_LIST_TOTAL_CACHE_TTL=(int, 300),
+    PORTAL_ORDER_CATALOG_TTL=(int, 15 * 60),
+    PORTAL_ORDER_CATALOG_STALE_TTL=(int, 24 * 60 * 60),
+    PORTAL_ORDER_CATALOG_MAX_AGE=(int, 60),
+    TRYTON_METADATA_TTL=(int, 24 * 60 * 60),
+    TRYTON_METADATA_WARMUP=(bool, True),
 )
 
 ENV_FILE_VAR = env("DJANGO_ENV_FILE", default=None)
@@ -148,4 +164,20 @@ TRYTON_PASSWORD = env("TRYTON_PASSWORD")
 TRYTON_SESSION_TTL = env.int("TRYTON_SESSION_TTL")
 TRYTON_TIMEOUT = env.float("TRYTON_TIMEOUT")
 TRYTON_RETRY_ATTEMPTS = env.int("TRYTON_RETRY_ATTEMPTS")
+TRYTON_MAX_CONCURRENCY = env.int("TRYTON_MAX_CONCURRENCY")
+TRYTON_SHARE_SESSION = env.bool("TRYTON_SHARE_SESSION")
+TRYTON_LOCAL_CACHE_SIZE = env.int("TRYTON_LOCAL_CACHE_SIZE")
+TRYTON_LOCAL_CACHE_TTL = env.int("TRYTON_LOCAL_CACHE_TTL")
+TRYTON_CATALOG_CHUNK_SIZE = env.int("TRYTON_CATALOG_CHUNK_SIZE")
+TRYTON_CATALOG_CONCURRENCY = env.int("TRYTON_CATALOG_CONCURRENCY")
 TRYTON_PORTAL_GROUP = env("TRYTON_PORTAL_GROUP")
+PORTAL_PROFILE_CACHE_TTL = env.int("PORTAL_PROFILE_CACHE_TTL")
+PORTAL_INVOICE_TOTALS_CACHE_TTL = env.int("PORTAL_INVOICE_TOTALS_CACHE_TTL")
+PORTAL_DASHBOARD_WIDGET_TIMEOUT = env.float("PORTAL_DASHBOARD_WIDGET_TIMEOUT")
+PORTAL_DASHBOARD_CACHE_TTL = env.int("PORTAL_DASHBOARD_CACHE_TTL")
+PORTAL_LIST_TOTAL_CACHE_TTL = env.int("PORTAL_LIST_TOTAL_CACHE_TTL")
+PORTAL_ORDER_CATALOG_TTL = env.int("PORTAL_ORDER_CATALOG_TTL")
+PORTAL_ORDER_CATALOG_STALE_TTL = env.int("PORTAL_ORDER_CATALOG_STALE_TTL")
+PORTAL_ORDER_CATALOG_MAX_AGE = env.int("PORTAL_ORDER_CATALOG_MAX_AGE")
+TRYTON_METADATA_TTL = env.int("TRYTON_METADATA_TTL")
+TRYTON_METADATA_WARMUP = env.bool("TRYTON_METADATA_WARMUP")
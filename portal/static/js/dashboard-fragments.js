@@ -0,0 +1,52 @@
+(function () {
+    const ERROR_TEXT = 'Ce bloc est momentanément indisponible.';
+
+    function updateHeroLabel(container) {
+        const source = container.querySelector('[data-orders-to-complete-label]');
+        const target = document.querySelector('[data-dashboard-orders-label]');
+        if (source && target) {
+            target.textContent = source.dataset.ordersToCompleteLabel;
+        }
+    }
+
+    function showError(container) {
+        const placeholder = container.querySelector('[data-dashboard-placeholder]');
+        if (placeholder) {
+            placeholder.textContent = ERROR_TEXT;
+            placeholder.setAttribute('role', 'alert');
+        }
+        container.setAttribute('aria-busy', 'false');
+    }
+
+    function loadFragment(container) {
+        const url = container.dataset.dashboardFragment;
+        if (!url) {
+            return Promise.resolve();
+        }
+        container.setAttribute('aria-busy', 'true');
+        return fetch(url, {
+            credentials: 'same-origin',
+            headers: { 'X-Requested-With': 'XMLHttpRequest' },
+        })
+            .then((response) => {
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}`);
+                }
+                return response.text();
+            })
+            .then((html) => {
+                container.innerHTML = html;
+                container.setAttribute('aria-busy', 'false');
+                updateHeroLabel(container);
+            })
+            .catch(() => showError(container));
+    }
+
+    document.addEventListener('DOMContentLoaded', () => {
+        // Deferred fragments (activity) reuse what the others just cached server-side.
+        const containers = Array.from(document.querySelectorAll('[data-dashboard-fragment]'));
+        const deferred = containers.filter((container) => container.hasAttribute('data-dashboard-fragment-deferred'));
+        const immediate = containers.filter((container) => !deferred.includes(container));
+        Promise.allSettled(immediate.map(loadFragment)).then(() => deferred.forEach(loadFragment));
+    });
+})();
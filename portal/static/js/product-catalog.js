@@ -1,6 +1,8 @@
 (function () {
     const DEFAULT_SUMMARY = "Aucun produit n’est sélectionné.";
     const SELECTED_PREFIX = "Produit sélectionné : ";
+    const PAGE_CACHE_SIZE = 40;
+    const DEFAULT_PAGE_MAX_AGE = 60;
 
     function debounce(fn, delay) {
         let timer = null;
@@ -32,6 +34,9 @@
         let lastTrigger = null;
         let isErrorVisible = false;
         let fetchController = null;
+        // Pages déjà reçues, par paramètres : la pagination arrière et les recherches répétées
+        // n'appellent pas le serveur tant que le max-age annoncé n'est pas écoulé.
+        const pageCache = new Map();
         const state = {
             page: 1,
             pageSize: 8,
@@ -262,26 +267,34 @@
             if (state.unit) {
                 params.set('unit', state.unit);
             }
+            const cacheKey = params.toString();
+            const cached = readCachedPage(cacheKey);
+            if (cached) {
+                if (fetchController) {
+                    fetchController.abort();
+                    fetchController = null;
+                }
+                applyCatalogData(cached);
+                showStatus('');
+                return;
+            }
             setLoading(true);
             if (fetchController) {
                 fetchController.abort();
             }
             fetchController = new AbortController();
-            fetch(`${catalogUrl}?${params.toString()}`, {signal: fetchController.signal})
+            fetch(`${catalogUrl}?${cacheKey}`, {signal: fetchController.signal})
                 .then((response) => response
                     .json()
                     .catch(() => ({}))
-                    .then((data) => ({ok: response.ok, data})))
-                .then(({ok, data}) => {
+                    .then((data) => ({ok: response.ok, data, maxAge: parseMaxAge(response)})))
+                .then(({ok, data, maxAge}) => {
                     if (!ok) {
                         const message = data && data.error ? data.error : 'Catalogue temporairement indisponible.';
                         throw new Error(message);
                     }
-                    const pagination = data && data.pagination ? data.pagination : null;
-                    state.page = pagination && pagination.page ? pagination.page : 1;
-                    renderResults(data || {});
-                    updateFilters(data && data.filters ? data.filters : null);
-                    updatePagination(pagination);
+                    storeCachedPage(cacheKey, data || {}, maxAge);
+                    applyCatalogData(data || {});
                     showStatus('');
                 })
                 .catch((error) => {
@@ -295,6 +308,44 @@
                 });
         }
 
+        function applyCatalogData(data) {
+            const pagination = data && data.pagination ? data.pagination : null;
+            state.page = pagination && pagination.page ? pagination.page : 1;
+            renderResults(data || {});
+            updateFilters(data && data.filters ? data.filters : null);
+            updatePagination(pagination);
+        }
+
+        function parseMaxAge(response) {
+            const header = response.headers.get('Cache-Control') || '';
+            const match = header.match(/max-age=(\d+)/);
+            return match ? Number(match[1]) : DEFAULT_PAGE_MAX_AGE;
+        }
+
+        function readCachedPage(key) {
+            const entry = pageCache.get(key);
+            if (!entry) {
+                return null;
+            }
+            pageCache.delete(key);
+            if (entry.expiresAt <= Date.now()) {
+                return null;
+            }
+            pageCache.set(key, entry);
+            return entry.data;
+        }
+
+        function storeCachedPage(key, data, maxAge) {
+            if (!maxAge) {
+                return;
+            }
+            pageCache.delete(key);
+            pageCache.set(key, {data, expiresAt: Date.now() + maxAge * 1000});
+            while (pageCache.size > PAGE_CACHE_SIZE) {
+                pageCache.delete(pageCache.keys().next().value);
+            }
+        }
+
         const scheduleSearch = debounce((value) => {
             state.query = value.trim();
             state.page = 1;